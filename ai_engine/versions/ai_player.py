@@ -1,5 +1,3 @@
-from sympy import false
-
 from game.models.player import Player
 
 
@@ -1,9 +1,8 @@
 import copy
-import time
 from ai_engine.versions.ai_player import PlayerAI
 from game.models.board import Board
-from game.models.piece import Piece
 from game.models.pieces.pieceold import Pawn, Knight, Bishop, Rook, Queen, King
+from game.move_generation.bitboard_utilities import BitBoardUtility
 
 PIECE_VALUES = {
     Pawn: 1,
@@ -13,6 +12,14 @@ PIECE_VALUES = {
     Queen: 9,
     King: 1000
 }
+# PIECE_VALUES by bitboard piece type (pawn .. king)
+TYPE_VALUES = tuple(PIECE_VALUES[piece] for piece in (Pawn, Knight, Bishop, Rook, Queen, King))
+
+# Score per square a side attacks that is not occupied by its own pieces
+MOBILITY_WEIGHT = 0.02
+
+WINNING_CAPTURE_BONUS = 10000
+LOSING_CAPTURE_PENALTY = -10000
 
 
 class PruningMoveOrdering(PlayerAI):
@@ -33,7 +40,10 @@ class PruningMoveOrdering(PlayerAI):
         best_score = -float("inf")
         best_move = None
 
+        # The search generates pseudo-legal moves and tests legality only for
+        # the moves it actually plays, so moves after a cut-off are never checked
         board_copy = copy.deepcopy(board_state)
+        board_copy.move_generator.set_pseudo_legal(True)
 
         for move in legal_moves:
             captured, moves_done, status = board_copy.make_move(move)
@@ -51,19 +61,16 @@ class PruningMoveOrdering(PlayerAI):
             return self.evaluate_board(board_state)
 
         current_color = self.color if is_maximizing else ("black" if self.color == "white" else "white")
-        legal_moves = board_state.generate_all_legal_moves()
-
-        if not legal_moves:
-            if board_state.is_checkmate(current_color):
-                return -1000 if is_maximizing else 1000
-            return 0  # stalemate
-
-        # Order moves
-        legal_moves = self.order_moves(board_state, legal_moves, current_color)
+        generator = board_state.move_generator
+        moves = self.order_moves(board_state, generator.generate_all_moves(), current_color)
+        searched = False
 
         if is_maximizing:
             max_eval = -float("inf")
-            for move in legal_moves:
+            for move in moves:
+                if not generator.is_legal(move):
+                    continue
+                searched = True
                 captured, moves_done, status = board_state.make_move(move)
                 eval = self.minimax(board_state, depth - 1, False, alpha, beta)
                 board_state.undo_move(moves_done)
@@ -71,10 +78,13 @@ class PruningMoveOrdering(PlayerAI):
                 alpha = max(alpha, eval)
                 if beta <= alpha:
                     break  # beta cut-off
-            return max_eval
+            best = max_eval
         else:
             min_eval = float("inf")
-            for move in legal_moves:
+            for move in moves:
+                if not generator.is_legal(move):
+                    continue
+                searched = True
                 captured, moves_done, status = board_state.make_move(move)
                 eval = self.minimax(board_state, depth - 1, True, alpha, beta)
                 board_state.undo_move(moves_done,)
@@ -82,7 +92,13 @@ class PruningMoveOrdering(PlayerAI):
                 beta = min(beta, eval)
                 if beta <= alpha:
                     break  # alpha cut-off
-            return min_eval
+            best = min_eval
+
+        if not searched:
+            if board_state.is_in_check(current_color):
+                return -1000 if is_maximizing else 1000
+            return 0  # stalemate
+        return best
 
     def evaluate_board(self, board_state: Board):
         self.positions_evaluated+=1
@@ -108,22 +124,37 @@ class PruningMoveOrdering(PlayerAI):
             else:
                 score -= value
 
+        # Mobility, from the incrementally maintained attack sets: along a search
+        # line only the squares touched by the last moves are recomputed
+        state = board_state.board_data
+        own_id = 0 if self.color == "white" else 1
+        own_mobility = BitBoardUtility.count_bits(state.attacks_by_side(own_id) & ~state.color_pieces[own_id])
+        enemy_mobility = BitBoardUtility.count_bits(state.attacks_by_side(1 - own_id) & ~state.color_pieces[1 - own_id])
+        score += MOBILITY_WEIGHT * (own_mobility - enemy_mobility)
+
         return score
 
     def order_moves(self, board_state: Board, moves, color):
         """
-        Simple move ordering:
-        - Captures first (MVV-LVA: Most Valuable Victim - Least Valuable Attacker)
+        Move ordering:
+        - Captures that do not lose material (SEE >= 0), by MVV-LVA
+          (Most Valuable Victim - Least Valuable Attacker)
         - Then non-captures sorted by piece value descending
+        - Captures that lose material on the exchange go last
         """
+        square_piece = board_state.board_data.square_piece
+
         def move_value(move):
-            target_piece = board_state.get_piece(move.target_pos)
-            moving_piece = board_state.get_piece(move.start_pos)
-            if target_piece:
-                # Capture move: give high priority if capturing valuable piece
-                return 10 * PIECE_VALUES[type(target_piece)] - PIECE_VALUES.get(type(moving_piece), 0)
-            else:
+            moving_type = square_piece[move.start_pos[1] * 8 + move.start_pos[0]] % 6
+            target = square_piece[move.target_pos[1] * 8 + move.target_pos[0]]
+            if target < 0:
                 # Non-capture: lower priority, slight bonus for moving high-value piece
-                return PIECE_VALUES.get(type(moving_piece), 0)
+                return TYPE_VALUES[moving_type]
+
+            mvv_lva = 10 * TYPE_VALUES[target % 6] - TYPE_VALUES[moving_type]
+            if board_state.see_ge(move, 0):
+                return WINNING_CAPTURE_BONUS + mvv_lva
+            # Losing capture: defer behind every quiet move
+            return LOSING_CAPTURE_PENALTY + mvv_lva
 
         return sorted(moves, key=move_value, reverse=True)
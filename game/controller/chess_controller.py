@@ -2,7 +2,6 @@ from typing import Optional
 
 from ai_engine.versions.ai_player import PlayerAI
 from game.models.pieces.pieceold import *
-from game.move_generation.move_generator import MoveGenerator
 from game.view.piece_view import PieceView
 from game.view.board_view import BoardView
 from game.models.board import Board
@@ -39,8 +38,6 @@ class ChessController:
             self.selected_pos = grid_pos
             self.view.highlight_selected = grid_pos
 
-            mg = MoveGenerator(self.state)
-
             # Get all pseudo legal moves (for the correct side)
             pseudo_moves = self.state.generate_all_legal_moves()
 
@@ -2,9 +2,12 @@ from copy import deepcopy
 
 from game.config import PRINT_FEN
 from game.models.board_state import BoardState
+from game.models.piece import Piece
 from game.models.pieces.pieceold import *
 from game.move_generation.bitboard_utilities import BitBoardUtility
+from game.move_generation.move_buffer import MoveBuffer
 from game.move_generation.move_generator import MoveGenerator
+from game.move_generation.static_exchange import StaticExchange
 
 
 class Board:
@@ -14,6 +17,8 @@ class Board:
     def __init__(self, fen: str):
         self.board_data: BoardState = BoardState(fen)
         self.board_data : BoardState = self.parse_fen(fen)
+        # Long-lived generator; make_move/undo_move keep its per-ply data in sync
+        self.move_generator = MoveGenerator(self)
 
     def get_piece(self, pos: tuple[int, int]) -> PieceOld | None:
         return self.board_data.positions.get(pos)
@@ -55,6 +60,7 @@ class Board:
         if moving_piece is None:
             return None, [], None
 
+        self.move_generator.push_ply()
         moves_done = []
 
         # Save info for undo
@@ -147,11 +153,18 @@ class Board:
             else:
                 if from_pos == (0, 7): self.board_data.castling_rights["black"]["Q"] = False
                 if from_pos == (7, 7): self.board_data.castling_rights["black"]["K"] = False
+        # A rook captured on its home corner takes that side's right with it
+        if isinstance(captured_piece, Rook):
+            if to_pos == (0, 0): self.board_data.castling_rights["white"]["Q"] = False
+            if to_pos == (7, 0): self.board_data.castling_rights["white"]["K"] = False
+            if to_pos == (0, 7): self.board_data.castling_rights["black"]["Q"] = False
+            if to_pos == (7, 7): self.board_data.castling_rights["black"]["K"] = False
 
         # -----------------------------
         # Update en passant
         # -----------------------------
-        if move.en_passant:
+        # Move.en_passant also flags the capture itself; only a double push leaves a target
+        if isinstance(moving_piece, Pawn) and abs(to_pos[1] - from_pos[1]) == 2:
             mid_rank = (to_pos[1] + from_pos[1]) // 2
             self.board_data.en_passant_target = (from_pos[0], mid_rank)
         else:
@@ -197,6 +210,7 @@ class Board:
         if not moves_done:
             return
 
+        self.move_generator.pop_ply()
         move_info = moves_done[-1]
 
         # Restore general info
@@ -432,16 +446,11 @@ class Board:
         More efficient than checking every piece manually.
         """
 
-        # Use a MoveGenerator for the attacker color
-        mg = MoveGenerator(self)
-
-        enemy_attack_map = mg.generate_enemy_attack_map(color=attacker_color)
-
         # Convert (x, y) to bitboard index (0-63)
         sq_index = target_sq[1] * 8 + target_sq[0]
 
-        # Check if target square is attacked
-        return (enemy_attack_map >> sq_index) & 1 != 0
+        attackers = self.board_data.attackers_to(sq_index)
+        return attackers & self.board_data.color_pieces[0 if attacker_color == "white" else 1] != 0
 
     def find_king(self, color: str) -> tuple[int, int] | None:
         """Return (x,y) of the king of given color, or None if not found."""
@@ -451,48 +460,26 @@ class Board:
         return None
 
     def is_in_check(self, color: str) -> bool:
-        king_pos = self.find_king(color)
-        if king_pos is None:
-            return False  # should not happen normally
-        enemy_color = "black" if color == "white" else "white"
-        return self.is_square_attacked(king_pos, enemy_color)
+        color_id = 0 if color == "white" else 1
+        king_bb = self.board_data.pieces_bitboard[Piece.King - 1 + 6 * color_id]
+        # The incremental attack sets only recompute what changed since the last query
+        return self.board_data.attacks_by_side(1 - color_id) & king_bb != 0
 
     def get_legal_moves(self, pseudo_legal_moves: list[Move]):
         """
-        Filters pseudo-legal moves into truly legal moves.
-        Uses make_move and undo_move to test king safety.
-        Works for both white and black.
+        Filters the generator's moves down to legal ones. In legal mode they
+        already are; in pseudo-legal mode each one goes through is_legal.
         """
-        legal_moves =pseudo_legal_moves
-        # legal_moves = []
-        # for move in pseudo_legal_moves:
-        #     side_just_moved = self.board_data.is_whites_turn
-        #     # 1. Make the move on the actual board state
-        #     captured_piece, moves_done, status = self.make_move(move)
-        #
-        #     # 3. Get the king square for the side that just moved
-        #     king_sq = self.king_square(side_just_moved)
-        #
-        #     # 4. Generate enemy attack map for the opponent of the side that just moved
-        #     mg = MoveGenerator(self)
-        #     turn  = "white" if  self.board_data.is_whites_turn else "black"
-        #     enemy_attack_map = mg.generate_enemy_attack_map(color=turn)
-        #
-        #     # 5. Only keep moves where our king is not in check
-        #     if king_sq != -1 and not ((enemy_attack_map >> king_sq) & 1):
-        #         legal_moves.append(move)
-        #
-        #     # 6. Undo the move immediately
-        #     self.undo_move(moves_done)
-
-        return legal_moves
+        generator = self.move_generator
+        if not generator.pseudo_legal:
+            return pseudo_legal_moves
+        return [move for move in pseudo_legal_moves if generator.is_legal(move)]
 
     def generate_all_legal_moves(self) -> list[Move]:
         """
         Generate all legal moves for a color using bitboard-based MoveGenerator.
         """
-        mg = MoveGenerator(self)
-        all_moves = mg.generate_all_moves()
+        all_moves = self.move_generator.generate_all_moves()
 
 
         # Finally filter for king safety
@@ -500,15 +487,42 @@ class Board:
 
         return legal_moves
 
+    def generate_move_buffer(self) -> MoveBuffer:
+        """
+        Legal moves as the generator's per-ply MoveBuffer (no list is built).
+        Valid until another position at the same ply is generated.
+        """
+        return self.move_generator.generate_moves()
+
+    def count_legal_moves(self) -> int:
+        """Number of legal moves, counted without generating them (MoveGenerator.count_moves)."""
+        return self.move_generator.count_moves()
+
+    def see(self, move: Move) -> int:
+        """Static exchange evaluation of `move` in centipawns (see StaticExchange)."""
+        return StaticExchange.see(self.board_data, move)
+
+    def see_ge(self, move: Move, threshold: int = 0) -> bool:
+        """True if the static exchange started by `move` wins at least `threshold` centipawns."""
+        return StaticExchange.see_ge(self.board_data, move, threshold)
+
+    def has_legal_move(self) -> bool:
+        """True if the side to move has a legal move (stops at the first one)."""
+        generator = self.move_generator
+        moves = generator.generate_all_moves()
+        if not generator.pseudo_legal:
+            return len(moves) > 0
+        return any(generator.is_legal(move) for move in moves)
+
     def is_checkmate(self, color: str) -> bool:
         if not self.is_in_check(color):
             return False
-        return len(self.generate_all_legal_moves()) == 0
+        return not self.has_legal_move()
 
     def is_stalemate(self, color: str) -> bool:
         if self.is_in_check(color):
             return False
-        return len(self.generate_all_legal_moves()) == 0
+        return not self.has_legal_move()
 
     def sq_index(self, pos):
         return pos[1] * 8 + pos[0]
@@ -1,5 +1,10 @@
 from game.models.piece import Piece
 from game.models.pieces.pieceold import PieceOld
+from game.move_generation.bitboard_utilities import BitBoardUtility
+from game.move_generation.slider_attacks import SliderAttacks
+
+ALL_SQUARES = 0xFFFFFFFFFFFFFFFF
+ALL_PIECE_TYPES = (1 << 12) - 1
 
 
 class BoardState:
@@ -40,6 +45,13 @@ class BoardState:
         self.halfmove_clock = 0
         self.fullmove_number = 1
 
+        # ATTACKS (maintained incrementally, see update_attacks)
+        self.square_piece = [-1] * 64      # piece index on each square, -1 if empty
+        self.square_attacks = [0] * 64     # squares attacked by the piece on each square
+        self.piece_attacks = [0] * 12      # union of square_attacks per piece index
+        self.dirty_squares = ALL_SQUARES   # squares changed since the last update
+        self.dirty_types = ALL_PIECE_TYPES # piece indices whose union must be rebuilt
+
         # SLIDING PIECES (to be updated)
         self.friendly_orthogonal_sliders = 0
         self.friendly_diagonal_sliders = 0
@@ -89,6 +101,7 @@ class BoardState:
         self.pieces_bitboard = [0] * 12
         self.color_pieces = [0, 0]  # [white, black]
         self.all_pieces = 0
+        self.square_piece = [-1] * 64
 
         # Mapping piece type → index
         type_index_map = {
@@ -113,6 +126,11 @@ class BoardState:
 
             # Add to occupancy
             self.all_pieces |= bit
+            self.square_piece[y * 8 + x] = idx
+
+        # Every attack set has to be recomputed
+        self.dirty_squares = ALL_SQUARES
+        self.dirty_types = ALL_PIECE_TYPES
     def place_piece(self, piece: PieceOld, pos: tuple[int, int], debug=True) -> None:
         if piece is None : return
         piece.position = pos
@@ -135,6 +153,9 @@ class BoardState:
             #     total_bits=self.SIZE * self.SIZE
             # )
         self.pieces_bitboard[bitboard_id] |= (1 << pos_number)
+        self.square_piece[pos_number] = bitboard_id
+        self.dirty_squares |= 1 << pos_number
+        self.dirty_types |= 1 << bitboard_id
         # if debug:
         #     print("after setting")
             # self.visualize_bit_change(
@@ -161,6 +182,9 @@ class BoardState:
         # update piece-type bitboard
         # piece_index = self.PIECE_TO_INDEX[bitboard_id]
         self.pieces_bitboard[bitboard_id] &= ~(1 << pos_number)
+        self.square_piece[pos_number] = -1
+        self.dirty_squares |= 1 << pos_number
+        self.dirty_types |= 1 << bitboard_id
 
         # if debug:
             # self.visualize_bit_change(
@@ -170,6 +194,112 @@ class BoardState:
             # )
 
         return piece
+    # -----------------------------
+    # ATTACK BITBOARDS
+    # -----------------------------
+    @staticmethod
+    def compute_piece_attacks(piece_index: int, sq: int, occupancy: int) -> int:
+        """Squares attacked by piece `piece_index` (0-11) standing on `sq`."""
+        piece_type = piece_index % 6 + 1
+        if piece_type == Piece.Pawn:
+            table = BitBoardUtility.WHITE_PAWN_ATTACKS if piece_index < 6 else BitBoardUtility.BLACK_PAWN_ATTACKS
+            return table[sq]
+        if piece_type == Piece.Knight:
+            return BitBoardUtility.KNIGHT_ATTACKS[sq]
+        if piece_type == Piece.Bishop:
+            return SliderAttacks.get_bishop_attacks(sq, occupancy)
+        if piece_type == Piece.Rook:
+            return SliderAttacks.get_rook_attacks(sq, occupancy)
+        if piece_type == Piece.Queen:
+            return SliderAttacks.get_queen_attacks(sq, occupancy)
+        return BitBoardUtility.KING_ATTACKS[sq]
+
+    def update_attacks(self):
+        """
+        Bring square_attacks / piece_attacks up to date with the pieces placed
+        and removed since the last call.
+
+        Only the changed squares and the sliders whose current rays cross one of
+        them are recomputed; every other attack set is still valid.
+        """
+        dirty = self.dirty_squares
+        if not dirty:
+            return
+
+        occupancy = self.all_pieces
+        square_piece = self.square_piece
+        square_attacks = self.square_attacks
+        bitboards = self.pieces_bitboard
+        dirty_types = self.dirty_types
+
+        # Sliders whose rays reach a changed square see a different blocker set
+        sliders = (bitboards[2] | bitboards[3] | bitboards[4] | bitboards[8] | bitboards[9] | bitboards[10]) & ~dirty
+        recompute = dirty
+        for sq in BitBoardUtility.squares(sliders):
+            if square_attacks[sq] & dirty:
+                recompute |= 1 << sq
+                dirty_types |= 1 << square_piece[sq]
+
+        for sq in BitBoardUtility.squares(recompute):
+            piece_index = square_piece[sq]
+            square_attacks[sq] = 0 if piece_index < 0 else self.compute_piece_attacks(piece_index, sq, occupancy)
+
+        piece_index = 0
+        while dirty_types:
+            if dirty_types & 1:
+                attacks = 0
+                pieces = bitboards[piece_index]
+                for sq in BitBoardUtility.squares(pieces):
+                    attacks |= square_attacks[sq]
+                self.piece_attacks[piece_index] = attacks
+            dirty_types >>= 1
+            piece_index += 1
+
+        self.dirty_squares = 0
+        self.dirty_types = 0
+
+    def attackers_to(self, sq: int, occupancy: int | None = None) -> int:
+        """
+        Bitboard of every piece (both colours) attacking `sq`.
+
+        Works backwards from the target: a knight on `sq` would attack exactly
+        the squares knights attack it from, and likewise for the other pieces.
+        Pass a modified `occupancy` to look through pieces (x-rays, en passant);
+        pieces missing from `occupancy` are never reported as attackers.
+        """
+        if occupancy is None:
+            occupancy = self.all_pieces
+        bitboards = self.pieces_bitboard
+        diagonal = bitboards[2] | bitboards[4] | bitboards[8] | bitboards[10]
+        orthogonal = bitboards[3] | bitboards[4] | bitboards[9] | bitboards[10]
+
+        attackers = (
+            (BitBoardUtility.BLACK_PAWN_ATTACKS[sq] & bitboards[0])
+            | (BitBoardUtility.WHITE_PAWN_ATTACKS[sq] & bitboards[6])
+            | (BitBoardUtility.KNIGHT_ATTACKS[sq] & (bitboards[1] | bitboards[7]))
+            | (BitBoardUtility.KING_ATTACKS[sq] & (bitboards[5] | bitboards[11]))
+        )
+        if diagonal:
+            attackers |= SliderAttacks.get_bishop_attacks(sq, occupancy) & diagonal
+        if orthogonal:
+            attackers |= SliderAttacks.get_rook_attacks(sq, occupancy) & orthogonal
+        return attackers & occupancy
+
+    def attacks_by_piece(self, piece_index: int) -> int:
+        """Squares attacked by all pieces of index `piece_index` (0-11)."""
+        if self.dirty_squares:
+            self.update_attacks()
+        return self.piece_attacks[piece_index]
+
+    def attacks_by_side(self, color_id: int) -> int:
+        """Squares attacked by every piece of one side (0 = white, 1 = black)."""
+        if self.dirty_squares:
+            self.update_attacks()
+        base = 6 * color_id
+        attacks = self.piece_attacks
+        return (attacks[base] | attacks[base + 1] | attacks[base + 2]
+                | attacks[base + 3] | attacks[base + 4] | attacks[base + 5])
+
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return False
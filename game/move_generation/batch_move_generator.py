@@ -0,0 +1,336 @@
+"""
+Setwise move generation for many positions at once, on NumPy arrays.
+
+Positions are rows of an (N, 12) uint64 array in the BoardState piece order
+(white P N B R Q K, then black). Everything is computed with whole-board
+shifts, masks and Kogge-Stone fills over all rows at once; there is no
+per-square loop.
+
+Move counts rely on one property of setwise generation: for a single
+direction (one knight jump, one pawn capture direction, one slider ray
+direction) the targets of different pieces never coincide, so a popcount
+per direction counts moves exactly.
+
+NumPy is optional for the rest of the engine; only this module needs it.
+"""
+from game.startup import Startup
+
+np = Startup.optional_import("numpy")
+
+FULL_BOARD = 0xFFFFFFFFFFFFFFFF
+NOT_A_FILE = 0xFEFEFEFEFEFEFEFE
+NOT_H_FILE = 0x7F7F7F7F7F7F7F7F
+NOT_AB_FILE = 0xFCFCFCFCFCFCFCFC
+NOT_GH_FILE = 0x3F3F3F3F3F3F3F3F
+RANK_1 = 0x00000000000000FF
+RANK_3 = 0x0000000000FF0000
+RANK_6 = 0x0000FF0000000000
+RANK_8 = 0xFF00000000000000
+
+# (shift, mask of valid destination squares); positive shifts go towards h8
+ORTHOGONAL_DIRECTIONS = ((8, FULL_BOARD), (-8, FULL_BOARD), (1, NOT_A_FILE), (-1, NOT_H_FILE))
+DIAGONAL_DIRECTIONS = ((9, NOT_A_FILE), (7, NOT_H_FILE), (-7, NOT_A_FILE), (-9, NOT_H_FILE))
+KING_DIRECTIONS = ORTHOGONAL_DIRECTIONS + DIAGONAL_DIRECTIONS
+KNIGHT_DIRECTIONS = (
+    (17, NOT_A_FILE), (15, NOT_H_FILE), (10, NOT_AB_FILE), (6, NOT_GH_FILE),
+    (-6, NOT_AB_FILE), (-10, NOT_GH_FILE), (-15, NOT_A_FILE), (-17, NOT_H_FILE),
+)
+
+# Castling rights bits, as packed by BatchMoveGenerator.pack_boards
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+
+# (right bit, squares that must be empty, squares the king crosses, king destination)
+WHITE_CASTLES = ((WHITE_KINGSIDE, 0x60, 0x60, 0x40), (WHITE_QUEENSIDE, 0x0E, 0x0C, 0x04))
+BLACK_CASTLES = ((BLACK_KINGSIDE, 0x60 << 56, 0x60 << 56, 0x40 << 56),
+                 (BLACK_QUEENSIDE, 0x0E << 56, 0x0C << 56, 0x04 << 56))
+
+
+class BatchMoveGenerator:
+
+    # ----------------- Input -----------------
+    @staticmethod
+    def pack_boards(boards) -> tuple:
+        """
+        (bitboards (N, 12) uint64, white_to_move (N,) bool, castling (N,) uint8,
+        ep_square (N,) int8 with -1 for none) for a sequence of Board objects.
+        """
+        BatchMoveGenerator._require_numpy()
+        count = len(boards)
+        bitboards = np.zeros((count, 12), dtype=np.uint64)
+        white_to_move = np.zeros(count, dtype=bool)
+        castling = np.zeros(count, dtype=np.uint8)
+        ep_square = np.full(count, -1, dtype=np.int8)
+
+        for row, board in enumerate(boards):
+            state = board.board_data
+            bitboards[row] = state.pieces_bitboard
+            white_to_move[row] = state.is_whites_turn
+            rights = state.castling_rights
+            castling[row] = (
+                (WHITE_KINGSIDE if rights["white"]["K"] else 0) | (WHITE_QUEENSIDE if rights["white"]["Q"] else 0)
+                | (BLACK_KINGSIDE if rights["black"]["K"] else 0) | (BLACK_QUEENSIDE if rights["black"]["Q"] else 0)
+            )
+            if state.en_passant_target is not None:
+                x, y = state.en_passant_target
+                ep_square[row] = y * 8 + x
+        return bitboards, white_to_move, castling, ep_square
+
+    # ----------------- Outputs -----------------
+    @staticmethod
+    def attack_sets(bitboards) -> "np.ndarray":
+        """(N, 12) squares attacked by each piece index (own pieces included, as in BoardState)."""
+        BatchMoveGenerator._require_numpy()
+        bitboards = np.asarray(bitboards, dtype=np.uint64)
+        empty = ~np.bitwise_or.reduce(bitboards, axis=1)
+
+        attacks = np.zeros_like(bitboards)
+        for base, pawn_directions in ((0, ((9, NOT_A_FILE), (7, NOT_H_FILE))),
+                                      (6, ((-7, NOT_A_FILE), (-9, NOT_H_FILE)))):
+            attacks[:, base] = BatchMoveGenerator._step_all(bitboards[:, base], pawn_directions)
+            attacks[:, base + 1] = BatchMoveGenerator._step_all(bitboards[:, base + 1], KNIGHT_DIRECTIONS)
+            attacks[:, base + 2] = BatchMoveGenerator._slide_all(bitboards[:, base + 2], empty, DIAGONAL_DIRECTIONS)
+            attacks[:, base + 3] = BatchMoveGenerator._slide_all(bitboards[:, base + 3], empty, ORTHOGONAL_DIRECTIONS)
+            attacks[:, base + 4] = BatchMoveGenerator._slide_all(bitboards[:, base + 4], empty, KING_DIRECTIONS)
+            attacks[:, base + 5] = BatchMoveGenerator._step_all(bitboards[:, base + 5], KING_DIRECTIONS)
+        return attacks
+
+    @staticmethod
+    def pseudo_legal_targets(bitboards, white_to_move, castling=None, ep_square=None) -> "np.ndarray":
+        """
+        (N, 6) target squares of the side to move, per piece type (pawn .. king).
+        Checks and pins are ignored; castling targets are included when the right
+        is held and the squares between king and rook are empty.
+        """
+        BatchMoveGenerator._require_numpy()
+        us, them, white = BatchMoveGenerator._sides(bitboards, white_to_move)
+        us_all = np.bitwise_or.reduce(us, axis=1)
+        them_all = np.bitwise_or.reduce(them, axis=1)
+        empty = ~(us_all | them_all)
+        not_us = ~us_all
+        ep_bb = BatchMoveGenerator._ep_bitboard(ep_square, len(white))
+
+        targets = np.zeros_like(us)
+        pushes, double_pushes, captures = BatchMoveGenerator._pawn_targets(us[:, 0], empty, them_all | ep_bb, white)
+        targets[:, 0] = pushes | double_pushes | captures[0] | captures[1]
+        targets[:, 1] = BatchMoveGenerator._step_all(us[:, 1], KNIGHT_DIRECTIONS) & not_us
+        targets[:, 2] = BatchMoveGenerator._slide_all(us[:, 2], empty, DIAGONAL_DIRECTIONS) & not_us
+        targets[:, 3] = BatchMoveGenerator._slide_all(us[:, 3], empty, ORTHOGONAL_DIRECTIONS) & not_us
+        targets[:, 4] = BatchMoveGenerator._slide_all(us[:, 4], empty, KING_DIRECTIONS) & not_us
+        targets[:, 5] = BatchMoveGenerator._step_all(us[:, 5], KING_DIRECTIONS) & not_us
+
+        if castling is not None:
+            castling = np.asarray(castling)
+            for castles, side_rows in ((WHITE_CASTLES, white), (BLACK_CASTLES, ~white)):
+                for right, between, _, target in castles:
+                    allowed = side_rows & ((castling & right) != 0) & ((~empty & np.uint64(between)) == 0)
+                    targets[:, 5] |= np.where(allowed, np.uint64(target), np.uint64(0))
+        return targets
+
+    @staticmethod
+    def legal_move_counts(bitboards, white_to_move, castling, ep_square) -> "np.ndarray":
+        """(N,) number of legal moves for the side to move in every position."""
+        BatchMoveGenerator._require_numpy()
+        zero = np.uint64(0)
+        us, them, white = BatchMoveGenerator._sides(bitboards, white_to_move)
+        us_all = np.bitwise_or.reduce(us, axis=1)
+        them_all = np.bitwise_or.reduce(them, axis=1)
+        occupancy = us_all | them_all
+        empty = ~occupancy
+        king = us[:, 5]
+        them_diagonal = them[:, 2] | them[:, 4]
+        them_orthogonal = them[:, 3] | them[:, 4]
+
+        # ---- Checkers, check mask and pins, one ray direction at a time ----
+        checkers = (
+            (BatchMoveGenerator._pawn_attacks(king, white) & them[:, 0])
+            | (BatchMoveGenerator._step_all(king, KNIGHT_DIRECTIONS) & them[:, 1])
+        )
+        blocking_rays = np.zeros_like(king)
+        pins = []  # (pinned piece, squares it may still move to) per direction
+        for directions, sliders in ((ORTHOGONAL_DIRECTIONS, them_orthogonal), (DIAGONAL_DIRECTIONS, them_diagonal)):
+            for shift, wrap in directions:
+                ray = BatchMoveGenerator._ray(king, empty, shift, wrap)
+                checker = ray & sliders
+                checkers |= checker
+                blocking_rays |= np.where(checker != 0, ray, zero)
+
+                candidate = ray & us_all
+                beyond = BatchMoveGenerator._ray(candidate, empty, shift, wrap)
+                pinned = (beyond & sliders) != 0
+                pins.append((np.where(pinned, candidate, zero), np.where(pinned, ray | beyond, zero)))
+
+        checker_count = BatchMoveGenerator.popcount(checkers)
+        check_mask = np.where(checker_count == 0, np.uint64(FULL_BOARD),
+                              np.where(checker_count == 1, checkers | blocking_rays, zero))
+        target_mask = ~us_all & check_mask
+
+        # ---- Non-king moves: free pieces, then each pinned piece along its pin line ----
+        pinned_all = np.bitwise_or.reduce(np.stack([piece for piece, _ in pins]), axis=0)
+        counts = BatchMoveGenerator._count_moves(us, us_all & ~king & ~pinned_all, target_mask, them_all, empty, white)
+        for piece, line in pins:
+            counts += BatchMoveGenerator._count_moves(us, piece, target_mask & line, them_all, empty, white)
+
+        # ---- King moves: enemy attacks with our king lifted off the board ----
+        enemy_attacks_through_king = BatchMoveGenerator._side_attacks(them, empty | king, ~white)
+        counts += BatchMoveGenerator.popcount(
+            BatchMoveGenerator._step_all(king, KING_DIRECTIONS) & ~us_all & ~enemy_attacks_through_king
+        )
+
+        # ---- Castling ----
+        castling = np.asarray(castling)
+        enemy_attacks = BatchMoveGenerator._side_attacks(them, empty, ~white)
+        for castles, side_rows in ((WHITE_CASTLES, white), (BLACK_CASTLES, ~white)):
+            for right, between, crossed, _ in castles:
+                allowed = (
+                    side_rows & (checker_count == 0) & ((castling & right) != 0)
+                    & ((occupancy & np.uint64(between)) == 0) & ((enemy_attacks & np.uint64(crossed)) == 0)
+                )
+                counts += allowed
+
+        # ---- En passant: replay the capture on the occupancy and look for any attacker ----
+        ep_bb = BatchMoveGenerator._ep_bitboard(ep_square, len(white))
+        captured = np.where(white, ep_bb >> np.uint64(8), ep_bb << np.uint64(8))
+        for white_shift, black_shift, wrap_white, wrap_black in ((-7, 7, NOT_A_FILE, NOT_H_FILE),
+                                                                 (-9, 9, NOT_H_FILE, NOT_A_FILE)):
+            capturer = np.where(
+                white,
+                BatchMoveGenerator._shift(ep_bb, white_shift) & np.uint64(wrap_white),
+                BatchMoveGenerator._shift(ep_bb, black_shift) & np.uint64(wrap_black),
+            ) & us[:, 0]
+            empty_after = ~(occupancy ^ capturer ^ captured ^ ep_bb)
+            exposed = BatchMoveGenerator._attackers_to(king, them, them[:, 0] & ~captured, empty_after, white)
+            counts += (capturer != 0) & (exposed == 0)
+
+        return counts
+
+    # ----------------- Setwise primitives -----------------
+    @staticmethod
+    def popcount(bitboards) -> "np.ndarray":
+        if hasattr(np, "bitwise_count"):
+            return np.bitwise_count(bitboards).astype(np.int64)
+        x = bitboards - ((bitboards >> np.uint64(1)) & np.uint64(0x5555555555555555))
+        x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+        x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+        return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+    @staticmethod
+    def _shift(bitboards, shift: int):
+        if shift > 0:
+            return bitboards << np.uint64(shift)
+        return bitboards >> np.uint64(-shift)
+
+    @staticmethod
+    def _ray(gen, empty, shift: int, wrap: int):
+        """Kogge-Stone occluded fill in one direction, up to and including the first blocker."""
+        _shift = BatchMoveGenerator._shift
+        wrap = np.uint64(wrap)
+        empty = empty & wrap
+        gen = gen | (empty & _shift(gen, shift))
+        empty = empty & _shift(empty, shift)
+        gen = gen | (empty & _shift(gen, 2 * shift))
+        empty = empty & _shift(empty, 2 * shift)
+        gen = gen | (empty & _shift(gen, 4 * shift))
+        return _shift(gen, shift) & wrap
+
+    @staticmethod
+    def _slide_all(sliders, empty, directions):
+        attacks = np.zeros_like(sliders)
+        for shift, wrap in directions:
+            attacks |= BatchMoveGenerator._ray(sliders, empty, shift, wrap)
+        return attacks
+
+    @staticmethod
+    def _step_all(pieces, directions):
+        attacks = np.zeros_like(pieces)
+        for shift, wrap in directions:
+            attacks |= BatchMoveGenerator._shift(pieces, shift) & np.uint64(wrap)
+        return attacks
+
+    @staticmethod
+    def _pawn_attacks(pawns, white):
+        """Squares attacked by pawns of the colour given per row."""
+        return np.where(
+            white,
+            BatchMoveGenerator._step_all(pawns, ((9, NOT_A_FILE), (7, NOT_H_FILE))),
+            BatchMoveGenerator._step_all(pawns, ((-7, NOT_A_FILE), (-9, NOT_H_FILE))),
+        )
+
+    @staticmethod
+    def _pawn_targets(pawns, empty, capturable, white):
+        """(single pushes, double pushes, (captures one way, captures the other way)) per row."""
+        _shift = BatchMoveGenerator._shift
+        forward = lambda bb: np.where(white, _shift(bb, 8), _shift(bb, -8))
+        pushes = forward(pawns) & empty
+        double_pushes = forward(pushes & np.where(white, np.uint64(RANK_3), np.uint64(RANK_6))) & empty
+        captures = (
+            np.where(white, _shift(pawns, 9) & np.uint64(NOT_A_FILE), _shift(pawns, -7) & np.uint64(NOT_A_FILE)),
+            np.where(white, _shift(pawns, 7) & np.uint64(NOT_H_FILE), _shift(pawns, -9) & np.uint64(NOT_H_FILE)),
+        )
+        return pushes, double_pushes, tuple(capture & capturable for capture in captures)
+
+    @staticmethod
+    def _side_attacks(pieces, empty, white):
+        """Every square attacked by the (N, 6) `pieces` of the colour given per row."""
+        return (
+            BatchMoveGenerator._pawn_attacks(pieces[:, 0], white)
+            | BatchMoveGenerator._step_all(pieces[:, 1], KNIGHT_DIRECTIONS)
+            | BatchMoveGenerator._slide_all(pieces[:, 2] | pieces[:, 4], empty, DIAGONAL_DIRECTIONS)
+            | BatchMoveGenerator._slide_all(pieces[:, 3] | pieces[:, 4], empty, ORTHOGONAL_DIRECTIONS)
+            | BatchMoveGenerator._step_all(pieces[:, 5], KING_DIRECTIONS)
+        )
+
+    @staticmethod
+    def _attackers_to(square_bb, them, them_pawns, empty, white):
+        """Enemy pieces attacking `square_bb`, where `white` is the colour of the side being attacked."""
+        return (
+            (BatchMoveGenerator._pawn_attacks(square_bb, white) & them_pawns)
+            | (BatchMoveGenerator._step_all(square_bb, KNIGHT_DIRECTIONS) & them[:, 1])
+            | (BatchMoveGenerator._slide_all(square_bb, empty, DIAGONAL_DIRECTIONS) & (them[:, 2] | them[:, 4]))
+            | (BatchMoveGenerator._slide_all(square_bb, empty, ORTHOGONAL_DIRECTIONS) & (them[:, 3] | them[:, 4]))
+        )
+
+    @staticmethod
+    def _count_moves(us, movers, target_mask, them_all, empty, white):
+        """Moves of the non-king pieces in `movers` onto `target_mask`, per row (en passant excluded)."""
+        count = BatchMoveGenerator.popcount
+        promotion_rank = np.where(white, np.uint64(RANK_8), np.uint64(RANK_1))
+
+        pushes, double_pushes, captures = BatchMoveGenerator._pawn_targets(us[:, 0] & movers, empty, them_all, white)
+        total = count(double_pushes & target_mask)
+        for targets in (pushes, captures[0], captures[1]):
+            targets = targets & target_mask
+            total += count(targets & ~promotion_rank) + 4 * count(targets & promotion_rank)
+
+        knights = us[:, 1] & movers
+        for shift, wrap in KNIGHT_DIRECTIONS:
+            total += count(BatchMoveGenerator._shift(knights, shift) & np.uint64(wrap) & target_mask)
+
+        for directions, sliders in ((DIAGONAL_DIRECTIONS, us[:, 2] | us[:, 4]),
+                                    (ORTHOGONAL_DIRECTIONS, us[:, 3] | us[:, 4])):
+            sliders = sliders & movers
+            for shift, wrap in directions:
+                total += count(BatchMoveGenerator._ray(sliders, empty, shift, wrap) & target_mask)
+        return total
+
+    @staticmethod
+    def _sides(bitboards, white_to_move):
+        """(our (N, 6) pieces, their (N, 6) pieces, white_to_move as a bool array)."""
+        bitboards = np.asarray(bitboards, dtype=np.uint64)
+        white = np.asarray(white_to_move, dtype=bool)
+        us = np.where(white[:, None], bitboards[:, :6], bitboards[:, 6:])
+        them = np.where(white[:, None], bitboards[:, 6:], bitboards[:, :6])
+        return us, them, white
+
+    @staticmethod
+    def _ep_bitboard(ep_square, count: int):
+        if ep_square is None:
+            return np.zeros(count, dtype=np.uint64)
+        ep_square = np.asarray(ep_square, dtype=np.int64)
+        has_target = ep_square >= 0
+        bits = np.left_shift(np.uint64(1), np.where(has_target, ep_square, 0).astype(np.uint64))
+        return np.where(has_target, bits, np.uint64(0))
+
+    @staticmethod
+    def _require_numpy():
+        if np is None:
+            raise ModuleNotFoundError("BatchMoveGenerator needs numpy (pip install numpy)", name="numpy")
@@ -1,7 +1,10 @@
 # BitBoardUtility.py
-from typing import List
+from array import array
+from functools import lru_cache
+from typing import List, Sequence
 
 from game.models.piece import Piece
+from game.move_generation.table_cache import TableCache
 
 
 class BitBoardUtility:
@@ -11,6 +14,8 @@ class BitBoardUtility:
     FILE_H = FILE_A << 7
     NOT_A_FILE = ~FILE_A & 0xFFFFFFFFFFFFFFFF
     NOT_H_FILE = ~FILE_H & 0xFFFFFFFFFFFFFFFF
+    NOT_AB_FILE = NOT_A_FILE & (NOT_A_FILE << 1)
+    NOT_GH_FILE = NOT_H_FILE & (NOT_H_FILE >> 1)
 
     # Ranks
     RANK1 = 0xFF
@@ -34,18 +39,94 @@ class BitBoardUtility:
     KING_ATTACKS: List[int] = [0] * 64
     WHITE_PAWN_ATTACKS: List[int] = [0] * 64
     BLACK_PAWN_ATTACKS: List[int] = [0] * 64
-    BETWEEN_MASKS: List[List[int]] = [[0] * 64 for _ in range(64)]
+    # 64x64 tables, flat: the mask for squares (a, b) is at a * 64 + b
+    BETWEEN_MASKS: Sequence[int] = [0] * 4096
+    LINE_MASKS: Sequence[int] = [0] * 4096
+
+    # Every static table packed into one uint64 buffer, in this order
+    TABLE_LAYOUT = (
+        ("KNIGHT_ATTACKS", 64), ("KING_ATTACKS", 64), ("WHITE_PAWN_ATTACKS", 64), ("BLACK_PAWN_ATTACKS", 64),
+        ("BETWEEN_MASKS", 4096), ("LINE_MASKS", 4096),
+    )
+    # Bump when any table generator changes, so stale cache files are rebuilt
+    TABLES_FORMAT = 1
+    PackedTables: Sequence[int] = ()
+    # (shared memory block, created by this process) for every block in use here
+    _shared_blocks: list = []
+
+    # [byte position][byte value] -> square indices of the set bits in that byte
+    BYTE_SQUARES: List[List[tuple[int, ...]]] = [
+        [tuple(rank * 8 + bit for bit in range(8) if (value >> bit) & 1) for value in range(256)]
+        for rank in range(8)
+    ]
+    # Distinct bitboards kept by the `squares` cache
+    SQUARES_CACHE_SIZE = 4096
 
     @staticmethod
     def init_attack_tables():
-        BitBoardUtility.BETWEEN_MASKS = BitBoardUtility.generate_between_masks()
-        for sq in range(64):
-            BitBoardUtility.KNIGHT_ATTACKS[sq] = BitBoardUtility.compute_knight_attacks(sq)
-            BitBoardUtility.KING_ATTACKS[sq] = BitBoardUtility.compute_king_attacks(sq)
-            BitBoardUtility.WHITE_PAWN_ATTACKS[sq] = BitBoardUtility.compute_pawn_attacks(sq, white=True)
-            BitBoardUtility.BLACK_PAWN_ATTACKS[sq] = BitBoardUtility.compute_pawn_attacks(sq, white=False)
+        """Map the packed tables from the on-disk cache, building them first if needed."""
+        BitBoardUtility.bind_tables(TableCache.load_or_build(
+            "bitboard_tables", TableCache.fingerprint(BitBoardUtility.TABLES_FORMAT), BitBoardUtility.build_tables,
+        ))
 
+    @staticmethod
+    def build_tables() -> array:
+        """All static tables, packed in TABLE_LAYOUT order."""
+        packed = array("Q")
+        packed.extend(BitBoardUtility.compute_knight_attacks(sq) for sq in range(64))
+        packed.extend(BitBoardUtility.compute_king_attacks(sq) for sq in range(64))
+        packed.extend(BitBoardUtility.compute_pawn_attacks(sq, white=True) for sq in range(64))
+        packed.extend(BitBoardUtility.compute_pawn_attacks(sq, white=False) for sq in range(64))
+        for masks in (BitBoardUtility.generate_between_masks(), BitBoardUtility.generate_line_masks()):
+            packed.extend(mask for row in masks for mask in row)
+        return packed
 
+    @staticmethod
+    def bind_tables(packed: Sequence[int]):
+        """Point every table at its slice of the packed buffer (no copies for the 64x64 tables)."""
+        BitBoardUtility.PackedTables = packed
+        offset = 0
+        for name, size in BitBoardUtility.TABLE_LAYOUT:
+            view = packed[offset:offset + size]
+            # The 64-entry tables sit on the hottest paths, and CPython reads list
+            # items ~1.6x faster than uint64 buffer items (about 50 vs 80 ns in
+            # bitboard_tables_benchmark), so those few hundred ints are copied out
+            setattr(BitBoardUtility, name, list(view) if size == 64 else view)
+            offset += size
+
+    @staticmethod
+    def share_tables() -> str:
+        """
+        Copy the packed tables into a new shared memory block and return its
+        name. Worker processes pass it to attach_shared_tables.
+        """
+        from multiprocessing import shared_memory
+
+        packed = BitBoardUtility.PackedTables
+        block = shared_memory.SharedMemory(create=True, size=len(packed) * 8)
+        with block.buf.cast("Q") as words:
+            words[:] = memoryview(packed)
+        BitBoardUtility._shared_blocks.append((block, True))
+        return block.name
+
+    @staticmethod
+    def attach_shared_tables(name: str):
+        """Use the tables in shared memory block `name` (see share_tables), without copying them."""
+        from multiprocessing import shared_memory
+
+        block = shared_memory.SharedMemory(name=name)
+        BitBoardUtility._shared_blocks.append((block, False))
+        BitBoardUtility.bind_tables(block.buf.cast("Q"))
+
+    @staticmethod
+    def release_shared_tables():
+        """Go back to the cached tables and close (and unlink, if created here) every shared block."""
+        BitBoardUtility.init_attack_tables()
+        for block, created in BitBoardUtility._shared_blocks:
+            block.close()
+            if created:
+                block.unlink()
+        BitBoardUtility._shared_blocks.clear()
 
     @staticmethod
     def valid_square_index(x: int, y: int):
@@ -87,6 +168,19 @@ class BitBoardUtility:
                 attacks |= 1 << (ny*8 + nx)
         return attacks
 
+    # Setwise attacks of every piece in a bitboard at once
+    @staticmethod
+    def knight_attacks_setwise(knights: int) -> int:
+        one_file = ((knights << 1) & BitBoardUtility.NOT_A_FILE) | ((knights >> 1) & BitBoardUtility.NOT_H_FILE)
+        two_files = ((knights << 2) & BitBoardUtility.NOT_AB_FILE) | ((knights >> 2) & BitBoardUtility.NOT_GH_FILE)
+        return ((one_file << 16) | (one_file >> 16) | (two_files << 8) | (two_files >> 8)) & 0xFFFFFFFFFFFFFFFF
+
+    @staticmethod
+    def king_attacks_setwise(kings: int) -> int:
+        attacks = ((kings << 1) & BitBoardUtility.NOT_A_FILE) | ((kings >> 1) & BitBoardUtility.NOT_H_FILE)
+        row = attacks | kings
+        return (attacks | (row << 8) | (row >> 8)) & 0xFFFFFFFFFFFFFFFF
+
     # Bitboard manipulation functions
     @staticmethod
     def pop_lsb(bitboard: int) -> tuple[int, int]:
@@ -123,6 +217,22 @@ class BitBoardUtility:
         else:
             return (bitboard >> -num_squares) & 0xFFFFFFFFFFFFFFFF
 
+    # Colour mirroring: flipping the ranks turns a black position into a white one
+    @staticmethod
+    def flip_vertical(bitboard: int) -> int:
+        """Mirror a1 <-> a8: one byte per rank, so a byte swap reverses the ranks."""
+        return int.from_bytes(bitboard.to_bytes(8, "little"), "big")
+
+    @staticmethod
+    def mirror_pieces(bitboards: Sequence[int]) -> list[int]:
+        """
+        The 12 piece bitboards of the colour-mirrored position (ranks flipped,
+        white and black swapped). A position and its mirror have the same
+        moves and evaluation, so caches can share one entry for both.
+        """
+        flip = BitBoardUtility.flip_vertical
+        return [flip(bitboards[(index + 6) % 12]) for index in range(12)]
+
     @classmethod
     def valid_move_index(cls, sq: int, target: int, d: int) -> bool:
         """
@@ -185,15 +295,28 @@ class BitBoardUtility:
         else:
             raise ValueError(f"Unknown direction: {direction}")
     @staticmethod
+    @lru_cache(maxsize=SQUARES_CACHE_SIZE)
+    def squares(bitboard: int) -> tuple[int, ...]:
+        """
+        Square indices (0-63) of the set bits, in ascending order.
+
+        The bitboard is split into its 8 bytes and each non-empty byte is looked
+        up in BYTE_SQUARES, so the cost follows the number of occupied ranks
+        rather than the number of bits. Results are cached: the same piece and
+        target sets come back again and again during a search.
+        """
+        squares = ()
+        for rank, value in enumerate(bitboard.to_bytes(8, "little")):
+            if value:
+                squares += BitBoardUtility.BYTE_SQUARES[rank][value]
+        return squares
+
+    @staticmethod
     def squares_from_bitboard(bitboard: int) -> list[int]:
         """
         Returns a list of square indices (0-63) corresponding to set bits in the bitboard.
         """
-        squares = []
-        while bitboard:
-            index, bitboard = BitBoardUtility.pop_lsb(bitboard)
-            squares.append(index)
-        return squares
+        return list(BitBoardUtility.squares(bitboard))
 
     @classmethod
     def bit_scan_forward(cls, bitboard: int) -> int:
@@ -325,6 +448,30 @@ class BitBoardUtility:
 
         return masks
 
+    @staticmethod
+    def generate_line_masks():
+        """
+        Precompute the full line (edge to edge) through any two squares sharing
+        a rank, file or diagonal, both squares included; 0 when not aligned.
+        Returns a 64x64 array of 64-bit integers.
+        """
+        masks = [[0 for _ in range(64)] for _ in range(64)]
+
+        for sq in range(64):
+            file, rank = sq % 8, sq // 8
+            for step_file, step_rank in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                line = 1 << sq
+                for sign in (1, -1):
+                    f, r = file + sign * step_file, rank + sign * step_rank
+                    while 0 <= f < 8 and 0 <= r < 8:
+                        line |= 1 << (r * 8 + f)
+                        f, r = f + sign * step_file, r + sign * step_rank
+
+                for other in BitBoardUtility.squares(line & ~(1 << sq)):
+                    masks[sq][other] = line
+
+        return masks
+
     @staticmethod
     def count_bits(bb: int) -> int:
         """
@@ -1,13 +1,34 @@
-from typing import List
+from array import array
+from typing import List, Sequence, Tuple
 from .magic_helper import MagicHelper
 from .precomputed_magic import PrecomputedMagics
+from game.move_generation.table_cache import TableCache
+
+# (mask, magic, shift, offset into Magic.Attacks) for one square
+MagicEntry = Tuple[int, int, int, int]
+
+FULL_BOARD = 0xFFFFFFFFFFFFFFFF
+
+# Bump when the way tables are generated changes, so stale cache files are rebuilt
+TABLE_FORMAT = 1
 
 
 class Magic:
+    """
+    "Fancy" magic bitboards: every square's attack table lives in one flat
+    uint64 table, rook squares a1..h8 first and bishop squares after them,
+    and each square only keeps its offset into it.
+
+    The table is the memory-mapped cache file itself, so it is never copied
+    into Python objects, and every process mapping the file shares its pages.
+    """
     RookMask: List[int] = [0] * 64
     BishopMask: List[int] = [0] * 64
-    RookAttacks: List[List[int]] = [[] for _ in range(64)]
-    BishopAttacks: List[List[int]] = [[] for _ in range(64)]
+    Attacks: Sequence[int] = ()
+
+    # Everything a lookup needs, resolved once per square
+    RookEntries: List[MagicEntry] = []
+    BishopEntries: List[MagicEntry] = []
 
     @staticmethod
     def get_slider_attacks(square: int, blockers: int, ortho: bool) -> int:
@@ -15,43 +36,66 @@ class Magic:
 
     @staticmethod
     def get_rook_attacks(square: int, blockers: int) -> int:
-        mask = Magic.RookMask[square]
-        magic = PrecomputedMagics.RookMagics[square]
-        shift = PrecomputedMagics.RookShifts[square]
-        relevant_bits = bin(mask).count("1")
-        table_size = 1 << relevant_bits
-        index = ((blockers & mask) * magic) >> (64 - relevant_bits)
-        index &= table_size - 1  # ensure index fits
-        return Magic.RookAttacks[square][index]
+        mask, magic, shift, offset = Magic.RookEntries[square]
+        return Magic.Attacks[offset + ((((blockers & mask) * magic) & FULL_BOARD) >> shift)]
 
     @staticmethod
     def get_bishop_attacks(square: int, blockers: int) -> int:
-        mask = Magic.BishopMask[square]
-        magic = PrecomputedMagics.BishopMagics[square]
-        shift = PrecomputedMagics.BishopShifts[square]
-        relevant_bits = bin(mask).count("1")
-        table_size = 1 << relevant_bits
-        index = ((blockers & mask) * magic) >> (64 - relevant_bits)
-        index &= table_size - 1
-        return Magic.BishopAttacks[square][index]
-
-    # Initialize tables
-    for sq in range(64):
-        RookMask[sq] = MagicHelper.create_movement_mask(sq, True)
-        BishopMask[sq] = MagicHelper.create_movement_mask(sq, False)
-
-    for sq in range(64):
-        def create_table(square: int, rook: bool, magic: int) -> List[int]:
-            movement_mask = MagicHelper.create_movement_mask(square, rook)
-            blocker_patterns = MagicHelper.create_all_blocker_bitboards(movement_mask)
-            relevant_bits = bin(movement_mask).count("1")
-            table_size = 1 << relevant_bits
-            table = [0] * table_size
-            for pattern in blocker_patterns:
-                index = ((pattern & movement_mask) * magic) >> (64 - relevant_bits)
-                index &= table_size - 1
-                table[index] = MagicHelper.legal_move_bitboard_from_blockers(square, pattern, rook)
-            return table
-
-        RookAttacks[sq] = create_table(sq, True, PrecomputedMagics.RookMagics[sq])
-        BishopAttacks[sq] = create_table(sq, False, PrecomputedMagics.BishopMagics[sq])
+        mask, magic, shift, offset = Magic.BishopEntries[square]
+        return Magic.Attacks[offset + ((((blockers & mask) * magic) & FULL_BOARD) >> shift)]
+
+    @staticmethod
+    def get_queen_attacks(square: int, blockers: int) -> int:
+        attacks = Magic.Attacks
+        mask, magic, shift, offset = Magic.RookEntries[square]
+        rook = attacks[offset + ((((blockers & mask) * magic) & FULL_BOARD) >> shift)]
+        mask, magic, shift, offset = Magic.BishopEntries[square]
+        return rook | attacks[offset + ((((blockers & mask) * magic) & FULL_BOARD) >> shift)]
+
+    @staticmethod
+    def create_table(square: int, rook: bool, magic: int, shift: int) -> List[int]:
+        movement_mask = MagicHelper.create_movement_mask(square, rook)
+        blocker_patterns = MagicHelper.create_all_blocker_bitboards(movement_mask)
+        table = [0] * (1 << (64 - shift))
+        for pattern in blocker_patterns:
+            index = ((pattern * magic) & FULL_BOARD) >> shift
+            table[index] = MagicHelper.legal_move_bitboard_from_blockers(square, pattern, rook)
+        return table
+
+    @staticmethod
+    def build_all_tables() -> array:
+        """All rook tables (a1..h8) followed by all bishop tables, as one uint64 array."""
+        tables = array("Q")
+        for rook, magics, shifts in (
+            (True, PrecomputedMagics.RookMagics, PrecomputedMagics.RookShifts),
+            (False, PrecomputedMagics.BishopMagics, PrecomputedMagics.BishopShifts),
+        ):
+            for sq in range(64):
+                tables.extend(Magic.create_table(sq, rook, magics[sq], shifts[sq]))
+        return tables
+
+    @staticmethod
+    def init_tables():
+        """
+        Load the attack tables from the on-disk cache, generating them if needed.
+        Not run at import time: SliderAttacks triggers it on the first lookup.
+        """
+        fingerprint = TableCache.fingerprint(
+            TABLE_FORMAT,
+            PrecomputedMagics.RookMagics, PrecomputedMagics.RookShifts,
+            PrecomputedMagics.BishopMagics, PrecomputedMagics.BishopShifts,
+        )
+        Magic.Attacks = TableCache.load_or_build("magic_attacks", fingerprint, Magic.build_all_tables)
+
+        offset = 0
+        Magic.RookEntries = []
+        Magic.BishopEntries = []
+        for rook, magics, shifts, masks, entries in (
+            (True, PrecomputedMagics.RookMagics, PrecomputedMagics.RookShifts, Magic.RookMask, Magic.RookEntries),
+            (False, PrecomputedMagics.BishopMagics, PrecomputedMagics.BishopShifts,
+             Magic.BishopMask, Magic.BishopEntries),
+        ):
+            for sq in range(64):
+                masks[sq] = MagicHelper.create_movement_mask(sq, rook)
+                entries.append((masks[sq], magics[sq], shifts[sq], offset))
+                offset += 1 << (64 - shifts[sq])
@@ -1,4 +1,5 @@
-from typing import List
+import random
+from typing import List, Tuple
 
 class MagicHelper:
     rook_directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]  # E, W, N, S
@@ -41,12 +42,11 @@ class MagicHelper:
                 x, y = start_x + dx * dist, start_y + dy * dist
                 next_x, next_y = start_x + dx * (dist + 1), start_y + dy * (dist + 1)
 
-                if 0 <= x < 8 and 0 <= y < 8:
-                    mask |= 1 << (y * 8 + x)
-                    if not (0 <= next_x < 8 and 0 <= next_y < 8):
-                        break
-                else:
+                # The last square of a ray can never block anything behind it,
+                # so it is not a relevant occupancy bit.
+                if not (0 <= next_x < 8 and 0 <= next_y < 8):
                     break
+                mask |= 1 << (y * 8 + x)
 
         return mask
 
@@ -72,3 +72,9 @@ class MagicHelper:
                     break
 
         return bitboard
+
+    @staticmethod
+    def random_occupancies(count: int, seed: int) -> List[Tuple[int, int]]:
+        """(square, occupancy) pairs with a realistic middlegame density (~25%)."""
+        rng = random.Random(seed)
+        return [(rng.randrange(64), rng.getrandbits(64) & rng.getrandbits(64)) for _ in range(count)]
@@ -0,0 +1,177 @@
+"""
+Search for rook and bishop magic numbers and write them out as a new
+precomputed_magic.py.
+
+Every square first gets a fixed-shift magic (an index of exactly as many bits
+as the square has relevant occupancy squares), unless the current magic is
+already that small. Then, within a budget, it tries to go one bit smaller,
+which only works when blocker patterns that map to the same index also have
+the same attack set ("constructive" collisions).
+
+    python -m game.move_generation.magic.magic_search --seed 7 --output precomputed_magic.py
+"""
+import os
+import random
+import time
+from typing import List, Optional, Tuple
+
+from game.move_generation.magic.magic_helper import MagicHelper
+from game.move_generation.magic.precomputed_magic import PrecomputedMagics
+
+FULL_BOARD = 0xFFFFFFFFFFFFFFFF
+TOP_BYTE = 0xFF00000000000000
+
+# Tables hold uint64 attack sets (array('Q') / the mmap-ed cache)
+BYTES_PER_ENTRY = 8
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "precomputed_magic.py")
+
+
+class MagicSearch:
+
+    @staticmethod
+    def square_patterns(square: int, rook: bool) -> Tuple[int, List[int], List[int]]:
+        """(movement mask, every blocker pattern in it, the attack set of each pattern)."""
+        mask = MagicHelper.create_movement_mask(square, rook)
+        patterns = MagicHelper.create_all_blocker_bitboards(mask)
+        attacks = [MagicHelper.legal_move_bitboard_from_blockers(square, pattern, rook) for pattern in patterns]
+        return mask, patterns, attacks
+
+    @staticmethod
+    def is_valid(magic: int, shift: int, patterns: List[int], attacks: List[int]) -> bool:
+        """True when no two patterns with different attack sets share an index."""
+        table = [0] * (1 << (64 - shift))
+        for pattern, attack in zip(patterns, attacks):
+            index = ((pattern * magic) & FULL_BOARD) >> shift
+            stored = table[index]
+            if stored == 0:
+                table[index] = attack  # attack sets are never empty
+            elif stored != attack:
+                return False
+        return True
+
+    @staticmethod
+    def random_candidate(rng: random.Random) -> int:
+        """Sparse random number: few set bits make good magics far more likely."""
+        return rng.getrandbits(64) & rng.getrandbits(64) & rng.getrandbits(64)
+
+    @staticmethod
+    def find_magic(mask: int, patterns: List[int], attacks: List[int], bits: int,
+                   rng: random.Random, attempts: int) -> Optional[int]:
+        """A magic indexing the square's patterns with `bits` bits, or None within `attempts` tries."""
+        shift = 64 - bits
+        for _ in range(attempts):
+            magic = MagicSearch.random_candidate(rng)
+            # The high bits of mask * magic become the index, so they must be well populated
+            if bin(((mask * magic) & TOP_BYTE)).count("1") < 6:
+                continue
+            if MagicSearch.is_valid(magic, shift, patterns, attacks):
+                return magic
+        return None
+
+    @staticmethod
+    def search(rook: bool, magics: List[int], shifts: List[int], rng: random.Random,
+               attempts: int, shrink_attempts: int) -> Tuple[List[int], List[int]]:
+        """Improved (magics, shifts) for all 64 squares of one piece type."""
+        magics, shifts = list(magics), list(shifts)
+        for square in range(64):
+            mask, patterns, attacks = MagicSearch.square_patterns(square, rook)
+            relevant_bits = bin(mask).count("1")
+
+            if 64 - shifts[square] > relevant_bits:
+                magic = MagicSearch.find_magic(mask, patterns, attacks, relevant_bits, rng, attempts)
+                if magic is not None:
+                    magics[square], shifts[square] = magic, 64 - relevant_bits
+
+            if shrink_attempts:
+                bits = 64 - shifts[square] - 1
+                magic = MagicSearch.find_magic(mask, patterns, attacks, bits, rng, shrink_attempts)
+                if magic is not None:
+                    magics[square], shifts[square] = magic, 64 - bits
+        return magics, shifts
+
+    @staticmethod
+    def table_entries(shifts: List[int]) -> int:
+        return sum(1 << (64 - shift) for shift in shifts)
+
+    @staticmethod
+    def time_lookups(rook: bool, magics: List[int], shifts: List[int], samples: List[Tuple[int, int]],
+                     repeats: int = 5) -> float:
+        """Best-of-`repeats` seconds per lookup through tables built from these magics."""
+        entries = []
+        for square in range(64):
+            mask, patterns, attacks = MagicSearch.square_patterns(square, rook)
+            table = [0] * (1 << (64 - shifts[square]))
+            for pattern, attack in zip(patterns, attacks):
+                table[((pattern * magics[square]) & FULL_BOARD) >> shifts[square]] = attack
+            entries.append((mask, magics[square], shifts[square], table))
+
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for square, occupancy in samples:
+                mask, magic, shift, table = entries[square]
+                table[(((occupancy & mask) * magic) & FULL_BOARD) >> shift]
+            best = min(best, time.perf_counter() - start)
+        return best / len(samples)
+
+    @staticmethod
+    def render(rook_magics: List[int], rook_shifts: List[int],
+               bishop_magics: List[int], bishop_shifts: List[int]) -> str:
+        """Source of precomputed_magic.py for these magics, in the existing layout."""
+        def rows(values: List[int], per_row: int) -> str:
+            lines = []
+            for start in range(0, 64, per_row):
+                lines.append("        " + ", ".join(str(v) for v in values[start:start + per_row]))
+            return ",\n".join(lines)
+
+        return (
+            "class PrecomputedMagics:\n"
+            "    # Number of relevant occupancy bits for each square (used for shift)\n"
+            f"    RookShifts = [\n{rows(rook_shifts, 8)}\n    ]\n\n"
+            f"    BishopShifts = [\n{rows(bishop_shifts, 8)}\n    ]\n\n"
+            "    # Magic numbers for indexing the precomputed attack tables\n"
+            f"    RookMagics = [\n{rows(rook_magics, 4)}\n    ]\n\n"
+            f"    BishopMagics = [\n{rows(bishop_magics, 4)}\n    ]\n"
+        )
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Search for denser rook/bishop magics")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--attempts", type=int, default=5_000_000,
+                        help="tries per square for a fixed-shift magic")
+    parser.add_argument("--shrink-attempts", type=int, default=0,
+                        help="tries per square for a magic one bit smaller than that")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    rook_magics, rook_shifts = MagicSearch.search(
+        True, PrecomputedMagics.RookMagics, PrecomputedMagics.RookShifts, rng, args.attempts, args.shrink_attempts)
+    bishop_magics, bishop_shifts = MagicSearch.search(
+        False, PrecomputedMagics.BishopMagics, PrecomputedMagics.BishopShifts, rng, args.attempts, args.shrink_attempts)
+    print(f"searched in {time.perf_counter() - start:.1f} s (seed {args.seed})")
+
+    samples = MagicHelper.random_occupancies(20000, args.seed)
+    print(f"{'':<8}{'entries before':>16}{'entries after':>15}{'KiB saved':>11}{'ns/lookup before':>18}{'after':>8}")
+    for name, rook, old_magics, old_shifts, magics, shifts in (
+        ("rook", True, PrecomputedMagics.RookMagics, PrecomputedMagics.RookShifts, rook_magics, rook_shifts),
+        ("bishop", False, PrecomputedMagics.BishopMagics, PrecomputedMagics.BishopShifts, bishop_magics, bishop_shifts),
+    ):
+        before, after = MagicSearch.table_entries(old_shifts), MagicSearch.table_entries(shifts)
+        old_time = MagicSearch.time_lookups(rook, old_magics, old_shifts, samples)
+        new_time = MagicSearch.time_lookups(rook, magics, shifts, samples)
+        print(f"{name:<8}{before:>16}{after:>15}{(before - after) * BYTES_PER_ENTRY / 1024:>11.1f}"
+              f"{old_time * 1e9:>18.0f}{new_time * 1e9:>8.0f}")
+
+    with open(args.output, "w") as f:
+        f.write(MagicSearch.render(rook_magics, rook_shifts, bishop_magics, bishop_shifts))
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,13 @@
 class PrecomputedMagics:
     # Number of relevant occupancy bits for each square (used for shift)
     RookShifts = [
-        52, 52, 52, 52, 52, 52, 52, 52,
-        53, 53, 53, 54, 53, 53, 54, 53,
-        53, 54, 54, 54, 53, 53, 54, 53,
-        53, 54, 53, 53, 54, 54, 54, 53,
-        52, 54, 53, 53, 53, 53, 54, 53,
-        52, 53, 54, 54, 53, 53, 54, 53,
-        53, 54, 54, 54, 53, 53, 54, 53,
+        52, 53, 53, 53, 53, 53, 53, 52,
+        53, 54, 54, 54, 54, 54, 54, 53,
+        53, 54, 54, 54, 54, 54, 54, 53,
+        53, 54, 54, 54, 54, 54, 54, 53,
+        53, 54, 54, 54, 54, 54, 54, 53,
+        53, 54, 54, 54, 54, 54, 54, 53,
+        53, 54, 54, 54, 54, 54, 54, 53,
         52, 53, 53, 53, 53, 53, 53, 52
     ]
 
@@ -24,20 +24,20 @@ class PrecomputedMagics:
 
     # Magic numbers for indexing the precomputed attack tables
     RookMagics = [
-        468374916371625120, 18428729537625841661, 2531023729696186408, 6093370314119450896,
-        13830552789156493815, 16134110446239088507, 12677615322350354425, 5404321144167858432,
-        2111097758984580, 18428720740584907710, 17293734603602787839, 4938760079889530922,
-        7699325603589095390, 9078693890218258431, 578149610753690728, 9496543503900033792,
+        468374916371625120, 18014673655832576, 324276767539855624, 2341880602594116736,
+        1008810998045876240, 1801448664225349634, 288232648735722504, 5404321144167858432,
+        2111097758984580, 76702068596801664, 144396800495779856, 4938760079889530922,
+        5189554215541997572, 2883007457573995520, 578149610753690728, 9496543503900033792,
         1155209038552629657, 9224076274589515780, 1835781998207181184, 509120063316431138,
-        16634043024132535807, 18446673631917146111, 9623686630121410312, 4648737361302392899,
-        738591182849868645, 1732936432546219272, 2400543327507449856, 5188164365601475096,
+        4611691516119748865, 2396056289072382464, 9623686630121410312, 4648737361302392899,
+        738591182849868645, 1732936432546219272, 144132782411481225, 72576357896224,
         10414575345181196316, 1162492212166789136, 9396848738060210946, 622413200109881612,
-        7998357718131801918, 7719627227008073923, 16181433497662382080, 18441958655457754079,
-        1267153596645440, 18446726464209379263, 1214021438038606600, 4650128814733526084,
-        9656144899867951104, 18444421868610287615, 3695311799139303489, 10597006226145476632,
-        18436046904206950398, 18446726472933277663, 3458977943764860944, 39125045590687766,
+        4556651071799424, 7719627227008073923, 5190996718845432072, 9225905380381427745,
+        36591764320034832, 5773755476965589504, 1214021438038606600, 4650128814733526084,
+        216243153007575040, 72145555505037312, 3695311799139303489, 10597006226145476632,
+        36033229442056208, 18018796589580416, 3458977943764860944, 39125045590687766,
         9227453435446560384, 6476955465732358656, 1270314852531077632, 2882448553461416064,
-        11547238928203796481, 1856618300822323264, 2573991788166144, 4936544992551831040,
+        12689032704785121408, 17729696303105, 2573991788166144, 4936544992551831040,
         13690941749405253631, 15852669863439351807, 18302628748190527413, 12682135449552027479,
         13830554446930287982, 18302628782487371519, 7924083509981736956, 4734295326018586370
     ]
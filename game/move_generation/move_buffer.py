@@ -0,0 +1,79 @@
+from array import array
+
+from game.models.move import Move
+from game.models.pieces.pieceold import Queen, Rook, Bishop, Knight
+
+# No legal chess position has more than 218 moves
+MAX_MOVES = 256
+
+# A move is packed as from | to << 6 | flag << 12, which fits an unsigned short
+QUIET = 0
+DOUBLE_PUSH = 1
+EN_PASSANT = 2
+CASTLE = 3
+PROMOTE_QUEEN = 4
+PROMOTE_ROOK = 5
+PROMOTE_BISHOP = 6
+PROMOTE_KNIGHT = 7
+
+PROMOTION_FLAGS = (PROMOTE_QUEEN, PROMOTE_ROOK, PROMOTE_BISHOP, PROMOTE_KNIGHT)
+PROMOTION_PIECES = {PROMOTE_QUEEN: Queen, PROMOTE_ROOK: Rook, PROMOTE_BISHOP: Bishop, PROMOTE_KNIGHT: Knight}
+
+# One shared Move per code, created the first time the code is decoded
+_DECODED: list[Move | None] = [None] * (1 << 15)
+
+
+class MoveBuffer:
+    """
+    Fixed-capacity move list for one ply.
+
+    The generator writes packed move codes into a preallocated array and keeps
+    an explicit count; clearing only resets the count. A MoveGenerator owns one
+    buffer per ply, so a search reuses the same buffers at every node instead
+    of building new lists.
+    """
+    __slots__ = ("codes", "count")
+
+    def __init__(self, capacity: int = MAX_MOVES):
+        self.codes = array("H", bytes(2 * capacity))
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def add(self, from_sq: int, to_sq: int, flag: int = QUIET):
+        self.codes[self.count] = from_sq | to_sq << 6 | flag << 12
+        self.count += 1
+
+    def move(self, i: int) -> Move:
+        return MoveBuffer.decode(self.codes[i])
+
+    def to_list(self) -> list[Move]:
+        decode = MoveBuffer.decode
+        codes = self.codes
+        return [decode(codes[i]) for i in range(self.count)]
+
+    @staticmethod
+    def decode(code: int) -> Move:
+        """
+        The Move for a packed code. Moves are never modified after creation,
+        so every caller shares the same instance.
+        """
+        move = _DECODED[code]
+        if move is None:
+            from_sq = code & 63
+            to_sq = (code >> 6) & 63
+            flag = code >> 12
+            move = Move(
+                (from_sq % 8, from_sq // 8),
+                (to_sq % 8, to_sq // 8),
+                promotion=PROMOTION_PIECES.get(flag),
+                castling=flag == CASTLE,
+                # Move.en_passant marks both double pushes and en passant captures
+                en_passant=flag in (DOUBLE_PUSH, EN_PASSANT),
+            )
+            _DECODED[code] = move
+        return move
@@ -1,21 +1,51 @@
-from torch.onnx.symbolic_opset9 import is_pinned
+from operator import attrgetter
 
 from game.models.move import Move
 from game.models.piece import Piece
-from game.models.pieces.pieceold import Pawn, Knight, Bishop, Rook, Queen, King
 from game.move_generation.bitboard_utilities import BitBoardUtility
-from game.move_generation.magic.magic import Magic
+from game.move_generation.move_buffer import MoveBuffer, QUIET, DOUBLE_PUSH, EN_PASSANT, CASTLE, PROMOTION_FLAGS
+from game.move_generation.slider_attacks import SliderAttacks
 
 
-class MoveGenerator:
-    def __init__(self, board, generate_quiet=True):
+# Everything derived from the current position. A Board keeps one long-lived
+# generator and saves these per ply (push_ply / pop_ply), so positions already
+# visited in the current line are never recomputed.
+POSITION_FIELDS = (
+    "empty_squares", "enemy_color", "friendly_color", "enemy_pieces", "friendly_pieces",
+    "enemy_rooks_or_queens", "empty_or_enemy_squares", "move_type_mask",
+    "check_ray_bitmask", "in_check", "in_double_check", "pin_rays", "pin_mask", "not_pin_rays",
+    "enemy_attack_map", "opponent_sliding_attack_map", "king_square", "checkers", "pins_ready", "cached_moves",
+)
+read_position_fields = attrgetter(*POSITION_FIELDS)
+
 
+class MoveGenerator:
+    def __init__(self, board, generate_quiet=True, pseudo_legal=False):
+        """
+        With `pseudo_legal=True` pins are not computed up front, and moves that
+        could leave the king in check (pinned pieces, en passant discoveries)
+        are emitted anyway. King steps are always legal: the attack map is
+        built with the king removed. The search then calls `is_legal(move)`
+        only for the moves it actually tries.
+        """
 
         self.pinned_move_masks = {}
-        self.opponent_sliding_attack_map = 0
         self.board = board
         self.board_state = board.board_data
         self.generate_quiet_moves = generate_quiet
+        self.pseudo_legal = pseudo_legal
+
+        # One entry per move made on the board: the POSITION_FIELDS values of the
+        # position before the move, or None if they had not been computed
+        self.ply_stack: list[tuple | None] = []
+        # Move buffers indexed by ply (len(ply_stack)), reused for every node at that ply
+        self.move_buffers: list[MoveBuffer] = []
+        self.up_to_date = False
+        self.refresh()
+
+    def refresh(self):
+        """Recompute all position-derived data for the board's current position."""
+        self.board_state = self.board.board_data
         self.empty_squares = ~self.board_state.all_pieces & 0xFFFFFFFFFFFFFFFF
         self.enemy_color = 0 if not self.board_state.is_whites_turn else 6
         self.friendly_color = 0 if self.board_state.is_whites_turn else 6
@@ -23,7 +53,7 @@ class MoveGenerator:
         self.friendly_pieces = self.board_state.color_pieces[0 if self.board_state.is_whites_turn else 1]
         self.enemy_rooks_or_queens = self.board_state.pieces_bitboard[Piece.Rook + self.enemy_color -1] | self.board_state.pieces_bitboard[Piece.Queen + self.enemy_color -1]
         self.empty_or_enemy_squares = self.empty_squares | self.enemy_pieces
-        self.move_type_mask = (2 ** 64 - 1) if generate_quiet else self.enemy_pieces
+        self.move_type_mask = (2 ** 64 - 1) if self.generate_quiet_moves else self.enemy_pieces
 
         self.check_ray_bitmask = 0xFFFFFFFFFFFFFFFF
         self.in_check = False
@@ -32,204 +62,193 @@ class MoveGenerator:
         self.pin_mask = {}  # maps pinned square → allowed movement bitboard
         self.not_pin_rays = ~self.pin_rays
         self.enemy_attack_map = 0
+        self.opponent_sliding_attack_map = 0
         self.king_square = self.board.king_square(self.board_state.is_whites_turn)
         self.calculate_attack_data()
+        # Pseudo-legal mode computes pins lazily, on the first is_legal call
+        self.pins_ready = False
+        if not self.pseudo_legal:
+            self.compute_pin_rays()
+            self.pins_ready = True
+        self.cached_moves = None
+        self.up_to_date = True
+
+    def set_pseudo_legal(self, pseudo_legal: bool):
+        """
+        Switch generation mode. The current position's data is rebuilt; the
+        saved plies below it still hold the old mode's moves, so only switch
+        at a ply the caller will not undo past (e.g. the root of a search).
+        """
+        self.pseudo_legal = pseudo_legal
+        self.up_to_date = False
+
+    def ensure_up_to_date(self):
+        if not self.up_to_date:
+            self.refresh()
+
+    def push_ply(self):
+        """Called by Board.make_move before the position changes."""
+        if self.up_to_date:
+            self.ply_stack.append(read_position_fields(self))
+        else:
+            self.ply_stack.append(None)
+        self.up_to_date = False
+
+    def pop_ply(self):
+        """Called by Board.undo_move: restores the data of the position being returned to."""
+        snapshot = self.ply_stack.pop() if self.ply_stack else None
+        if snapshot is None:
+            self.up_to_date = False
+            return
+        self.__dict__.update(zip(POSITION_FIELDS, snapshot))
+        self.up_to_date = True
 
     # ----------------- Pawn moves -----------------
-    def generate_pawn_moves(self):
-        moves = []
-        push_dir = 1 if self.board_state.is_whites_turn else -1
-        push_offset = push_dir * 8
+    def generate_pawn_moves(self, buffer: MoveBuffer):
+        """
+        Pawns are generated from white's point of view only. With black to move
+        every input bitboard is flipped vertically first, and each square is
+        mapped back (sq ^ 56) as the move is written.
+        """
+        flip = 0 if self.board_state.is_whites_turn else 56
         pawns = self.board_state.pieces_bitboard[Piece.Pawn + self.friendly_color - 1]
+        empty = self.empty_squares
+        enemies = self.enemy_pieces
+        check_mask = self.check_ray_bitmask
+        if flip:
+            mirror = BitBoardUtility.flip_vertical
+            pawns, empty, enemies, check_mask = mirror(pawns), mirror(empty), mirror(enemies), mirror(check_mask)
 
-        promotion_rank_mask = BitBoardUtility.RANK8 if self.board_state.is_whites_turn else BitBoardUtility.RANK1
+        rank8 = BitBoardUtility.RANK8
 
         # -----------------------------
         # PUSHES
         # -----------------------------
-        single_push = BitBoardUtility.shift(pawns, push_offset) & self.empty_squares
-        push_promotions = single_push & promotion_rank_mask & self.check_ray_bitmask
-        single_push_no_promotions = single_push & ~promotion_rank_mask & self.check_ray_bitmask
+        single_push = (pawns << 8) & empty
+        push_promotions = single_push & rank8 & check_mask
+        single_push_no_promotions = single_push & ~rank8 & check_mask
+        double_push = ((single_push & BitBoardUtility.RANK3) << 8) & empty & check_mask
 
         # -----------------------------
         # CAPTURES
         # -----------------------------
-        capture_edge_file_mask = BitBoardUtility.NOT_A_FILE if self.board_state.is_whites_turn else BitBoardUtility.NOT_H_FILE
-        capture_edge_file_mask2 = BitBoardUtility.NOT_H_FILE if self.board_state.is_whites_turn else BitBoardUtility.NOT_A_FILE
-
-        # normal captures
-        capture_a = BitBoardUtility.shift(pawns & capture_edge_file_mask, push_dir * 7) & self.enemy_pieces
-        capture_b = BitBoardUtility.shift(pawns & capture_edge_file_mask2, push_dir * 9) & self.enemy_pieces
-
-        # promotions for captures
-        capture_promotions_a = capture_a & promotion_rank_mask & self.check_ray_bitmask
-        capture_promotions_b = capture_b & promotion_rank_mask & self.check_ray_bitmask
-
-        capture_a &= self.check_ray_bitmask & ~promotion_rank_mask
-        capture_b &= self.check_ray_bitmask & ~promotion_rank_mask
+        attacks_west = (pawns & BitBoardUtility.NOT_A_FILE) << 7
+        attacks_east = (pawns & BitBoardUtility.NOT_H_FILE) << 9
+        capture_west = attacks_west & enemies & check_mask
+        capture_east = attacks_east & enemies & check_mask
 
         # ============================================================
         # 🔥 PIN HANDLER (core logic)
         # ============================================================
+        pin_mask = self.pin_mask
+
         def allowed(start_sq, target_sq):
             """Return True if move is legal given pin constraints."""
-            if start_sq not in self.pin_mask:
+            if start_sq not in pin_mask:
                 return True  # not pinned → always allowed
-            return (1 << target_sq) & self.pin_mask[start_sq]
+            return (1 << target_sq) & pin_mask[start_sq]
 
         # ============================================================
-        # PUSH MOVES
+        # PUSHES AND CAPTURES (back on the real board: sq ^ flip)
         # ============================================================
-        while single_push_no_promotions:
-            target_sq, single_push_no_promotions = BitBoardUtility.pop_lsb(single_push_no_promotions)
-            start_sq = target_sq - push_offset
-
-            if allowed(start_sq, target_sq):
-                moves.append(Move(self.index_to_xy(start_sq),
-                                  self.index_to_xy(target_sq)))
-
-        # Double push
-        double_push_rank = BitBoardUtility.RANK4 if self.board_state.is_whites_turn else BitBoardUtility.RANK5
-        double_push = BitBoardUtility.shift(single_push, push_offset) & self.empty_squares & double_push_rank
-
-        while double_push:
-            target_sq, double_push = BitBoardUtility.pop_lsb(double_push)
-            start_sq = target_sq - push_offset * 2
-
-            if allowed(start_sq, target_sq):
-                moves.append(Move(self.index_to_xy(start_sq),
-                                  self.index_to_xy(target_sq),
-                                  en_passant=True))
-
-        # ============================================================
-        # NORMAL CAPTURES
-        # ============================================================
-        for capture_bb, offset in [(capture_a, 7), (capture_b, 9)]:
-            while capture_bb:
-                target_sq, capture_bb = BitBoardUtility.pop_lsb(capture_bb)
-                start_sq = target_sq - push_dir * offset
+        for moves_bb, offset, flag in (
+            (single_push_no_promotions, 8, QUIET),
+            (double_push, 16, DOUBLE_PUSH),
+            (capture_west & ~rank8, 7, QUIET),
+            (capture_east & ~rank8, 9, QUIET),
+        ):
+            for target_sq in BitBoardUtility.squares(moves_bb):
+                start_sq, target_sq = (target_sq - offset) ^ flip, target_sq ^ flip
 
                 if allowed(start_sq, target_sq):
-                    moves.append(Move(self.index_to_xy(start_sq),
-                                      self.index_to_xy(target_sq)))
+                    buffer.add(start_sq, target_sq, flag)
 
         # ============================================================
         # PROMOTION CAPTURES + PROMOTION SINGLE PUSHES
         # ============================================================
-        for promo_bb, offset in [(push_promotions, 8), (capture_promotions_a, 7), (capture_promotions_b, 9)]:
-            while promo_bb:
-                target_sq, promo_bb = BitBoardUtility.pop_lsb(promo_bb)
-                start_sq = target_sq - push_dir * offset
+        for promo_bb, offset in ((push_promotions, 8), (capture_west & rank8, 7), (capture_east & rank8, 9)):
+            for target_sq in BitBoardUtility.squares(promo_bb):
+                start_sq, target_sq = (target_sq - offset) ^ flip, target_sq ^ flip
 
                 if allowed(start_sq, target_sq):
-                    for promo_piece in [Queen, Rook, Bishop, Knight]:
-                        moves.append(
-                            Move(self.index_to_xy(start_sq),
-                                 self.index_to_xy(target_sq),
-                                 promotion=promo_piece)
-                        )
+                    for promotion_flag in PROMOTION_FLAGS:
+                        buffer.add(start_sq, target_sq, promotion_flag)
 
         # ============================================================
-        # EN PASSANT — MUST ALSO RESPECT PIN
+        # EN PASSANT — pins, checks and the rank discovered check are
+        # all covered by exposes_king_ep
         # ============================================================
-        capture_a = BitBoardUtility.shift(pawns & capture_edge_file_mask, push_dir * 7)
-        capture_b = BitBoardUtility.shift(pawns & capture_edge_file_mask2, push_dir * 9)
-
         if self.board_state.en_passant_target is not None:
             ep_x, ep_y = self.board_state.en_passant_target
             ep_index = self.xy_to_index(ep_x, ep_y)
-            ep_bit = 1 << ep_index
-
-            for capture_mask, offset in [(capture_a, 7), (capture_b, 9)]:
-                if capture_mask & ep_bit:
-                    start_sq = ep_index - push_dir * offset
+            ep_bit = 1 << (ep_index ^ flip)
 
-                    if allowed(start_sq, ep_index):
-                        moves.append(
-                            Move(
-                                self.index_to_xy(start_sq),
-                                self.index_to_xy(ep_index),
-                                en_passant=True
-                            )
-                        )
+            for attacks, offset in ((attacks_west, 7), (attacks_east, 9)):
+                if attacks & ep_bit:
+                    start_sq = ((ep_index ^ flip) - offset) ^ flip
 
-        return moves
+                    if self.pseudo_legal or not self.exposes_king_ep(start_sq, ep_index):
+                        buffer.add(start_sq, ep_index, EN_PASSANT)
 
     # ----------------- Knight moves -----------------
-    def generate_knights_moves(self):
-        moves = []
+    def generate_knights_moves(self, buffer: MoveBuffer):
         knight_type = Piece.Knight + self.friendly_color - 1
         knights = self.board_state.pieces_bitboard[knight_type]
-        move_mask = self.empty_or_enemy_squares & self.move_type_mask
-        color = "white" if not self.friendly_color else "black"
-        while knights:
-            knight_sq, knights = BitBoardUtility.pop_lsb(knights)
+        move_mask = self.empty_or_enemy_squares & self.move_type_mask & self.check_ray_bitmask
+        for knight_sq in BitBoardUtility.squares(knights):
             targets = BitBoardUtility.KNIGHT_ATTACKS[knight_sq] & move_mask
-            for target_sq in BitBoardUtility.squares_from_bitboard(targets):
+            for target_sq in BitBoardUtility.squares(targets):
                 if self.is_not_pinned(knight_sq, target_sq):
-                    moves.append(Move(self.index_to_xy(knight_sq),
-                                      self.index_to_xy(target_sq)))
-        return moves
+                    buffer.add(knight_sq, target_sq)
 
     # ----------------- Sliding moves -----------------
-    def generate_sliding_moves(self, piece_cls, is_white,ignore_pins: bool = False) -> list[Move]:
+    def generate_sliding_moves(self, buffer: MoveBuffer, piece_cls, is_white, ignore_pins: bool = False):
         """
         Generate sliding moves (bishop, rook, queen) with optional pin check.
 
         Args:
+            buffer: MoveBuffer the moves are appended to
             piece_cls: Piece type (Piece.Bishop / Piece.Rook / Piece.Queen)
             ignore_pins: If True, ignores pin restrictions (used for enemy attack maps)
-        Returns:
-            List of Move objects
         """
-        moves: list[Move] = []
         piece_type_index = piece_cls + (0 if is_white else 6) - 1
         pieces_bb = self.board_state.pieces_bitboard[piece_type_index]
 
         occ = self.board_state.all_pieces
         pin_rays = self.pin_rays if not ignore_pins else 0
+        target_mask = self.empty_or_enemy_squares & self.check_ray_bitmask
 
-        while pieces_bb:
-            sq, pieces_bb = BitBoardUtility.pop_lsb(pieces_bb)
-            start_xy = self.index_to_xy(sq)
+        for sq in BitBoardUtility.squares(pieces_bb):
 
             # --- 1. Compute raw sliding attacks ---
             if piece_cls == Piece.Bishop:
-                attack_bb = BitBoardUtility.get_bishop_attacks(sq, occ)
+                attack_bb = SliderAttacks.get_bishop_attacks(sq, occ)
             elif piece_cls == Piece.Rook:
-                attack_bb = BitBoardUtility.get_rook_attacks(sq, occ)
+                attack_bb = SliderAttacks.get_rook_attacks(sq, occ)
             else:
-                attack_bb = (
-                        BitBoardUtility.get_bishop_attacks(sq, occ)
-                        | BitBoardUtility.get_rook_attacks(sq, occ)
-                )
+                attack_bb = SliderAttacks.get_queen_attacks(sq, occ)
 
-            # Only keep empty or enemy squares
-            attack_bb &= self.empty_or_enemy_squares
+            # Only keep empty or enemy squares (that resolve a check, if any)
+            attack_bb &= target_mask
 
             # --- 2. Apply pin logic if needed ---
             if pin_rays:
                 pinned_mask = pin_rays & (1 << sq)
                 if pinned_mask:
-                    # Allow only moves along the pin ray
-                    attack_bb &= pin_rays
-
-            # --- 3. Convert bitboard to Move objects ---
-            while attack_bb:
-                target_sq, attack_bb = BitBoardUtility.pop_lsb(attack_bb)
-                moves.append(Move(start_xy, self.index_to_xy(target_sq)))
+                    # Allow only moves along this piece's own pin ray
+                    attack_bb &= self.pin_mask[sq]
 
-        return moves
+            # --- 3. Write the moves into the buffer ---
+            for target_sq in BitBoardUtility.squares(attack_bb):
+                buffer.add(sq, target_sq)
 
     # ----------------- King moves & Castling -----------------
-    def generate_king_moves(self):
-        moves = []
-
+    def generate_king_moves(self, buffer: MoveBuffer):
         king_type = Piece.King + self.friendly_color - 1
         king_bb = self.board_state.pieces_bitboard[king_type]
         king_sq = BitBoardUtility.bit_scan_forward(king_bb)
         if king_sq == -1:
-            return []
+            return
 
         self.king_square = king_sq
         # print("-----------------------------START-------------------------------")
@@ -243,52 +262,43 @@ class MoveGenerator:
         legal_squares = king_attacks & ~illegal_squares & self.move_type_mask
         # self.print_bitboard(legal_squares, title="Legal squares Bitboard")
 
-        for target_sq in BitBoardUtility.squares_from_bitboard(legal_squares):
-            moves.append(Move(self.index_to_xy(king_sq), self.index_to_xy(target_sq)))
+        for target_sq in BitBoardUtility.squares(legal_squares):
+            buffer.add(king_sq, target_sq)
 
-        # Castling (king cannot castle through or into check)
-        moves.extend(self.generate_castling_moves(king_sq))
+        # Castling (king cannot castle out of, through or into check)
+        if not self.in_check:
+            self.generate_castling_moves(buffer, king_sq)
 
-        return moves
+    def generate_castling_moves(self, buffer: MoveBuffer, king_sq):
+        for target_sq in self.castling_targets():
+            buffer.add(king_sq, target_sq, CASTLE)
 
-    def generate_castling_moves(self, king_sq):
-        moves = []
-        color = "white" if self.board_state.is_whites_turn else "black"
-        rank = 0 if color == "white" else 7
+    def castling_targets(self) -> list[int]:
+        """
+        King target squares of the castling moves available now.
 
-        rights = self.board_state.castling_rights[color]
+        The white castling squares, moved to the 8th rank for black: a mask on
+        the first rank flips vertically by shifting it up 56. Only called when
+        not in check, and then the enemy attack map (computed with our king
+        removed) is exact for the squares the king crosses.
+        """
+        flip = 0 if self.board_state.is_whites_turn else 56
+        rights = self.board_state.castling_rights["black" if flip else "white"]
+        occupied = self.board_state.all_pieces
+        attacked = self.enemy_attack_map
+        targets = []
 
-        # Kingside castling
+        # Kingside: f1, g1 empty and safe
         if rights["K"]:
-            f_sq = rank * 8 + 5
-            g_sq = rank * 8 + 6
-            # all squares between king and rook must be empty
-            if ((self.empty_squares >> f_sq) & 1) and ((self.empty_squares >> g_sq) & 1):
-                # king cannot be in check or pass through attacked squares
-                if not self.is_square_attacked(rank * 8 + 4) and \
-                        not self.is_square_attacked(f_sq) and \
-                        not self.is_square_attacked(g_sq):
-                    moves.append(Move(
-                        self.index_to_xy(king_sq),
-                        self.index_to_xy(g_sq)
-                    ))
-
-        # Queenside castling
+            path = 0x60 << flip
+            if not (occupied & path) and not (attacked & path):
+                targets.append(6 ^ flip)
+
+        # Queenside: b1, c1, d1 empty, c1, d1 safe
         if rights["Q"]:
-            d_sq = rank * 8 + 3
-            c_sq = rank * 8 + 2
-            b_sq = rank * 8 + 1
-            if ((self.empty_squares >> d_sq) & 1) and ((self.empty_squares >> c_sq) & 1) and (
-                    (self.empty_squares >> b_sq) & 1):
-                if not self.is_square_attacked(rank * 8 + 4) and \
-                        not self.is_square_attacked(d_sq) and \
-                        not self.is_square_attacked(c_sq):
-                    moves.append(Move(
-                        self.index_to_xy(king_sq),
-                        self.index_to_xy(c_sq)
-                    ))
-
-        return moves
+            if not (occupied & (0x0E << flip)) and not (attacked & (0x0C << flip)):
+                targets.append(2 ^ flip)
+        return targets
 
     # ----------------- Helpers -----------------
     def index_to_xy(self, sq: int):
@@ -298,21 +308,35 @@ class MoveGenerator:
         """
         Compute enemy attacks, pin rays, check rays
         """
-        self.in_check = False
-        self.in_double_check = False
-        color = "white" if not self.board_state.is_whites_turn else "black"
-        self.enemy_attack_map = self.generate_enemy_attack_map(color)
-        self.gen_sliding_attack_map()
-        self.check_ray_bitmask = 0xFFFFFFFFFFFFFFFF
+        # One pass over the enemy pieces. Sliders look through our king, so the
+        # squares behind it on a checking ray count as attacked for king moves
+        occupancy = self.board_state.all_pieces
+        if self.king_square >= 0:
+            occupancy &= ~(1 << self.king_square)
+        enemy = "black" if self.board_state.is_whites_turn else "white"
+        self.enemy_attack_map, self.opponent_sliding_attack_map = self.generate_enemy_attack_map(enemy, occupancy)
+
+        # Checks: non-king moves must capture the checker or block its ray
+        self.checkers = 0
+        if self.king_square >= 0 and (self.enemy_attack_map >> self.king_square) & 1:
+            self.checkers = self.board_state.attackers_to(self.king_square) & self.enemy_pieces
+        self.in_check = self.checkers != 0
+        self.in_double_check = BitBoardUtility.count_bits(self.checkers) > 1
+        if not self.in_check:
+            self.check_ray_bitmask = 0xFFFFFFFFFFFFFFFF
+        elif self.in_double_check:
+            self.check_ray_bitmask = 0  # only the king can move
+        else:
+            checker_sq = BitBoardUtility.bit_scan_forward(self.checkers)
+            self.check_ray_bitmask = self.checkers | BitBoardUtility.BETWEEN_MASKS[self.king_square * 64 + checker_sq]
         self.pin_rays = 0
         self.not_pin_rays = ~self.pin_rays
 
     def is_square_attacked(self, sq: int) -> bool:
         """
         Returns True if the given square `sq` is attacked by any enemy piece.
-        Uses the precomputed enemy attack map.
         """
-        return (self.enemy_attack_map >> sq) & 1 != 0
+        return self.board_state.attackers_to(sq) & self.enemy_pieces != 0
 
     # def is_pinned(self, square: int) -> bool:
     #     """Return True if the piece on `square` is pinned to its king."""
@@ -321,24 +345,33 @@ class MoveGenerator:
     def is_pinned(self, sq):
         return sq in self.pin_mask
 
-    def gen_sliding_attack_map(self):
-        """Generate the bitboard of all squares attacked by enemy rooks, bishops, and queens."""
-        self.opponent_sliding_attack_map = 0
-
-        # Orthogonal sliders: rooks + queens
-        self._update_slide_attack(self.board_state.enemy_orthogonal_sliders, ortho=True)
-        # Diagonal sliders: bishops + queens
-        self._update_slide_attack(self.board_state.enemy_diagonal_sliders, ortho=False)
-
-    def _update_slide_attack(self, piece_board: int, ortho: bool):
-        """Update attack map for all pieces in `piece_board` (bitboard) in given directions."""
-        # Remove friendly king to avoid sliding attacks passing through it
-        blockers = self.board_state.all_pieces & ~(1 << self.king_square)
+    def is_legal(self, move: Move) -> bool:
+        """
+        Full legality test for a move generated for the current position.
+        Only needed in pseudo-legal mode: legal-mode moves always pass.
+        """
+        self.ensure_up_to_date()
+        from_x, from_y = move.start_pos
+        to_x, to_y = move.target_pos
+        from_sq = from_y * 8 + from_x
+        to_sq = to_y * 8 + to_x
+
+        if from_sq == self.king_square:
+            if abs(to_x - from_x) == 2:
+                return True  # castling squares were checked during generation
+            # Look through the king: a checking slider also covers the square behind it
+            occupancy = self.board_state.all_pieces & ~(1 << from_sq)
+            return not self.board_state.attackers_to(to_sq, occupancy) & self.enemy_pieces
+
+        if move.en_passant and from_x != to_x:
+            return not self.exposes_king_ep(from_sq, to_sq)
+
+        if not self.pins_ready:
+            self.compute_pin_rays()
+            self.pins_ready = True
+        pin_mask = self.pin_mask.get(from_sq)
+        return pin_mask is None or (pin_mask >> to_sq) & 1 != 0
 
-        while piece_board:
-            start_square, piece_board = BitBoardUtility.pop_lsb(piece_board)
-            move_board = Magic.get_slider_attacks(start_square, blockers, ortho)
-            self.opponent_sliding_attack_map |= move_board
     def is_not_pinned(self, from_sq: int, to_sq: int) -> bool:
         """
         Returns True if moving the piece from `from_sq` to `to_sq` does NOT expose
@@ -346,128 +379,81 @@ class MoveGenerator:
         """
         return not self.is_pinned(from_sq)
 
-    def generate_enemy_attack_map(self, color: str) -> int:
-        attack_map = 0
-        all_pieces = self.board_state.all_pieces
+    def generate_enemy_attack_map(self, color: str, occupancy: int | None = None) -> tuple[int, int]:
+        """
+        Squares attacked by every `color` piece, in one pass.
+        Returns (attack map, the part of it attacked by sliders).
 
-        # Map color to piece indices
+        Knights and kings are done setwise, pawns with shifts and sliders with
+        SliderAttacks lookups against `occupancy` (default: all pieces).
+        """
+        bitboards = self.board_state.pieces_bitboard
         enemy_base = 0 if color == "white" else 6
+        if occupancy is None:
+            occupancy = self.board_state.all_pieces
 
-        # Pawns
-        pawns_bb = self.board_state.pieces_bitboard[Piece.Pawn + enemy_base -1]
-        # self.print_bitboard(pawns_bb , "Pawn bitboard")
-        # push_dir = +1 for white, -1 for black
-        push_dir = 1 if color == "white" else -1
-        # File masks
-        mask_A = BitBoardUtility.NOT_A_FILE
-        mask_H = BitBoardUtility.NOT_H_FILE
-
-        # Capture diagonals
-        capture_a = BitBoardUtility.shift(pawns_bb & mask_H, push_dir * 9)  # NE / SE
-        capture_b = BitBoardUtility.shift(pawns_bb & mask_A, push_dir * 7)  # NW / SW
-
-        attack_map |= capture_a
-        attack_map |= capture_b
-        # self.print_bitboard(attack_map, "attack_map after Pawn bitboard")
-        # Knights
-        knights_bb = self.board_state.pieces_bitboard[Piece.Knight + enemy_base -1]
-        while knights_bb:
-            sq, knights_bb = BitBoardUtility.pop_lsb(knights_bb)
-            attack_map |= BitBoardUtility.KNIGHT_ATTACKS[sq]
-        # self.print_bitboard(attack_map, "attack_map after Knights bitboard")
-
-        # King (for king adjacency check)
-        king_bb = self.board_state.pieces_bitboard[Piece.King + enemy_base - 1]
-        while king_bb:
-            sq, king_bb = BitBoardUtility.pop_lsb(king_bb)
-            attack_map |= BitBoardUtility.KING_ATTACKS[sq]
-
-        # Bishops + queens
-        for piece_type in [Piece.Bishop, Piece.Queen]:
-            bb = self.board_state.pieces_bitboard[piece_type + enemy_base - 1]
-            while bb:
-                sq, bb = BitBoardUtility.pop_lsb(bb)
-                attack_map |= BitBoardUtility.get_bishop_attacks(sq, all_pieces)
-
-        # Rooks + queens
-        for piece_type in [Piece.Rook, Piece.Queen]:
-            bb = self.board_state.pieces_bitboard[piece_type + enemy_base -1]
-            while bb:
-                sq, bb = BitBoardUtility.pop_lsb(bb)
-                attack_map |= BitBoardUtility.get_rook_attacks(sq, all_pieces)
-
-        return attack_map & 0xFFFFFFFFFFFFFFFF  # ensure 64-bit
+        # Pawns: capture diagonals towards the h file and towards the a file
+        pawns_bb = bitboards[Piece.Pawn + enemy_base - 1]
+        east_offset, west_offset = (9, 7) if color == "white" else (-7, -9)
+        attack_map = (BitBoardUtility.shift(pawns_bb & BitBoardUtility.NOT_H_FILE, east_offset)
+                      | BitBoardUtility.shift(pawns_bb & BitBoardUtility.NOT_A_FILE, west_offset))
+
+        # Knights and king, all at once
+        attack_map |= BitBoardUtility.knight_attacks_setwise(bitboards[Piece.Knight + enemy_base - 1])
+        attack_map |= BitBoardUtility.king_attacks_setwise(bitboards[Piece.King + enemy_base - 1])
+
+        # Sliders
+        queens = bitboards[Piece.Queen + enemy_base - 1]
+        sliding_map = 0
+        for sq in BitBoardUtility.squares(bitboards[Piece.Bishop + enemy_base - 1] | queens):
+            sliding_map |= SliderAttacks.get_bishop_attacks(sq, occupancy)
+        for sq in BitBoardUtility.squares(bitboards[Piece.Rook + enemy_base - 1] | queens):
+            sliding_map |= SliderAttacks.get_rook_attacks(sq, occupancy)
+
+        return attack_map | sliding_map, sliding_map
 
     def compute_pin_rays(self):
         """
         Computes:
           • self.pin_rays  → bitboard of all pin rays
           • self.pin_mask[sq] → squares the pinned piece is allowed to move to
+
+        X-ray from the king: look again along the king's rays with the friendly
+        pieces it sees removed. Enemy sliders that only show up the second time
+        pin the friendly piece between them and the king. That is two lookups
+        per slider type, whatever the number of enemy sliders.
         """
 
         self.pin_rays = 0
         self.pin_mask = {}
 
-        # 1. King square
         king_type = Piece.King + self.friendly_color - 1
         king_sq = BitBoardUtility.bit_scan_forward(
             self.board_state.pieces_bitboard[king_type]
         )
         occupancy = self.board_state.all_pieces
-
-        # 2. Enemy slider lists
-        rook_type = Piece.Rook + self.enemy_color - 1
-        bishop_type = Piece.Bishop + self.enemy_color - 1
-        queen_type = Piece.Queen + self.enemy_color - 1
-
-        enemy_rooks = self.board_state.pieces_bitboard[rook_type] | self.board_state.pieces_bitboard[queen_type]
-        enemy_bishops = self.board_state.pieces_bitboard[bishop_type] | self.board_state.pieces_bitboard[queen_type]
-
-        # ---------------------------------------------------
-        # Helper: process a potential pin
-        # ---------------------------------------------------
-        def check_slider(slider_sq, direction):
-
-            # Must be aligned in the correct direction
-            if not BitBoardUtility.is_aligned(king_sq, slider_sq, direction):
-                return
-
-            # Get between mask
-            between = BitBoardUtility.BETWEEN_MASKS[king_sq][slider_sq]
-
-            # Count friendly blockers
-            blockers = between & self.friendly_pieces
-            if BitBoardUtility.count_bits(blockers) != 1:
-                return
-
-            # Extract pinned square
-            pinned_sq = BitBoardUtility.bit_scan_forward(blockers)
-
-            # Movement mask is:
-            #   all squares between king and slider + the slider square
-            allowed_mask = between | (1 << slider_sq)
-
-            # Store restricted move mask for this pinned piece
-            self.pin_mask[pinned_sq] = allowed_mask
-
-            # Add whole ray to global pin_rays
-            self.pin_rays |= allowed_mask | (1 << pinned_sq) | (1 << king_sq)
-
-        # ---------------------------------------------------
-        # 3. Rook/Queen pins (straight lines)
-        # ---------------------------------------------------
-        sliders = enemy_rooks
-        while sliders:
-            sq, sliders = BitBoardUtility.pop_lsb(sliders)
-            check_slider(sq, "rook")
-
-        # ---------------------------------------------------
-        # 4. Bishop/Queen pins (diagonals)
-        # ---------------------------------------------------
-        sliders = enemy_bishops
-        while sliders:
-            sq, sliders = BitBoardUtility.pop_lsb(sliders)
-            check_slider(sq, "bishop")
+        bitboards = self.board_state.pieces_bitboard
+        enemy_queens = bitboards[Piece.Queen + self.enemy_color - 1]
+        enemy_rooks = bitboards[Piece.Rook + self.enemy_color - 1] | enemy_queens
+        enemy_bishops = bitboards[Piece.Bishop + self.enemy_color - 1] | enemy_queens
+
+        for slider_attacks, pinners in ((SliderAttacks.get_rook_attacks, enemy_rooks),
+                                        (SliderAttacks.get_bishop_attacks, enemy_bishops)):
+            if not pinners:
+                continue
+            seen = slider_attacks(king_sq, occupancy)
+            blockers = seen & self.friendly_pieces
+            if not blockers:
+                continue
+            pinners &= slider_attacks(king_sq, occupancy ^ blockers) & ~seen
+
+            for pinner_sq in BitBoardUtility.squares(pinners):
+                between = BitBoardUtility.BETWEEN_MASKS[king_sq * 64 + pinner_sq]
+                pinned_sq = (between & blockers).bit_length() - 1
+
+                # Anywhere on the line is fine: the king and the pinner bound the moves
+                self.pin_mask[pinned_sq] = BitBoardUtility.LINE_MASKS[king_sq * 64 + pinner_sq]
+                self.pin_rays |= between | (1 << pinner_sq) | (1 << king_sq)
 
     def piece_on(self, sq: int) -> int | None:
         for piece_type, bb in enumerate(self.board_state.pieces_bitboard):
@@ -493,7 +479,7 @@ class MoveGenerator:
             direction = "bishop"
 
         # Compute the full ray between king and slider
-        ray = BitBoardUtility.BETWEEN_MASKS[king_sq][slider_sq] | (1 << king_sq) | (1 << slider_sq)
+        ray = BitBoardUtility.BETWEEN_MASKS[king_sq * 64 + slider_sq] | (1 << king_sq) | (1 << slider_sq)
 
         self.pin_rays |= ray
 
@@ -506,34 +492,149 @@ class MoveGenerator:
         exposes the king to check. This requires temporarily removing the captured pawn
         from the board and checking if the king is attacked.
         """
-        # Identify captured pawn square
-        push_dir = 1 if self.board_state.is_whites_turn else -1
-        captured_sq = ep_sq - push_dir * 8
+        # The captured pawn stands one rank behind ep_sq, seen from the side to move
+        flip = 0 if self.board_state.is_whites_turn else 56
+        captured_sq = ((ep_sq ^ flip) - 8) ^ flip
 
-        # Temporarily remove the pawn from the board
+        # Occupancy after the capture: both pawns leave, ours lands on ep_sq
         captured_bit = 1 << captured_sq
-        temp_enemy_pieces = self.enemy_pieces & ~captured_bit
-        temp_all_pieces = (self.board_state.all_pieces & ~captured_bit)
-
-        # Generate enemy attacks ignoring captured pawn
-        turn  = "white" if self.board_state.is_whites_turn else "black"
-        temp_enemy_attack_map = self.generate_enemy_attack_map(turn)
-        # Check if king is attacked after en-passant
-        return (temp_enemy_attack_map >> self.king_square) & 1 != 0
-
-
-    def generate_all_moves(self):
-        self.compute_pin_rays()
-        moves = []
-        moves.extend(self.generate_pawn_moves())
-        moves.extend(self.generate_knights_moves())
-        moves.extend(self.generate_sliding_moves(Piece.Bishop,self.board_state.is_whites_turn))
-        moves.extend(self.generate_sliding_moves(Piece.Rook,self.board_state.is_whites_turn))
-        moves.extend(self.generate_sliding_moves(Piece.Queen,self.board_state.is_whites_turn))
-        moves.extend(self.generate_king_moves())
-        # for i, move in enumerate(moves, start=1):
-        #     print(f"{i:>3}.\t{move}")
-        return moves
+        occupancy_after = (self.board_state.all_pieces & ~(1 << from_sq) & ~captured_bit) | (1 << ep_sq)
+
+        # The captured pawn is gone from occupancy, so it never counts as an attacker
+        return self.board_state.attackers_to(self.king_square, occupancy_after) & self.enemy_pieces != 0
+
+
+    def ply_buffer(self) -> MoveBuffer:
+        """The move buffer for the board's current ply."""
+        ply = len(self.ply_stack)
+        while len(self.move_buffers) <= ply:
+            self.move_buffers.append(MoveBuffer())
+        return self.move_buffers[ply]
+
+    def generate_moves(self) -> MoveBuffer:
+        """
+        Generate the legal moves into this ply's buffer and return it.
+        The buffer stays valid until the next position at the same ply is generated.
+        """
+        self.ensure_up_to_date()
+        if self.cached_moves is not None:
+            return self.cached_moves
+
+        buffer = self.ply_buffer()
+        buffer.clear()
+        if self.in_double_check:
+            self.generate_king_moves(buffer)
+        else:
+            is_white = self.board_state.is_whites_turn
+            self.generate_pawn_moves(buffer)
+            self.generate_knights_moves(buffer)
+            self.generate_sliding_moves(buffer, Piece.Bishop, is_white)
+            self.generate_sliding_moves(buffer, Piece.Rook, is_white)
+            self.generate_sliding_moves(buffer, Piece.Queen, is_white)
+            self.generate_king_moves(buffer)
+        self.cached_moves = buffer
+        return buffer
+
+    def count_moves(self) -> int:
+        """
+        Number of legal moves, without writing any of them: each piece's
+        target set is popcounted instead (pawns setwise, promotions x4).
+        Equal to generate_moves().count. Pseudo-legal mode only has a
+        meaningful count after filtering, so it generates instead.
+        """
+        self.ensure_up_to_date()
+        if self.cached_moves is not None or self.pseudo_legal:
+            return self.generate_moves().count
+
+        count = BitBoardUtility.count_bits
+        bitboards = self.board_state.pieces_bitboard
+        king_sq = self.king_square
+        total = 0
+        if king_sq >= 0:
+            king_targets = BitBoardUtility.KING_ATTACKS[king_sq] & ~(self.enemy_attack_map | self.friendly_pieces)
+            total += count(king_targets & self.move_type_mask)
+            if not self.in_check:
+                total += len(self.castling_targets())
+        if self.in_double_check:
+            return total
+
+        total += self.count_pawn_moves()
+
+        pin_mask = self.pin_mask
+        move_mask = self.empty_or_enemy_squares & self.check_ray_bitmask
+        knights = bitboards[Piece.Knight + self.friendly_color - 1]
+        knight_mask = move_mask & self.move_type_mask
+        for knight_sq in BitBoardUtility.squares(knights):
+            if knight_sq not in pin_mask:  # a pinned knight never stays on its pin line
+                total += count(BitBoardUtility.KNIGHT_ATTACKS[knight_sq] & knight_mask)
+
+        occ = self.board_state.all_pieces
+        queens = bitboards[Piece.Queen + self.friendly_color - 1]
+        for slider_attacks, sliders in (
+            (SliderAttacks.get_bishop_attacks, bitboards[Piece.Bishop + self.friendly_color - 1] | queens),
+            (SliderAttacks.get_rook_attacks, bitboards[Piece.Rook + self.friendly_color - 1] | queens),
+        ):
+            for sq in BitBoardUtility.squares(sliders):
+                targets = slider_attacks(sq, occ) & move_mask
+                if sq in pin_mask:
+                    targets &= pin_mask[sq]
+                total += count(targets)
+        return total
+
+    def count_pawn_moves(self) -> int:
+        """
+        Pawn moves counted setwise, from white's point of view as in
+        generate_pawn_moves. Unpinned pawns are counted together; each pinned
+        pawn is counted alone against its (flipped) pin line.
+        """
+        flip = 0 if self.board_state.is_whites_turn else 56
+        pawns = self.board_state.pieces_bitboard[Piece.Pawn + self.friendly_color - 1]
+        if not pawns:
+            return 0
+        empty = self.empty_squares
+        enemies = self.enemy_pieces
+        check_mask = self.check_ray_bitmask
+        mirror = BitBoardUtility.flip_vertical
+        if flip:
+            pawns, empty, enemies, check_mask = mirror(pawns), mirror(empty), mirror(enemies), mirror(check_mask)
+
+        count = BitBoardUtility.count_bits
+        rank8 = BitBoardUtility.RANK8
+
+        def pawn_moves(movers: int, allowed: int) -> int:
+            single_push = (movers << 8) & empty
+            double_push = ((single_push & BitBoardUtility.RANK3) << 8) & empty
+            total = count(double_push & allowed)
+            for targets in (single_push,
+                            (movers & BitBoardUtility.NOT_A_FILE) << 7 & enemies,
+                            (movers & BitBoardUtility.NOT_H_FILE) << 9 & enemies):
+                targets &= allowed
+                total += count(targets & ~rank8) + 4 * count(targets & rank8)
+            return total
+
+        free = pawns
+        total = 0
+        for pinned_sq, line in self.pin_mask.items():
+            pinned_bit = 1 << (pinned_sq ^ flip)
+            if pawns & pinned_bit:
+                free &= ~pinned_bit
+                total += pawn_moves(pinned_bit, check_mask & (mirror(line) if flip else line))
+        total += pawn_moves(free, check_mask)
+
+        # En passant: the same candidates as generate_pawn_moves
+        if self.board_state.en_passant_target is not None:
+            ep_x, ep_y = self.board_state.en_passant_target
+            ep_index = self.xy_to_index(ep_x, ep_y)
+            ep_bit = 1 << (ep_index ^ flip)
+            for capturers, offset in (((pawns & BitBoardUtility.NOT_A_FILE) << 7, 7),
+                                      ((pawns & BitBoardUtility.NOT_H_FILE) << 9, 9)):
+                if capturers & ep_bit:
+                    start_sq = ((ep_index ^ flip) - offset) ^ flip
+                    total += not self.exposes_king_ep(start_sq, ep_index)
+        return total
+
+    def generate_all_moves(self) -> list[Move]:
+        return self.generate_moves().to_list()
 
     def xy_to_index(self, x: int, y: int) -> int:
         """Convert (file=x, rank=y) to a 0–63 square index."""
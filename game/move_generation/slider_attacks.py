@@ -0,0 +1,134 @@
+import os
+import time
+from typing import Callable
+
+from game.move_generation.bitboard_utilities import BitBoardUtility
+from game.move_generation.magic.magic import Magic
+from game.move_generation.magic.magic_helper import MagicHelper
+from game.move_generation.slider_backends import KoggeStone, HyperbolaQuintessence
+from game.startup import Startup
+
+MAGIC_TABLES = "magic_tables"
+SLIDER_ATTACKS = "slider_attacks"
+
+# Backend used when nothing else is asked for; "auto" times them all first
+BACKEND_ENV_VAR = "CHESS_SLIDER_BACKEND"
+DEFAULT_BACKEND = "magic"
+AUTO_BACKEND = "auto"
+
+# (rook, bishop, queen) lookups, each (square, occupancy) -> attack bitboard
+Lookups = tuple[Callable[[int, int], int], Callable[[int, int], int], Callable[[int, int], int]]
+
+
+class SliderAttacks:
+    """
+    Single entry point for rook / bishop / queen attack lookups.
+
+    Every caller (move generation, attack maps, pins) goes through this class,
+    so the implementation behind it can change without touching the callers.
+
+    Implementations are registered as backends. On the first lookup the one
+    named by CHESS_SLIDER_BACKEND (default: magic; "auto" picks the fastest on
+    this interpreter) is loaded, and the methods below are replaced by its
+    lookups, so steady-state calls cost no extra Python frame.
+    """
+    # name -> loader returning the backend's lookups
+    backends: dict[str, Callable[[], Lookups]] = {}
+    active_backend: str | None = None
+
+    @staticmethod
+    def get_rook_attacks(square: int, occupancy: int) -> int:
+        Startup.ensure(SLIDER_ATTACKS)
+        return SliderAttacks.get_rook_attacks(square, occupancy)
+
+    @staticmethod
+    def get_bishop_attacks(square: int, occupancy: int) -> int:
+        Startup.ensure(SLIDER_ATTACKS)
+        return SliderAttacks.get_bishop_attacks(square, occupancy)
+
+    @staticmethod
+    def get_queen_attacks(square: int, occupancy: int) -> int:
+        Startup.ensure(SLIDER_ATTACKS)
+        return SliderAttacks.get_queen_attacks(square, occupancy)
+
+    @staticmethod
+    def get_slider_attacks(square: int, occupancy: int, ortho: bool) -> int:
+        if ortho:
+            return SliderAttacks.get_rook_attacks(square, occupancy)
+        return SliderAttacks.get_bishop_attacks(square, occupancy)
+
+    @staticmethod
+    def bind(rook_attacks, bishop_attacks, queen_attacks):
+        """Route every lookup to the given (square, occupancy) -> bitboard functions."""
+        SliderAttacks.get_rook_attacks = staticmethod(rook_attacks)
+        SliderAttacks.get_bishop_attacks = staticmethod(bishop_attacks)
+        SliderAttacks.get_queen_attacks = staticmethod(queen_attacks)
+
+    # ----------------- Backends -----------------
+    @staticmethod
+    def register_backend(name: str, loader: Callable[[], Lookups]):
+        """`loader` prepares any tables the backend needs and returns its lookups."""
+        SliderAttacks.backends[name] = loader
+
+    @staticmethod
+    def load_backend(name: str) -> Lookups:
+        if name not in SliderAttacks.backends:
+            raise ValueError(f"Unknown slider backend '{name}' (available: {', '.join(SliderAttacks.backends)})")
+        return SliderAttacks.backends[name]()
+
+    @staticmethod
+    def use(name: str):
+        """Switch every lookup to backend `name` ("auto" picks the fastest)."""
+        if name == AUTO_BACKEND:
+            name = SliderAttacks.fastest_backend()
+        SliderAttacks.bind(*SliderAttacks.load_backend(name))
+        SliderAttacks.active_backend = name
+
+    @staticmethod
+    def time_backend(name: str, samples: list[tuple[int, int]], repeats: int = 3) -> float:
+        """Best-of-`repeats` seconds for one rook + bishop lookup per sample."""
+        rook, bishop, _ = SliderAttacks.load_backend(name)
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for sq, occ in samples:
+                rook(sq, occ)
+                bishop(sq, occ)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    @staticmethod
+    def fastest_backend(sample_count: int = 1000, seed: int = 1) -> str:
+        """Name of the backend with the quickest lookups on this interpreter."""
+        samples = MagicHelper.random_occupancies(sample_count, seed)
+        timings = {name: SliderAttacks.time_backend(name, samples) for name in SliderAttacks.backends}
+        return min(timings, key=timings.get)
+
+
+def _load_classical() -> Lookups:
+    rook, bishop = BitBoardUtility.get_rook_attacks, BitBoardUtility.get_bishop_attacks
+    return rook, bishop, lambda square, occupancy: rook(square, occupancy) | bishop(square, occupancy)
+
+
+def _load_magic() -> Lookups:
+    Startup.ensure(MAGIC_TABLES)
+    return Magic.get_rook_attacks, Magic.get_bishop_attacks, Magic.get_queen_attacks
+
+
+def _load_kogge_stone() -> Lookups:
+    return KoggeStone.get_rook_attacks, KoggeStone.get_bishop_attacks, KoggeStone.get_queen_attacks
+
+
+def _load_hyperbola() -> Lookups:
+    HyperbolaQuintessence.init_tables()
+    return (HyperbolaQuintessence.get_rook_attacks, HyperbolaQuintessence.get_bishop_attacks,
+            HyperbolaQuintessence.get_queen_attacks)
+
+
+SliderAttacks.register_backend("classical", _load_classical)
+SliderAttacks.register_backend("magic", _load_magic)
+SliderAttacks.register_backend("kogge_stone", _load_kogge_stone)
+SliderAttacks.register_backend("hyperbola", _load_hyperbola)
+
+Startup.register(MAGIC_TABLES, Magic.init_tables)
+Startup.register(SLIDER_ATTACKS, lambda: SliderAttacks.use(os.environ.get(BACKEND_ENV_VAR, DEFAULT_BACKEND)))
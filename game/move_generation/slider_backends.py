@@ -0,0 +1,201 @@
+from typing import List
+
+FULL_BOARD = 0xFFFFFFFFFFFFFFFF
+NOT_A_FILE = 0xFEFEFEFEFEFEFEFE
+NOT_H_FILE = 0x7F7F7F7F7F7F7F7F
+
+
+# --------------------------------------------------
+# KOGGE-STONE
+# --------------------------------------------------
+class KoggeStone:
+    """
+    Setwise slider attacks: each direction is flooded with three
+    shift-and-mask steps (occluded fill), then shifted once more so the
+    first blocker is included. No tables at all.
+    """
+
+    @staticmethod
+    def _north(gen: int, empty: int) -> int:
+        gen |= empty & (gen << 8)
+        empty &= empty << 8
+        gen |= empty & (gen << 16)
+        empty &= empty << 16
+        gen |= empty & (gen << 32)
+        return (gen << 8) & FULL_BOARD
+
+    @staticmethod
+    def _south(gen: int, empty: int) -> int:
+        gen |= empty & (gen >> 8)
+        empty &= empty >> 8
+        gen |= empty & (gen >> 16)
+        empty &= empty >> 16
+        gen |= empty & (gen >> 32)
+        return gen >> 8
+
+    @staticmethod
+    def _east(gen: int, empty: int) -> int:
+        empty &= NOT_A_FILE
+        gen |= empty & (gen << 1)
+        empty &= empty << 1
+        gen |= empty & (gen << 2)
+        empty &= empty << 2
+        gen |= empty & (gen << 4)
+        return (gen << 1) & NOT_A_FILE
+
+    @staticmethod
+    def _west(gen: int, empty: int) -> int:
+        empty &= NOT_H_FILE
+        gen |= empty & (gen >> 1)
+        empty &= empty >> 1
+        gen |= empty & (gen >> 2)
+        empty &= empty >> 2
+        gen |= empty & (gen >> 4)
+        return (gen >> 1) & NOT_H_FILE
+
+    @staticmethod
+    def _north_east(gen: int, empty: int) -> int:
+        empty &= NOT_A_FILE
+        gen |= empty & (gen << 9)
+        empty &= empty << 9
+        gen |= empty & (gen << 18)
+        empty &= empty << 18
+        gen |= empty & (gen << 36)
+        return (gen << 9) & NOT_A_FILE
+
+    @staticmethod
+    def _north_west(gen: int, empty: int) -> int:
+        empty &= NOT_H_FILE
+        gen |= empty & (gen << 7)
+        empty &= empty << 7
+        gen |= empty & (gen << 14)
+        empty &= empty << 14
+        gen |= empty & (gen << 28)
+        return (gen << 7) & NOT_H_FILE
+
+    @staticmethod
+    def _south_east(gen: int, empty: int) -> int:
+        empty &= NOT_A_FILE
+        gen |= empty & (gen >> 7)
+        empty &= empty >> 7
+        gen |= empty & (gen >> 14)
+        empty &= empty >> 14
+        gen |= empty & (gen >> 28)
+        return (gen >> 7) & NOT_A_FILE
+
+    @staticmethod
+    def _south_west(gen: int, empty: int) -> int:
+        empty &= NOT_H_FILE
+        gen |= empty & (gen >> 9)
+        empty &= empty >> 9
+        gen |= empty & (gen >> 18)
+        empty &= empty >> 18
+        gen |= empty & (gen >> 36)
+        return (gen >> 9) & NOT_H_FILE
+
+    @staticmethod
+    def get_rook_attacks(square: int, occupancy: int) -> int:
+        gen = 1 << square
+        empty = ~occupancy & FULL_BOARD
+        return (KoggeStone._north(gen, empty) | KoggeStone._south(gen, empty)
+                | KoggeStone._east(gen, empty) | KoggeStone._west(gen, empty))
+
+    @staticmethod
+    def get_bishop_attacks(square: int, occupancy: int) -> int:
+        gen = 1 << square
+        empty = ~occupancy & FULL_BOARD
+        return (KoggeStone._north_east(gen, empty) | KoggeStone._north_west(gen, empty)
+                | KoggeStone._south_east(gen, empty) | KoggeStone._south_west(gen, empty))
+
+    @staticmethod
+    def get_queen_attacks(square: int, occupancy: int) -> int:
+        return KoggeStone.get_rook_attacks(square, occupancy) | KoggeStone.get_bishop_attacks(square, occupancy)
+
+
+# --------------------------------------------------
+# HYPERBOLA QUINTESSENCE
+# --------------------------------------------------
+class HyperbolaQuintessence:
+    """
+    o ^ (o - 2r) line attacks. Files and diagonals use a byte swap (vertical
+    flip) as the reversed bitboard; ranks, where a byte swap does not reverse
+    anything, use a small first-rank table instead.
+    """
+    # Per square: line through the square, excluding the square itself
+    FileMasks: List[int] = []
+    DiagonalMasks: List[int] = []
+    AntiDiagonalMasks: List[int] = []
+    # [file][inner 6 occupancy bits of the rank] -> attacks along rank 1
+    FirstRankAttacks: List[List[int]] = []
+
+    @staticmethod
+    def init_tables():
+        if HyperbolaQuintessence.FileMasks:
+            return
+        for sq in range(64):
+            file, rank = sq % 8, sq // 8
+            file_mask = diagonal = anti_diagonal = 0
+            for other in range(64):
+                if other == sq:
+                    continue
+                other_file, other_rank = other % 8, other // 8
+                if other_file == file:
+                    file_mask |= 1 << other
+                if other_file - other_rank == file - rank:
+                    diagonal |= 1 << other
+                if other_file + other_rank == file + rank:
+                    anti_diagonal |= 1 << other
+            HyperbolaQuintessence.FileMasks.append(file_mask)
+            HyperbolaQuintessence.DiagonalMasks.append(diagonal)
+            HyperbolaQuintessence.AntiDiagonalMasks.append(anti_diagonal)
+
+        for file in range(8):
+            row = []
+            for inner in range(64):
+                occupancy = inner << 1
+                attacks = 0
+                for step in (1, -1):
+                    other = file + step
+                    while 0 <= other < 8:
+                        attacks |= 1 << other
+                        if (occupancy >> other) & 1:
+                            break
+                        other += step
+                row.append(attacks)
+            HyperbolaQuintessence.FirstRankAttacks.append(row)
+
+    @staticmethod
+    def _byte_swap(bitboard: int) -> int:
+        return int.from_bytes(bitboard.to_bytes(8, "little"), "big")
+
+    @staticmethod
+    def _line_attacks(square: int, occupancy: int, mask: int) -> int:
+        byte_swap = HyperbolaQuintessence._byte_swap
+        slider = 1 << square
+        forward = occupancy & mask
+        reverse = byte_swap(forward)
+        forward = (forward - slider) & FULL_BOARD
+        reverse = (reverse - byte_swap(slider)) & FULL_BOARD
+        return (forward ^ byte_swap(reverse)) & mask
+
+    @staticmethod
+    def _rank_attacks(square: int, occupancy: int) -> int:
+        shift = square & 56
+        inner = (occupancy >> (shift + 1)) & 63
+        return HyperbolaQuintessence.FirstRankAttacks[square & 7][inner] << shift
+
+    @staticmethod
+    def get_rook_attacks(square: int, occupancy: int) -> int:
+        return (HyperbolaQuintessence._line_attacks(square, occupancy, HyperbolaQuintessence.FileMasks[square])
+                | HyperbolaQuintessence._rank_attacks(square, occupancy))
+
+    @staticmethod
+    def get_bishop_attacks(square: int, occupancy: int) -> int:
+        return (HyperbolaQuintessence._line_attacks(square, occupancy, HyperbolaQuintessence.DiagonalMasks[square])
+                | HyperbolaQuintessence._line_attacks(square, occupancy,
+                                                      HyperbolaQuintessence.AntiDiagonalMasks[square]))
+
+    @staticmethod
+    def get_queen_attacks(square: int, occupancy: int) -> int:
+        return (HyperbolaQuintessence.get_rook_attacks(square, occupancy)
+                | HyperbolaQuintessence.get_bishop_attacks(square, occupancy))
@@ -0,0 +1,127 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Callable
+
+# Cache files live next to the package unless overridden (e.g. read-only installs)
+CACHE_DIR = os.environ.get(
+    "CHESS_TABLE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".table_cache"),
+)
+
+
+class TableCache:
+    """
+    Versioned on-disk cache for precomputed uint64 lookup tables.
+
+    File layout (native byte order, recorded in the header):
+        8s  signature  b"CHESSTBL"
+        I   format version
+        I   byte order (1 = little, 2 = big)
+        32s fingerprint of the inputs the table was built from
+        Q   number of uint64 words that follow
+        ... payload words
+
+    A file is only used when signature, version, byte order, fingerprint and
+    size all match; anything else is treated as missing and rebuilt.
+    """
+
+    SIGNATURE = b"CHESSTBL"
+    VERSION = 1
+    HEADER = struct.Struct("=8sII32sQ")
+    BYTE_ORDER = 1 if sys.byteorder == "little" else 2
+
+    # Keeps the mmaps alive for as long as the returned views are in use
+    _open_maps: dict[str, mmap.mmap] = {}
+
+    @staticmethod
+    def fingerprint(*parts) -> bytes:
+        """Stable 32-byte digest of whatever the table depends on."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(repr(part).encode())
+        return digest.digest()
+
+    @staticmethod
+    def path(name: str) -> str:
+        return os.path.join(CACHE_DIR, f"{name}.bin")
+
+    @staticmethod
+    def load(name: str, fingerprint: bytes) -> memoryview | None:
+        """Memory-map a cached table. Returns a uint64 view, or None if unusable."""
+        try:
+            with open(TableCache.path(name), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        header_size = TableCache.HEADER.size
+        if len(mapped) < header_size:
+            mapped.close()
+            return None
+
+        signature, version, byte_order, stored_fingerprint, words = TableCache.HEADER.unpack_from(mapped, 0)
+        if (
+            signature != TableCache.SIGNATURE
+            or version != TableCache.VERSION
+            or byte_order != TableCache.BYTE_ORDER
+            or stored_fingerprint != fingerprint
+            or len(mapped) != header_size + words * 8
+        ):
+            mapped.close()
+            return None
+
+        TableCache._open_maps[name] = mapped
+        return memoryview(mapped)[header_size:].cast("Q")
+
+    @staticmethod
+    def save(name: str, fingerprint: bytes, table: array) -> bool:
+        """Write atomically so concurrent processes never see a partial file."""
+        path = TableCache.path(name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(TableCache.HEADER.pack(
+                    TableCache.SIGNATURE, TableCache.VERSION, TableCache.BYTE_ORDER, fingerprint, len(table)
+                ))
+                table.tofile(f)
+            os.replace(tmp_path, path)
+            return True
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    @staticmethod
+    def load_or_build(name: str, fingerprint: bytes, build: Callable[[], array]) -> memoryview:
+        """
+        Return the cached table `name`, building and saving it first if the
+        cache is missing or stale. Falls back to the in-memory table when the
+        cache directory is not writable.
+        """
+        view = TableCache.load(name, fingerprint)
+        if view is not None:
+            return view
+
+        table = build()
+        if TableCache.save(name, fingerprint, table):
+            view = TableCache.load(name, fingerprint)
+            if view is not None:
+                return view
+        return memoryview(table)
+
+    @staticmethod
+    def clear():
+        """Delete every cache file (used to measure cold startup)."""
+        if not os.path.isdir(CACHE_DIR):
+            return
+        for file_name in os.listdir(CACHE_DIR):
+            if file_name.endswith(".bin"):
+                try:
+                    os.remove(os.path.join(CACHE_DIR, file_name))
+                except OSError:
+                    pass
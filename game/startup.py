@@ -0,0 +1,137 @@
+"""
+Startup-time management.
+
+Heavy work (attack-table construction, optional third-party integrations) is
+registered here and only performed the first time something needs it, so
+`import game.models.board` stays cheap for the GUI, perft runs and every
+worker process.
+
+Usage as a command:
+    python -m game.startup report [module] [--top N]
+prints an `-X importtime` breakdown of a cold import of `module`
+(default: game.models.board).
+"""
+import importlib.util
+import os
+import sys
+import time
+from types import ModuleType
+from typing import Callable
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_REPORT_MODULE = "game.models.board"
+
+
+class Startup:
+    # name -> initializer, run at most once
+    _initializers: dict[str, Callable[[], None]] = {}
+    # name -> seconds spent in the initializer
+    _timings: dict[str, float] = {}
+
+    @staticmethod
+    def register(name: str, initializer: Callable[[], None]):
+        """Declare a deferred subsystem. Nothing runs until `ensure(name)`."""
+        Startup._initializers[name] = initializer
+
+    @staticmethod
+    def ensure(name: str):
+        """Run the initializer for `name` if it has not run yet."""
+        if name in Startup._timings:
+            return
+        start = time.perf_counter()
+        Startup._initializers[name]()
+        Startup._timings[name] = time.perf_counter() - start
+
+    @staticmethod
+    def is_ready(name: str) -> bool:
+        return name in Startup._timings
+
+    @staticmethod
+    def timings() -> dict[str, float]:
+        """Seconds spent in every subsystem initialised so far."""
+        return dict(Startup._timings)
+
+    @staticmethod
+    def lazy_import(module_name: str) -> ModuleType:
+        """
+        Return `module_name` without executing it; the real import happens on
+        first attribute access. Raises ModuleNotFoundError immediately if the
+        module is not installed.
+        """
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+        spec = importlib.util.find_spec(module_name)
+        if spec is None:
+            raise ModuleNotFoundError(f"No module named '{module_name}'", name=module_name)
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        loader.exec_module(module)
+        return module
+
+    @staticmethod
+    def optional_import(module_name: str) -> ModuleType | None:
+        """Like `lazy_import`, but returns None when the module is not installed."""
+        try:
+            return Startup.lazy_import(module_name)
+        except ModuleNotFoundError:
+            return None
+
+
+# --------------------------------------------------
+# IMPORT-TIME PROFILING
+# --------------------------------------------------
+def profile_import(module_name: str = DEFAULT_REPORT_MODULE) -> list[tuple[str, int, int]]:
+    """
+    Import `module_name` in a fresh interpreter with `-X importtime`.
+    Returns (module, self_us, cumulative_us) rows in import order.
+    """
+    # Only the report needs subprocess; keep it out of the normal import path
+    import subprocess
+
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def import_time_ms(module_name: str = DEFAULT_REPORT_MODULE) -> float:
+    """Cumulative import time of `module_name` in a fresh interpreter, in ms."""
+    for name, _, cumulative_us in profile_import(module_name):
+        if name.strip() == module_name:
+            return cumulative_us / 1000
+    raise RuntimeError(f"{module_name} not found in import profile")
+
+
+def print_report(module_name: str = DEFAULT_REPORT_MODULE, top: int = 15):
+    rows = profile_import(module_name)
+    total = next(cumulative for name, _, cumulative in rows if name.strip() == module_name)
+
+    print(f"Cold import of {module_name}: {total / 1000:.1f} ms ({len(rows)} modules)\n")
+    print(f"{'self (ms)':>10}  {'cumulative (ms)':>15}  module")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[1], reverse=True)[:top]:
+        print(f"{self_us / 1000:>10.1f}  {cumulative_us / 1000:>15.1f}  {name.strip()}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Startup-time tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report = commands.add_parser("report", help="print an -X importtime breakdown")
+    report.add_argument("module", nargs="?", default=DEFAULT_REPORT_MODULE)
+    report.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    if args.command == "report":
+        print_report(args.module, args.top)
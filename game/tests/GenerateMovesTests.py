@@ -1,7 +1,6 @@
 import time
-import json
-from datetime import datetime
 from game.models.board import Board
+from game.tests.benchmark_store import STORE_FILE, BenchmarkStore
 
 TEST_NAME = "v1 - using bitboards with pin rays"
 SAVE_TEST = True
@@ -18,25 +17,35 @@ KNOWN_PERFT = {
 }
 
 
-def perft(board: Board, depth: int, turn: str, callback=None, print_moves=False):
+def perft(board: Board, depth: int, turn: str, callback=None, print_moves=False, bulk=True):
+    """
+    Leaf nodes `depth` plies below `board`. With `bulk` the depth-1 nodes are
+    counted, not made: the legal move count is the number of leaves.
+    """
     if depth == 0:
         if callback:
             callback(1)
         return 1
 
-    moves = board.generate_all_legal_moves()
+    if bulk and depth == 1 and not print_moves:
+        total = board.count_legal_moves()
+        if callback and total:
+            callback(total)
+        return total
+
+    moves = board.generate_move_buffer()
     total = 0
 
     # PRINT ALL ROOT MOVES IF REQUESTED
     if print_moves and depth == 1:
         print("\nMoves at leaf depth:")
-        for m in moves:
+        for m in moves.to_list():
             print("   ", m)
 
-    for move in moves:
-        captured, moves_done, status = board.make_move(move)
+    for i in range(moves.count):
+        captured, moves_done, status = board.make_move(moves.move(i))
         next_turn = "white" if turn == "black" else "black"
-        total += perft(board, depth - 1, next_turn, callback)
+        total += perft(board, depth - 1, next_turn, callback, bulk=bulk)
         board.undo_move(moves_done)
 
     return total
@@ -46,27 +55,13 @@ def visualize_perft(
         initial_fen: str,
         max_depth: int = 4,
         test_name: str = "DefaultTest",
-        file_name: str = "perft_results.json",
+        store_file: str = STORE_FILE,
         save_file: bool = False
 ):
-    try:
-        with open(file_name, "r") as f:
-            all_results = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        all_results = []
-
-    test_id = max([item.get("test_id", 0) for item in all_results], default=0) + 1
     board = Board(initial_fen)
     turn = "white" if board.board_data.is_whites_turn else "black"
 
-    results = {
-        "test_id": test_id,
-        "test_name": test_name,
-        "fen": initial_fen,
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "time": datetime.now().strftime("%H:%M:%S"),
-        "depths": []
-    }
+    depths = []
 
     for d in range(1, max_depth + 1):
         # Adjust update interval dynamically
@@ -81,7 +76,8 @@ def visualize_perft(
         def progress_callback(nodes=1):
             nonlocal nodes_so_far
             nodes_so_far += nodes
-            if nodes_so_far % update_every == 0:
+            # Leaves arrive in bulk, so report whenever a multiple is crossed
+            if nodes_so_far // update_every != (nodes_so_far - nodes) // update_every:
                 elapsed = time.perf_counter() - start
                 print(
                     f"\rDepth {d} | Nodes: {nodes_so_far:,} | Elapsed: {elapsed:.2f}s",
@@ -103,7 +99,7 @@ def visualize_perft(
             f"NPS: {nps:,.0f} nodes/sec{status}"
         )
 
-        results["depths"].append({
+        depths.append({
             "depth": d,
             "nodes": total_nodes,
             "expected": expected,
@@ -112,12 +108,10 @@ def visualize_perft(
             "nps": int(nps)
         })
 
-    all_results.append(results)
     if save_file:
-        with open(file_name, "w") as f:
-            json.dump(all_results, f, indent=4)
-
-    print(f"\nResults saved to {file_name} (test_id={test_id})")
+        record = BenchmarkStore.append("perft", BenchmarkStore.perft_metrics(depths),
+                                       {"test_name": test_name, "fen": initial_fen}, store_file)
+        print(f"\nResults appended to {store_file} (run_id={record['run_id']})")
 
 
 
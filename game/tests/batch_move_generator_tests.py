@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from game.models.board import Board
+from game.move_generation.batch_move_generator import BatchMoveGenerator, np
+from game.move_generation.move_generator import MoveGenerator
+
+CORPUS_FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "8/8/8/KPp4r/8/8/8/7k w - c6 0 1",
+]
+
+
+def random_corpus(positions_per_fen: int = 60, max_plies: int = 40, seed: int = 7) -> list[Board]:
+    """Positions reached by random play from each corpus FEN."""
+    rng = random.Random(seed)
+    boards = []
+    for fen in CORPUS_FENS:
+        for _ in range(positions_per_fen):
+            board = Board(fen)
+            for _ in range(rng.randrange(max_plies)):
+                moves = board.generate_all_legal_moves()
+                if not moves:
+                    break
+                board.make_move(rng.choice(moves))
+            boards.append(Board(board.board_data.fen))
+    return boards
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class BatchMoveGeneratorTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.boards = random_corpus()
+        cls.packed = BatchMoveGenerator.pack_boards(cls.boards)
+
+    def test_legal_move_counts_match_move_generator(self):
+        counts = BatchMoveGenerator.legal_move_counts(*self.packed)
+        for board, count in zip(self.boards, counts):
+            self.assertEqual(len(board.generate_all_legal_moves()), int(count), board.board_data.fen)
+
+    def test_attack_sets_match_board_state(self):
+        attacks = BatchMoveGenerator.attack_sets(self.packed[0])
+        for board, row in zip(self.boards, attacks):
+            state = board.board_data
+            self.assertEqual([state.attacks_by_piece(i) for i in range(12)], [int(bb) for bb in row], state.fen)
+
+    def test_pseudo_legal_targets_match_pseudo_legal_generation(self):
+        # Pseudo-legal generation still keeps the king off attacked squares and
+        # answers checks, so compare the other piece types in quiet positions
+        targets = BatchMoveGenerator.pseudo_legal_targets(*self.packed)
+        compared = 0
+        for board, row in zip(self.boards, targets):
+            state = board.board_data
+            if board.is_in_check("white" if state.is_whites_turn else "black"):
+                continue
+            expected = [0] * 6
+            for move in MoveGenerator(board, pseudo_legal=True).generate_all_moves():
+                x, y = move.start_pos
+                piece_type = state.square_piece[y * 8 + x] % 6
+                tx, ty = move.target_pos
+                expected[piece_type] |= 1 << (ty * 8 + tx)
+            self.assertEqual(expected[:5], [int(bb) for bb in row[:5]], state.fen)
+            compared += 1
+        self.assertGreater(compared, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,298 @@
+"""
+Append-only store for benchmark results, one JSON record per line.
+
+Every record carries where it was measured (machine fingerprint, git
+revision, interpreter) next to what was measured:
+
+    {"run_id": "...", "benchmark": "perft", "timestamp": "...",
+     "machine": {...}, "revision": "9ae2cea...", "dirty": false,
+     "python": "CPython 3.11.7", "params": {...},
+     "metrics": {"d4.seconds": 0.82, "pop_lsb.ns": [61.2, 60.8, 63.0]}}
+
+A metric is a number or a list of repeated samples. Records are only ever
+appended, and readers stream the file line by line, so a run never has to
+load or rewrite the history.
+
+    python -m game.tests.benchmark_store list [--benchmark perft]
+    python -m game.tests.benchmark_store compare <run or revision> <run or revision> [--alpha 0.05]
+    python -m game.tests.benchmark_store import-json perft_results.json
+
+`compare` pools every sample of each side (all runs at a revision, or one
+run) and prints the change of the median per metric. The change is called
+significant only when a Mann-Whitney U test rejects "same distribution" at
+`--alpha` and the median moved by at least `--min-change`; with a single
+sample on a side there is no noise estimate, and the delta is shown without
+a verdict. Samples taken within one run do not see drift between runs (load,
+frequency scaling), so compare revisions with several runs each where the
+machine is noisy.
+"""
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import uuid
+from datetime import datetime
+from itertools import combinations
+from statistics import median
+from typing import Iterator, NamedTuple, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(HERE))
+STORE_FILE = os.path.join(HERE, "benchmark_results.jsonl")
+
+DEFAULT_ALPHA = 0.05
+# Smaller moves of the median are never reported as significant
+DEFAULT_MIN_CHANGE = 0.03
+# Above this many sample splits the U test uses the normal approximation
+EXACT_TEST_LIMIT = 20000
+
+
+class MetricComparison(NamedTuple):
+    metric: str
+    before: float  # medians
+    after: float
+    change: float  # relative, (after - before) / before
+    p_value: Optional[float]  # None: not enough samples for a test
+
+    def significant(self, alpha: float = DEFAULT_ALPHA, min_change: float = DEFAULT_MIN_CHANGE) -> bool:
+        return self.p_value is not None and self.p_value < alpha and abs(self.change) >= min_change
+
+
+class BenchmarkStore:
+
+    # -----------------------------
+    # Environment
+    # -----------------------------
+    @staticmethod
+    def machine_fingerprint() -> dict:
+        """What the numbers depend on, plus a short id to group runs by machine."""
+        cpu = platform.processor()
+        try:
+            with open("/proc/cpuinfo") as f:
+                cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+        except OSError:
+            pass
+        machine = {
+            "node": platform.node(),
+            "system": platform.platform(),
+            "arch": platform.machine(),
+            "cpu": cpu,
+            "cpu_count": os.cpu_count(),
+        }
+        machine["id"] = hashlib.sha1(json.dumps(machine, sort_keys=True).encode()).hexdigest()[:12]
+        return machine
+
+    @staticmethod
+    def git_revision(repo: str = REPO_ROOT) -> tuple[Optional[str], bool]:
+        """(HEAD commit, whether tracked files differ from it); (None, False) outside git."""
+        try:
+            revision = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo, capture_output=True,
+                                      text=True, check=True).stdout.strip()
+            dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=repo).returncode != 0
+            return revision, dirty
+        except (OSError, subprocess.CalledProcessError):
+            return None, False
+
+    @staticmethod
+    def interpreter() -> str:
+        return f"{platform.python_implementation()} {platform.python_version()}"
+
+    # -----------------------------
+    # Writing and reading
+    # -----------------------------
+    @staticmethod
+    def append(benchmark: str, metrics: dict, params: Optional[dict] = None, path: str = STORE_FILE) -> dict:
+        """Write one record for `benchmark` and return it."""
+        revision, dirty = BenchmarkStore.git_revision()
+        record = {
+            "run_id": uuid.uuid4().hex[:12],
+            "benchmark": benchmark,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "machine": BenchmarkStore.machine_fingerprint(),
+            "revision": revision,
+            "dirty": dirty,
+            "python": BenchmarkStore.interpreter(),
+            "params": params or {},
+            "metrics": metrics,
+        }
+        # One write of one line: concurrent appenders never interleave records
+        with open(path, "a") as f:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+        return record
+
+    @staticmethod
+    def read(path: str = STORE_FILE, benchmark: Optional[str] = None) -> Iterator[dict]:
+        """Stream the records, oldest first. A torn last line (interrupted write) is skipped."""
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if benchmark is None or record.get("benchmark") == benchmark:
+                        yield record
+        except FileNotFoundError:
+            return
+
+    @staticmethod
+    def select(selector: str, path: str = STORE_FILE, benchmark: Optional[str] = None) -> list[dict]:
+        """Records whose run id or revision starts with `selector`."""
+        return [record for record in BenchmarkStore.read(path, benchmark)
+                if record["run_id"].startswith(selector) or (record.get("revision") or "").startswith(selector)]
+
+    @staticmethod
+    def import_perft_results(json_file: str, path: str = STORE_FILE) -> int:
+        """Append the runs of an old perft_results.json; returns how many."""
+        with open(json_file) as f:
+            tests = json.load(f)
+        for test in tests:
+            BenchmarkStore.append("perft", BenchmarkStore.perft_metrics(test["depths"]),
+                                  {"test_name": test["test_name"], "fen": test["fen"],
+                                   "measured": f"{test.get('date')} {test.get('time')}"}, path)
+        return len(tests)
+
+    @staticmethod
+    def perft_metrics(depths: list[dict]) -> dict:
+        """Flatten perft depth rows ({depth, nodes, time_seconds, nps}) into d<N>.<metric> keys."""
+        metrics = {}
+        for row in depths:
+            prefix = f"d{row['depth']}"
+            metrics[f"{prefix}.nodes"] = row["nodes"]
+            metrics[f"{prefix}.seconds"] = row["time_seconds"]
+            metrics[f"{prefix}.nps"] = row["nps"]
+        return metrics
+
+    # -----------------------------
+    # Comparison
+    # -----------------------------
+    @staticmethod
+    def samples(records: list[dict]) -> dict[str, list[float]]:
+        """Every sample of every metric, pooled over `records`."""
+        pooled = {}
+        for record in records:
+            for metric, value in record["metrics"].items():
+                values = value if isinstance(value, list) else [value]
+                pooled.setdefault(metric, []).extend(float(v) for v in values)
+        return pooled
+
+    @staticmethod
+    def mann_whitney_p(a: list[float], b: list[float]) -> Optional[float]:
+        """
+        Two-sided p-value that `a` and `b` come from the same distribution.
+        Exact (every split of the pooled ranks) when that is cheap, otherwise
+        the tie-corrected normal approximation. None below two samples a side.
+        """
+        n1, n2 = len(a), len(b)
+        if n1 < 2 or n2 < 2:
+            return None
+
+        pooled = sorted(a + b)
+        ranks = {}
+        i = 0
+        while i < len(pooled):
+            j = i
+            while j < len(pooled) and pooled[j] == pooled[i]:
+                j += 1
+            ranks[pooled[i]] = (i + j + 1) / 2  # average rank of a tie group
+            i = j
+        rank_sum = sum(ranks[x] for x in a)
+        u = rank_sum - n1 * (n1 + 1) / 2
+        mean_u = n1 * n2 / 2
+        observed = abs(u - mean_u)
+
+        if math.comb(n1 + n2, n1) <= EXACT_TEST_LIMIT:
+            all_ranks = [ranks[x] for x in pooled]
+            extreme = total = 0
+            for chosen in combinations(all_ranks, n1):
+                total += 1
+                extreme += abs(sum(chosen) - n1 * (n1 + 1) / 2 - mean_u) >= observed - 1e-9
+            return extreme / total
+
+        n = n1 + n2
+        ties = sum(count ** 3 - count for count in (pooled.count(value) for value in ranks))
+        variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+        if variance <= 0:
+            return 1.0
+        z = (observed - 0.5) / math.sqrt(variance)  # continuity correction
+        return math.erfc(max(z, 0) / math.sqrt(2))
+
+    @staticmethod
+    def compare(before: list[dict], after: list[dict]) -> list[MetricComparison]:
+        """One MetricComparison per metric present on both sides."""
+        before_samples = BenchmarkStore.samples(before)
+        after_samples = BenchmarkStore.samples(after)
+        rows = []
+        for metric in sorted(before_samples.keys() & after_samples.keys()):
+            a, b = before_samples[metric], after_samples[metric]
+            median_a, median_b = median(a), median(b)
+            change = (median_b - median_a) / median_a if median_a else 0.0
+            rows.append(MetricComparison(metric, median_a, median_b, change, BenchmarkStore.mann_whitney_p(a, b)))
+        return rows
+
+
+def describe(records: list[dict]) -> str:
+    first = records[0]
+    revisions = sorted({(r.get("revision") or "?")[:10] + ("+" if r.get("dirty") else "") for r in records})
+    machines = sorted({r["machine"]["id"] for r in records})
+    return (f"{len(records)} run(s) of {first['benchmark']} at {', '.join(revisions)} "
+            f"on {', '.join(machines)} ({first['python']})")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark results store")
+    parser.add_argument("--store", default=STORE_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listing = commands.add_parser("list", help="one line per stored run")
+    listing.add_argument("--benchmark")
+
+    compare = commands.add_parser("compare", help="per-metric deltas between two runs or revisions")
+    compare.add_argument("before", help="run id or git revision (prefix)")
+    compare.add_argument("after", help="run id or git revision (prefix)")
+    compare.add_argument("--benchmark")
+    compare.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="significance level")
+    compare.add_argument("--min-change", type=float, default=DEFAULT_MIN_CHANGE,
+                         help="smallest relative change reported as significant, 0.03 = 3%%")
+
+    importing = commands.add_parser("import-json", help="append the runs of an old perft_results.json")
+    importing.add_argument("json_file")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for record in BenchmarkStore.read(args.store, args.benchmark):
+            name = record["params"].get("test_name", "")
+            print(f"{record['run_id']}  {record['timestamp']}  {(record.get('revision') or '?')[:10]:<10}"
+                  f"{'+' if record.get('dirty') else ' '} {record['machine']['id']}  {record['benchmark']:<16}{name}")
+        return 0
+
+    if args.command == "import-json":
+        print(f"imported {BenchmarkStore.import_perft_results(args.json_file, args.store)} runs into {args.store}")
+        return 0
+
+    before = BenchmarkStore.select(args.before, args.store, args.benchmark)
+    after = BenchmarkStore.select(args.after, args.store, args.benchmark)
+    for label, records in (("before", before), ("after", after)):
+        if not records:
+            print(f"no runs match {getattr(args, label)!r}", file=sys.stderr)
+            return 2
+        print(f"{label:<7}{describe(records)}")
+    if {r["machine"]["id"] for r in before} != {r["machine"]["id"] for r in after}:
+        print("warning: the two sides were measured on different machines")
+
+    rows = BenchmarkStore.compare(before, after)
+    print(f"\n{'metric':<32}{'before':>14}{'after':>14}{'change':>9}{'p':>8}  verdict")
+    for row in rows:
+        p = "n/a" if row.p_value is None else f"{row.p_value:.3f}"
+        verdict = "no test" if row.p_value is None else ("significant" if row.significant(args.alpha, args.min_change) else "noise")
+        print(f"{row.metric:<32}{row.before:>14,.1f}{row.after:>14,.1f}{row.change:>+9.1%}{p:>8}  {verdict}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
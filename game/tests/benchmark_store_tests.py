@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+
+from game.tests.benchmark_store import BenchmarkStore
+
+
+class BenchmarkStoreTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_are_appended_and_streamed(self):
+        first = BenchmarkStore.append("perft", {"d1.seconds": 0.5}, {"test_name": "a"}, self.path)
+        BenchmarkStore.append("micro", {"pop_lsb.ns": [60.0, 61.0]}, path=self.path)
+        with open(self.path, "a") as f:
+            f.write('{"run_id": "torn')  # interrupted write
+
+        records = list(BenchmarkStore.read(self.path))
+        self.assertEqual([r["benchmark"] for r in records], ["perft", "micro"])
+        self.assertEqual(records[0], first)
+        for key in ("machine", "revision", "dirty", "python", "timestamp"):
+            self.assertIn(key, first)
+        self.assertEqual([r["run_id"] for r in BenchmarkStore.read(self.path, "perft")], [first["run_id"]])
+        self.assertEqual(BenchmarkStore.select(first["run_id"][:6], self.path), [first])
+        self.assertEqual(list(BenchmarkStore.read(os.path.join(self.directory.name, "missing.jsonl"))), [])
+
+    def test_mann_whitney(self):
+        # Fully separated 3 v 3: 2 of the 20 rank splits are as extreme
+        self.assertAlmostEqual(BenchmarkStore.mann_whitney_p([1, 2, 3], [4, 5, 6]), 0.1)
+        self.assertLess(BenchmarkStore.mann_whitney_p(list(range(7)), list(range(10, 17))), 0.01)
+        self.assertEqual(BenchmarkStore.mann_whitney_p([5, 5, 5], [5, 5, 5]), 1.0)
+        self.assertIsNone(BenchmarkStore.mann_whitney_p([1.0], [2.0, 3.0]))
+        # Large samples take the normal approximation
+        self.assertLess(BenchmarkStore.mann_whitney_p(list(range(30)), list(range(20, 50))), 0.001)
+        self.assertGreater(BenchmarkStore.mann_whitney_p(list(range(0, 60, 2)), list(range(1, 61, 2))), 0.5)
+
+    def test_compare_pools_runs_and_flags_only_real_changes(self):
+        before = [{"metrics": {"make_move.ns": [100, 102, 98, 101], "noisy.ns": [10, 30, 20, 25], "once": 4}}]
+        after = [{"metrics": {"make_move.ns": [80, 79], "noisy.ns": [22, 12]}},
+                 {"metrics": {"make_move.ns": [81, 82], "noisy.ns": [28, 18], "once": 2}}]
+        rows = {row.metric: row for row in BenchmarkStore.compare(before, after)}
+        self.assertAlmostEqual(rows["make_move.ns"].change, (80.5 - 100.5) / 100.5)
+        self.assertTrue(rows["make_move.ns"].significant())
+        self.assertFalse(rows["noisy.ns"].significant())
+        self.assertIsNone(rows["once"].p_value)
+        self.assertFalse(rows["make_move.ns"].significant(min_change=0.25))
+
+    def test_old_perft_results_import(self):
+        old = os.path.join(self.directory.name, "perft_results.json")
+        with open(old, "w") as f:
+            json.dump([{"test_id": 1, "test_name": "v0", "fen": "8/8/8/8/8/8/8/K1k5 w - - 0 1",
+                        "date": "2025-01-01", "time": "10:00:00",
+                        "depths": [{"depth": 1, "nodes": 3, "time_seconds": 0.01, "nps": 300}]}], f)
+        self.assertEqual(BenchmarkStore.import_perft_results(old, self.path), 1)
+        record = next(BenchmarkStore.read(self.path, "perft"))
+        self.assertEqual(record["metrics"], {"d1.nodes": 3, "d1.seconds": 0.01, "d1.nps": 300})
+        self.assertEqual(record["params"]["test_name"], "v0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import time
+
+from game.models.board import Board
+from game.move_generation.bitboard_utilities import BitBoardUtility
+from game.tests.pseudo_legal_benchmark import PERFT_SUITE, interior_positions
+
+
+def pop_lsb_squares(bitboard: int) -> list[int]:
+    """The serialisation the generators used before: one pop_lsb call per set bit."""
+    squares = []
+    while bitboard:
+        index, bitboard = BitBoardUtility.pop_lsb(bitboard)
+        squares.append(index)
+    return squares
+
+
+# name -> bitboard serialiser
+SERIALISERS = {
+    "pop_lsb": pop_lsb_squares,
+    "byte table": BitBoardUtility.squares.__wrapped__,
+    "byte table + lru": BitBoardUtility.squares,
+}
+
+
+def random_bitboards(bits: int, count: int = 2000, seed: int = 1) -> list[int]:
+    rng = random.Random(seed)
+    return [sum(1 << sq for sq in rng.sample(range(64), bits)) for _ in range(count)]
+
+
+def time_serialiser(serialise, bitboards: list[int], repeats: int = 5) -> float:
+    """Best-of-`repeats` seconds per bitboard."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for bitboard in bitboards:
+            serialise(bitboard)
+        best = min(best, time.perf_counter() - start)
+    return best / len(bitboards)
+
+
+def time_generation(serialise, boards: list[Board], repeats: int = 3) -> float:
+    """Best-of-`repeats` seconds per move generation with `serialise` behind BitBoardUtility.squares."""
+    original = BitBoardUtility.squares
+    BitBoardUtility.squares = staticmethod(serialise)
+    try:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for board in boards:
+                generator = board.move_generator
+                generator.refresh()
+                generator.generate_moves()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        BitBoardUtility.squares = original
+    return best / len(boards)
+
+
+def run_benchmark():
+    print("Serialising one bitboard (ns)")
+    print(f"{'bits':>6}" + "".join(f"{name:>18}" for name in SERIALISERS))
+    for bits in (1, 2, 4, 8, 16, 32):
+        bitboards = random_bitboards(bits)
+        timings = [time_serialiser(serialise, bitboards) for serialise in SERIALISERS.values()]
+        print(f"{bits:>6}" + "".join(f"{t * 1e9:>18.0f}" for t in timings))
+
+    print("\nMove generation per position (us)")
+    print(f"{'position':<12}" + "".join(f"{name:>18}" for name in SERIALISERS))
+    for name, fen, depth, _ in PERFT_SUITE:
+        boards = [Board(f) for f in interior_positions(fen, depth)]
+        timings = [time_generation(serialise, boards) for serialise in SERIALISERS.values()]
+        print(f"{name:<12}" + "".join(f"{t * 1e6:>18.1f}" for t in timings))
+
+
+if __name__ == "__main__":
+    run_benchmark()
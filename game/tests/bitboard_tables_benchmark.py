@@ -0,0 +1,66 @@
+import random
+import time
+import tracemalloc
+from array import array
+
+from game.move_generation.bitboard_utilities import BitBoardUtility
+
+
+def traced_bytes(build) -> tuple[int, object]:
+    """(bytes allocated and still held by the result of `build()`, the result)."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before, result
+
+
+def nested_layout(flat) -> list[list[int]]:
+    """The old 64x64 layout: a list of 64 lists of Python ints."""
+    return [[int(mask) for mask in flat[a * 64:(a + 1) * 64]] for a in range(64)]
+
+
+def time_lookups(lookup, pairs: list[tuple[int, int]], repeats: int = 7) -> float:
+    """Best-of-`repeats` seconds per lookup."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for a, b in pairs:
+            lookup(a, b)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pairs)
+
+
+def run_benchmark(count: int = 50000, seed: int = 1):
+    between = BitBoardUtility.BETWEEN_MASKS
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(64), rng.randrange(64)) for _ in range(count)]
+
+    nested_bytes, nested = traced_bytes(lambda: nested_layout(between))
+    flat_bytes, flat = traced_bytes(lambda: array("Q", between))
+    knight_list = list(BitBoardUtility.KNIGHT_ATTACKS)
+    knight_array = array("Q", knight_list)
+
+    print("BETWEEN_MASKS (64x64)")
+    print(f"{'layout':<28}{'heap bytes':>12}{'ns/lookup':>11}")
+    rows = [
+        ("nested lists [a][b]", nested_bytes, lambda a, b: nested[a][b]),
+        ("flat array('Q') [a*64+b]", flat_bytes, lambda a, b: flat[a * 64 + b]),
+        ("flat mmap view [a*64+b]", 0, lambda a, b: between[a * 64 + b]),
+    ]
+    for name, size, lookup in rows:
+        print(f"{name:<28}{size:>12}{time_lookups(lookup, pairs) * 1e9:>11.0f}")
+
+    print("\nKNIGHT_ATTACKS (64)")
+    print(f"{'layout':<28}{'heap bytes':>12}{'ns/lookup':>11}")
+    for name, table in (("list", knight_list), ("array('Q')", knight_array)):
+        size, _ = traced_bytes(lambda: [int(x) for x in knight_array] if isinstance(table, list) else array("Q", table))
+        print(f"{name:<28}{size:>12}{time_lookups(lambda a, b: table[a], pairs) * 1e9:>11.0f}")
+
+    packed = BitBoardUtility.PackedTables
+    print(f"\npacked tables: {len(packed)} words, {len(packed) * 8} bytes, {type(packed).__name__}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,47 @@
+import multiprocessing
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from game.move_generation.bitboard_utilities import BitBoardUtility
+
+# Diagonal, file, adjacent, anti-diagonal, rank and unaligned square pairs
+SAMPLE_PAIRS = [(0, 63), (4, 60), (27, 36), (7, 56), (8, 15), (1, 18)]
+
+
+def shared_lookups(pairs):
+    """Run in a worker: the masks it sees, and the shared block its tables are bound to."""
+    between = [BitBoardUtility.BETWEEN_MASKS[a * 64 + b] for a, b in pairs]
+    line = [BitBoardUtility.LINE_MASKS[a * 64 + b] for a, b in pairs]
+    blocks = [block.name for block, created in BitBoardUtility._shared_blocks if not created]
+    return between, line, blocks
+
+
+class BitBoardTablesTests(unittest.TestCase):
+
+    def test_workers_read_the_tables_from_shared_memory(self):
+        expected_between = [BitBoardUtility.BETWEEN_MASKS[a * 64 + b] for a, b in SAMPLE_PAIRS]
+        expected_line = [BitBoardUtility.LINE_MASKS[a * 64 + b] for a, b in SAMPLE_PAIRS]
+
+        name = BitBoardUtility.share_tables()
+        try:
+            # spawn: the worker starts with nothing inherited, so the tables can only come from the block
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(1, mp_context=context, initializer=BitBoardUtility.attach_shared_tables,
+                                     initargs=(name,)) as pool:
+                between, line, blocks = pool.submit(shared_lookups, SAMPLE_PAIRS).result()
+        finally:
+            BitBoardUtility.release_shared_tables()
+
+        self.assertEqual(between, expected_between)
+        self.assertEqual(line, expected_line)
+        self.assertEqual(blocks, [name])
+
+        # Released: back on the cached tables, and the block no longer exists
+        self.assertEqual(BitBoardUtility._shared_blocks, [])
+        self.assertEqual([BitBoardUtility.BETWEEN_MASKS[a * 64 + b] for a, b in SAMPLE_PAIRS], expected_between)
+        with self.assertRaises(FileNotFoundError):
+            BitBoardUtility.attach_shared_tables(name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import random
 import unittest
 
 from game.models.board import Board
+from game.models.board_state import BoardState
 
 
 class BoardStateTests(unittest.TestCase):
@@ -47,4 +49,68 @@ class BoardStateTests(unittest.TestCase):
 
         print(f"[{test_name}] ✅ All FENs passed.")
 
-
+    def assertAttacksMatchFromScratch(self, board: Board):
+        state = board.board_data
+        for piece_index in range(12):
+            expected = 0
+            pieces = state.pieces_bitboard[piece_index]
+            for sq in range(64):
+                if (pieces >> sq) & 1:
+                    expected |= BoardState.compute_piece_attacks(piece_index, sq, state.all_pieces)
+            self.assertEqual(
+                state.attacks_by_piece(piece_index), expected,
+                f"Stale attacks for piece index {piece_index} in {state.fen}"
+            )
+
+    def test_incremental_attacks_match_full_recompute(self):
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        board = Board(fen)
+        rng = random.Random(11)
+        history = []
+
+        for _ in range(6):
+            # Every child position, then back again
+            for move in board.generate_all_legal_moves():
+                _, moves_done, _ = board.make_move(move)
+                self.assertAttacksMatchFromScratch(board)
+                board.undo_move(moves_done)
+                self.assertAttacksMatchFromScratch(board)
+
+            _, moves_done, _ = board.make_move(rng.choice(board.generate_all_legal_moves()))
+            history.append(moves_done)
+
+        for moves_done in reversed(history):
+            board.undo_move(moves_done)
+            self.assertAttacksMatchFromScratch(board)
+
+    def test_attackers_to_matches_attack_sets(self):
+        board = Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        state = board.board_data
+        e1_bit = 1 << 4
+
+        for occupancy in (state.all_pieces, state.all_pieces & ~e1_bit):
+            for target in range(64):
+                expected = 0
+                for sq in range(64):
+                    piece_index = state.square_piece[sq]
+                    if piece_index >= 0 and (occupancy >> sq) & 1:
+                        if (BoardState.compute_piece_attacks(piece_index, sq, occupancy) >> target) & 1:
+                            expected |= 1 << sq
+                self.assertEqual(state.attackers_to(target, occupancy), expected, f"square {target}")
+
+        # With the king lifted, the h1 rook sees through e1 to d1
+        self.assertTrue(state.attackers_to(3, state.all_pieces & ~e1_bit) & (1 << 7))
+
+    def test_is_in_check_reads_incremental_attack_sets(self):
+        board = Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        rng = random.Random(23)
+        for _ in range(60):
+            state = board.board_data
+            for color, color_id in (("white", 0), ("black", 1)):
+                king_sq = state.pieces_bitboard[5 + 6 * color_id].bit_length() - 1
+                expected = state.attackers_to(king_sq) & state.color_pieces[1 - color_id] != 0
+                self.assertEqual(board.is_in_check(color), expected, state.fen)
+            moves = board.generate_all_legal_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
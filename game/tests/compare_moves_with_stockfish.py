@@ -1,8 +1,9 @@
 import time
-import json
-from datetime import datetime
 from game.models.board import Board
-import chess
+from game.tests.benchmark_store import STORE_FILE, BenchmarkStore
+from game.startup import Startup
+
+chess = Startup.lazy_import("chess")
 
 TEST_NAME = "Initial Version - depth comparison with Stockfish"
 SAVE_TEST = False
@@ -57,27 +58,13 @@ def perft(board: Board, depth: int, turn: str, callback=None, compare_with_stock
 def visualize_perft(initial_fen: str, max_depth: int = 4,
                     compare_stockfish_depth: int = 2,
                     test_name: str = "DefaultTest",
-                    file_name: str = "perft_results.json",
+                    store_file: str = STORE_FILE,
                     save_file: bool = False):
 
-    try:
-        with open(file_name, "r") as f:
-            all_results = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        all_results = []
-
-    test_id = max([item.get("test_id", 0) for item in all_results], default=0) + 1
     board = Board(initial_fen)
     turn = "white" if board.board_data.is_whites_turn else "black"
 
-    results = {
-        "test_id": test_id,
-        "test_name": test_name,
-        "fen": initial_fen,
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "time": datetime.now().strftime("%H:%M:%S"),
-        "depths": []
-    }
+    depths = []
 
     for d in range(1, max_depth + 1):
         update_every = 20000 if d == 4 else UPDATE_EVERY
@@ -105,7 +92,7 @@ def visualize_perft(initial_fen: str, max_depth: int = 4,
 
         print(f"\rDepth {d}: {total_nodes:,} nodes | Time: {elapsed:.4f}s | NPS: {nps:,.0f} nodes/sec{status}")
 
-        results["depths"].append({
+        depths.append({
             "depth": d,
             "nodes": total_nodes,
             "expected": expected,
@@ -114,12 +101,10 @@ def visualize_perft(initial_fen: str, max_depth: int = 4,
             "nps": int(nps)
         })
 
-    all_results.append(results)
     if save_file:
-        with open(file_name, "w") as f:
-            json.dump(all_results, f, indent=4)
-
-    print(f"\nResults saved to {file_name} (test_id={test_id})")
+        record = BenchmarkStore.append("perft", BenchmarkStore.perft_metrics(depths),
+                                       {"test_name": test_name, "fen": initial_fen}, store_file)
+        print(f"\nResults appended to {store_file} (run_id={record['run_id']})")
 
 
 if __name__ == "__main__":
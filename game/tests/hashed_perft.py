@@ -0,0 +1,121 @@
+"""
+Perft with a transposition table: (position key, depth) -> node count.
+
+The table has a fixed power-of-two number of slots. A key is hashed straight
+to one slot, and a new entry only replaces the stored one when it is at
+least as deep, since deeper subtrees are the expensive ones to recount.
+
+Keys are Python's 64-bit hash of the piece bitboards, side to move,
+castling rights and en passant square, so two positions can in principle
+share a key. The suite check below is what makes sure that does not
+change any count.
+
+The bitboards go into the hash as 32-bit halves: CPython hashes an int
+modulo 2**61 - 1, so whole bitboards would make a piece on g8 (2**62) and
+one on b1 (2**1) hash the same.
+
+    python -m game.tests.hashed_perft [--bits 20] [--budget 5]
+
+runs every suite position uncached and hashed at the same depths, checks the
+counts against each other and the EPD, and prints hit rate and speedup.
+"""
+import time
+
+from game.models.board import Board
+from game.models.board_state import BoardState
+from game.tests.perft_suite import DEFAULT_BUDGET, PerftSuite, serial_perft
+
+DEFAULT_TABLE_BITS = 20
+
+
+class PerftTable:
+
+    def __init__(self, bits: int = DEFAULT_TABLE_BITS):
+        size = 1 << bits
+        self.mask = size - 1
+        self.keys = [None] * size
+        self.depths = [0] * size
+        self.counts = [0] * size
+        self.probes = 0
+        self.hits = 0
+
+    @staticmethod
+    def position_key(state: BoardState) -> int:
+        rights = state.castling_rights
+        halves = [half for bitboard in state.pieces_bitboard for half in (bitboard & 0xFFFFFFFF, bitboard >> 32)]
+        return hash((
+            *halves, state.is_whites_turn, state.en_passant_target,
+            rights["white"]["K"], rights["white"]["Q"], rights["black"]["K"], rights["black"]["Q"],
+        ))
+
+    def probe(self, key: int, depth: int) -> int | None:
+        self.probes += 1
+        slot = key & self.mask
+        if self.keys[slot] == key and self.depths[slot] == depth:
+            self.hits += 1
+            return self.counts[slot]
+        return None
+
+    def store(self, key: int, depth: int, count: int):
+        slot = key & self.mask
+        # Depth-preferred: keep the entry that saves the most work on a hit
+        if depth >= self.depths[slot]:
+            self.keys[slot] = key
+            self.depths[slot] = depth
+            self.counts[slot] = count
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+
+def hashed_perft(board: Board, depth: int, table: PerftTable) -> int:
+    if depth == 0:
+        return 1
+    if depth == 1:
+        return board.count_legal_moves()  # cheaper than a probe
+
+    key = PerftTable.position_key(board.board_data)
+    cached = table.probe(key, depth)
+    if cached is not None:
+        return cached
+
+    total = 0
+    moves = board.generate_move_buffer()
+    for i in range(moves.count):
+        _, moves_done, _ = board.make_move(moves.move(i))
+        total += hashed_perft(board, depth - 1, table)
+        board.undo_move(moves_done)
+
+    table.store(key, depth, total)
+    return total
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hashed perft against the uncached suite")
+    parser.add_argument("--bits", type=int, default=DEFAULT_TABLE_BITS, help="table size is 2**bits slots")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="uncached seconds per position")
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'position':<24}{'depth':>6}{'nodes':>12}{'plain s':>9}{'hashed s':>10}{'speedup':>9}{'hit rate':>10}")
+    for position in PerftSuite.load_epd():
+        # The budget picks the depth from the uncached run; the hashed run repeats it
+        runs = PerftSuite.run_position(position, args.budget, serial_perft)
+        deepest = runs[-1]
+        table = PerftTable(args.bits)
+        start = time.perf_counter()
+        nodes = hashed_perft(Board(position.fen), deepest.depth, table)
+        seconds = time.perf_counter() - start
+
+        ok = nodes == deepest.nodes == deepest.expected
+        failures += not ok
+        print(f"{position.name:<24}{deepest.depth:>6}{nodes:>12,}{deepest.seconds:>9.2f}{seconds:>10.2f}"
+              f"{deepest.seconds / seconds:>9.2f}{table.hit_rate:>10.1%}{'' if ok else '  MISMATCH'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
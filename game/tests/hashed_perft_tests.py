@@ -0,0 +1,41 @@
+import unittest
+
+from game.models.board import Board
+from game.tests.hashed_perft import PerftTable, hashed_perft
+from game.tests.perft_suite import PerftSuite
+
+
+class HashedPerftTests(unittest.TestCase):
+
+    def test_counts_match_the_suite_with_a_tiny_table(self):
+        # 256 slots: constant replacement, and still no count may change
+        for position in PerftSuite.load_epd():
+            depth = 3 if position.expected[3] < 30000 else 2
+            table = PerftTable(bits=8)
+            self.assertEqual(hashed_perft(Board(position.fen), depth, table), position.expected[depth], position.name)
+
+    def test_transpositions_hit(self):
+        # Leaves are counted, not stored, so the transpositions have to come above depth 1
+        table = PerftTable(bits=16)
+        self.assertEqual(hashed_perft(Board("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"), 5, table), 674624)
+        self.assertGreater(table.hits, 0)
+
+    def test_high_squares_do_not_alias_low_ones(self):
+        # 2**62 == 2 modulo 2**61 - 1: a queen on g8 and on b1 must still get different keys
+        g8 = Board("r3k1qr/1b4b1/8/8/8/8/8/R3K1BR w KQkq - 2 2").board_data
+        b1 = Board("r3k2r/1b4b1/8/8/8/8/8/Rq2K1BR w KQkq - 2 2").board_data
+        self.assertNotEqual(PerftTable.position_key(g8), PerftTable.position_key(b1))
+
+    def test_deeper_entries_are_kept(self):
+        table = PerftTable(bits=4)
+        table.store(0x10, 3, 500)
+        table.store(0x20, 1, 7)  # same slot, shallower: ignored
+        self.assertIsNone(table.probe(0x20, 1))
+        self.assertEqual(table.probe(0x10, 3), 500)
+        table.store(0x20, 4, 9000)
+        self.assertEqual(table.probe(0x20, 4), 9000)
+        self.assertIsNone(table.probe(0x10, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -113,7 +113,7 @@ class IllegalTests(unittest.TestCase):
 
         # Expected legal moves
         expected_moves = sorted([
-            "h2e2",
+            "h2d2",  # the only rook move that blocks the d-file check
             "d1c1", "d1c2",
             "d1e1", "d1e2",
         ])
@@ -138,6 +138,20 @@ class IllegalTests(unittest.TestCase):
             )
         )
 
+    def test_en_passant_illegal_when_it_exposes_king_on_rank(self):
+        """
+        Both pawns leave the fifth rank on b5xc6, opening it for the h5 rook.
+        FEN: 8/8/8/KPp4r/8/8/8/7k w - c6 0 1
+        """
+        fen = "8/8/8/KPp4r/8/8/8/7k w - c6 0 1"
+        board = Board(fen)
+
+        self.assertMoveNotGenerated(
+            board.generate_all_legal_moves(),
+            "b5c6",
+            "En passant removed both pawns from the rank and left the king in check."
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
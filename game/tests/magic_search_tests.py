@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from game.move_generation.magic.magic_helper import MagicHelper
+from game.move_generation.magic.magic_search import MagicSearch
+from game.move_generation.magic.precomputed_magic import PrecomputedMagics
+
+
+class MagicSearchTests(unittest.TestCase):
+
+    def test_shipped_magics_are_valid(self):
+        for rook, magics, shifts in ((True, PrecomputedMagics.RookMagics, PrecomputedMagics.RookShifts),
+                                     (False, PrecomputedMagics.BishopMagics, PrecomputedMagics.BishopShifts)):
+            for square in (0, 27, 63):
+                _, patterns, attacks = MagicSearch.square_patterns(square, rook)
+                self.assertTrue(MagicSearch.is_valid(magics[square], shifts[square], patterns, attacks), (rook, square))
+
+    def test_colliding_magic_is_rejected(self):
+        _, patterns, attacks = MagicSearch.square_patterns(0, rook=True)
+        # Multiplying by 1 keeps only the (empty) top bits: every pattern lands on index 0
+        self.assertFalse(MagicSearch.is_valid(1, PrecomputedMagics.RookShifts[0], patterns, attacks))
+
+    def test_find_magic_with_a_fixed_seed(self):
+        mask, patterns, attacks = MagicSearch.square_patterns(18, rook=False)
+        bits = bin(mask).count("1")
+        first = MagicSearch.find_magic(mask, patterns, attacks, bits, random.Random(3), 100000)
+        again = MagicSearch.find_magic(mask, patterns, attacks, bits, random.Random(3), 100000)
+        self.assertIsNotNone(first)
+        self.assertEqual(first, again)
+        self.assertTrue(MagicSearch.is_valid(first, 64 - bits, patterns, attacks))
+
+    def test_render_round_trips(self):
+        source = MagicSearch.render(PrecomputedMagics.RookMagics, PrecomputedMagics.RookShifts,
+                                    PrecomputedMagics.BishopMagics, PrecomputedMagics.BishopShifts)
+        namespace = {}
+        exec(source, namespace)
+        rendered = namespace["PrecomputedMagics"]
+        for name in ("RookMagics", "RookShifts", "BishopMagics", "BishopShifts"):
+            self.assertEqual(getattr(rendered, name), getattr(PrecomputedMagics, name), name)
+
+    def test_random_occupancies_are_reproducible(self):
+        samples = MagicHelper.random_occupancies(200, seed=9)
+        self.assertEqual(samples, MagicHelper.random_occupancies(200, seed=9))
+        self.assertTrue(all(0 <= square < 64 and 0 <= occupancy < 1 << 64 for square, occupancy in samples))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+"""
+Microbenchmarks for the hot board and bitboard primitives, one at a time.
+
+Every primitive runs on the same fixed positions (FIXTURES). A benchmark is
+warmed up first, then timed `--repeats` times; each sample runs the call in a
+loop long enough (at least MIN_SAMPLE_SECONDS) for the clock to be accurate,
+and is reported per operation. The table shows the median and the
+interquartile range of those samples, so a change can be judged against the
+noise of the primitive itself.
+
+    python -m game.tests.microbenchmarks [--only make_undo to_fen] [--repeats 9]
+                                         [--json results.json] [--store]
+
+`--json` writes every sample; `--store` appends them to the benchmark store,
+where `benchmark_store compare` tests two runs against each other.
+"""
+import json
+import time
+from statistics import median, quantiles
+from typing import Callable, NamedTuple
+
+from ai_engine.versions.v3_pruning_move_ordering import PruningMoveOrdering
+from game.models.board import Board
+from game.move_generation.bitboard_utilities import BitBoardUtility
+from game.move_generation.magic.magic import Magic
+from game.move_generation.move_generator import MoveGenerator
+from game.move_generation.slider_attacks import SliderAttacks
+from game.tests.benchmark_store import BenchmarkStore
+
+FIXTURES = {
+    "startpos": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "kiwipete": "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "endgame": "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+}
+
+DEFAULT_REPEATS = 7
+DEFAULT_WARMUP = 0.05  # seconds
+MIN_SAMPLE_SECONDS = 0.02
+
+
+class Workload(NamedTuple):
+    call: Callable[[], object]
+    operations: int  # primitive calls made by one `call`
+
+
+# -----------------------------
+# Primitives: board -> workload
+# -----------------------------
+def pop_lsb_workload(board: Board) -> Workload:
+    occupancy = board.board_data.all_pieces
+    pop_lsb = BitBoardUtility.pop_lsb
+
+    def drain():
+        bitboard = occupancy
+        while bitboard:
+            _, bitboard = pop_lsb(bitboard)
+
+    return Workload(drain, BitBoardUtility.count_bits(occupancy))
+
+
+def magic_rook_workload(board: Board) -> Workload:
+    occupancy = board.board_data.all_pieces
+    lookup = Magic.get_rook_attacks
+    return Workload(lambda: [lookup(sq, occupancy) for sq in range(64)], 64)
+
+
+def slider_rook_workload(board: Board) -> Workload:
+    occupancy = board.board_data.all_pieces
+    lookup = SliderAttacks.get_rook_attacks
+    return Workload(lambda: [lookup(sq, occupancy) for sq in range(64)], 64)
+
+
+def make_undo_workload(board: Board) -> Workload:
+    moves = board.generate_all_legal_moves()
+
+    def make_undo_all():
+        for move in moves:
+            _, moves_done, _ = board.make_move(move)
+            board.undo_move(moves_done)
+
+    return Workload(make_undo_all, len(moves))
+
+
+def to_fen_workload(board: Board) -> Workload:
+    return Workload(board.to_fen, 1)
+
+
+def parse_fen_workload(board: Board) -> Workload:
+    fen = board.to_fen()
+    return Workload(lambda: board.parse_fen(fen), 1)
+
+
+def generator_init_workload(board: Board) -> Workload:
+    return Workload(lambda: MoveGenerator(board), 1)
+
+
+def pin_rays_workload(board: Board) -> Workload:
+    generator = MoveGenerator(board)
+    return Workload(generator.compute_pin_rays, 1)
+
+
+def evaluate_workload(board: Board) -> Workload:
+    # v1 and v2 evaluate through the old piece dictionary, which Board no longer has
+    engine = PruningMoveOrdering("white" if board.board_data.is_whites_turn else "black", "bench")
+    return Workload(lambda: engine.evaluate_board(board), 1)
+
+
+PRIMITIVES = {
+    "pop_lsb": pop_lsb_workload,
+    "magic_rook": magic_rook_workload,
+    "slider_rook": slider_rook_workload,
+    "make_undo": make_undo_workload,
+    "to_fen": to_fen_workload,
+    "parse_fen": parse_fen_workload,
+    "generator_init": generator_init_workload,
+    "compute_pin_rays": pin_rays_workload,
+    "evaluate_board": evaluate_workload,
+}
+
+
+class Measurement(NamedTuple):
+    name: str
+    samples: list[float]  # ns per operation
+
+    @property
+    def median(self) -> float:
+        return median(self.samples)
+
+    @property
+    def iqr(self) -> float:
+        if len(self.samples) < 2:
+            return 0.0
+        q1, _, q3 = quantiles(self.samples, n=4)
+        return q3 - q1
+
+
+class Microbenchmarks:
+
+    @staticmethod
+    def loops_for(call: Callable[[], object], min_seconds: float) -> int:
+        """Smallest power of two of calls that takes at least `min_seconds` (like timeit.autorange)."""
+        loops = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(loops):
+                call()
+            if time.perf_counter() - start >= min_seconds:
+                return loops
+            loops *= 2
+
+    @staticmethod
+    def measure(name: str, workload: Workload, repeats: int = DEFAULT_REPEATS, warmup: float = DEFAULT_WARMUP,
+                min_sample_seconds: float = MIN_SAMPLE_SECONDS) -> Measurement:
+        call = workload.call
+        # Warmup: caches, lazily built tables and the allocator settle first
+        deadline = time.perf_counter() + warmup
+        while time.perf_counter() < deadline:
+            call()
+
+        loops = Microbenchmarks.loops_for(call, min_sample_seconds)
+        operations = loops * max(workload.operations, 1)
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(loops):
+                call()
+            samples.append((time.perf_counter() - start) / operations * 1e9)
+        return Measurement(name, samples)
+
+    @staticmethod
+    def run(primitives: list[str], fixtures: dict[str, str] = FIXTURES, **options) -> list[Measurement]:
+        """One Measurement per primitive and fixture, named "<primitive>[<fixture>]"."""
+        results = []
+        for primitive in primitives:
+            for fixture, fen in fixtures.items():
+                workload = PRIMITIVES[primitive](Board(fen))
+                results.append(Microbenchmarks.measure(f"{primitive}[{fixture}]", workload, **options))
+        return results
+
+    @staticmethod
+    def to_json(results: list[Measurement]) -> dict:
+        return {
+            result.name: {"median_ns": result.median, "iqr_ns": result.iqr, "samples_ns": result.samples}
+            for result in results
+        }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Microbenchmarks for board and bitboard primitives")
+    parser.add_argument("--only", nargs="*", choices=sorted(PRIMITIVES), help="primitives to run")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="timed samples per benchmark")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP, help="untimed seconds before sampling")
+    parser.add_argument("--json", help="write every sample to this file")
+    parser.add_argument("--store", action="store_true", help="append the samples to the benchmark store")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'benchmark':<32}{'median ns':>12}{'IQR ns':>10}{'IQR %':>8}")
+    for primitive in args.only or list(PRIMITIVES):
+        for result in Microbenchmarks.run([primitive], repeats=args.repeats, warmup=args.warmup):
+            results.append(result)
+            spread = result.iqr / result.median if result.median else 0.0
+            print(f"{result.name:<32}{result.median:>12,.0f}{result.iqr:>10,.0f}{spread:>8.1%}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(Microbenchmarks.to_json(results), f, indent=4)
+            f.write("\n")
+        print(f"\nsamples written to {args.json}")
+    if args.store:
+        record = BenchmarkStore.append("microbenchmarks", {f"{r.name}.ns": r.samples for r in results},
+                                       {"repeats": args.repeats, "warmup": args.warmup, "fixtures": FIXTURES})
+        print(f"appended to the benchmark store (run_id={record['run_id']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
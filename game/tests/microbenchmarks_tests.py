@@ -0,0 +1,32 @@
+import unittest
+
+from game.models.board import Board
+from game.tests.microbenchmarks import FIXTURES, PRIMITIVES, Measurement, Microbenchmarks, Workload
+
+
+class MicrobenchmarksTests(unittest.TestCase):
+
+    def test_every_primitive_runs_on_every_fixture_and_leaves_it_unchanged(self):
+        for fixture, fen in FIXTURES.items():
+            for primitive, make_workload in PRIMITIVES.items():
+                board = Board(fen)
+                workload = make_workload(board)
+                workload.call()
+                self.assertGreater(workload.operations, 0, primitive)
+                self.assertEqual(board.to_fen(), Board(fen).to_fen(), f"{primitive}[{fixture}]")
+
+    def test_samples_and_summary(self):
+        result = Microbenchmarks.measure("noop", Workload(lambda: None, 10), repeats=5, warmup=0,
+                                         min_sample_seconds=0.001)
+        self.assertEqual(len(result.samples), 5)
+        self.assertTrue(all(sample > 0 for sample in result.samples))
+
+        fixed = Measurement("fixed", [1.0, 2.0, 3.0, 4.0, 100.0])
+        self.assertEqual(fixed.median, 3.0)
+        self.assertEqual(fixed.iqr, 52.0 - 1.5)  # exclusive quartiles: 1.5 and 52
+        summary = Microbenchmarks.to_json([fixed])["fixed"]
+        self.assertEqual((summary["median_ns"], summary["samples_ns"]), (3.0, fixed.samples))
+
+
+if __name__ == "__main__":
+    unittest.main()
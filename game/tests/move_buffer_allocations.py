@@ -0,0 +1,79 @@
+import sys
+import time
+import tracemalloc
+
+from game.models.board import Board
+
+FEN = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+DEPTH = 3
+
+
+def generate_list(board: Board):
+    moves = board.generate_all_legal_moves()
+    return len(moves), moves.__getitem__
+
+
+def generate_buffer(board: Board):
+    buffer = board.generate_move_buffer()
+    return buffer.count, buffer.move
+
+
+MODES = {"list": generate_list, "buffer": generate_buffer}
+
+
+def measured_perft(board: Board, depth: int, generate, stats: dict) -> int:
+    """Perft that records the memory traced while generating moves at every node."""
+    if depth == 0:
+        return 1
+
+    # Position data (attack maps, pins) is not what is being measured
+    board.move_generator.ensure_up_to_date()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    count, move_at = generate(board)
+    after, peak = tracemalloc.get_traced_memory()
+
+    stats["nodes"] += 1
+    stats["transient"] += peak - before
+    stats["retained"] += after - before
+
+    total = 0
+    for i in range(count):
+        _, moves_done, _ = board.make_move(move_at(i))
+        total += measured_perft(board, depth - 1, generate, stats)
+        board.undo_move(moves_done)
+    return total
+
+
+def run(mode: str, depth: int = DEPTH) -> dict:
+    generate = MODES[mode]
+    board = Board(FEN)
+    # Warm-up pass: tables, per-ply buffers and decoded moves are created once
+    measured_perft(board, depth, generate, {"nodes": 0, "transient": 0, "retained": 0})
+
+    stats = {"nodes": 0, "transient": 0, "retained": 0}
+    tracemalloc.start()
+    start = time.perf_counter()
+    stats["perft"] = measured_perft(board, depth, generate, stats)
+    stats["seconds"] = time.perf_counter() - start
+    stats["peak"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return stats
+
+
+def main(depth: int = DEPTH):
+    print(f"perft({depth}) of {FEN}")
+    print(f"{'mode':<8}{'nodes':>8}{'bytes/gen peak':>16}{'bytes/gen kept':>16}{'run peak KiB':>14}{'time (s)':>10}")
+    for mode in MODES:
+        stats = run(mode, depth)
+        print(
+            f"{mode:<8}{stats['nodes']:>8}"
+            f"{stats['transient'] / stats['nodes']:>16.0f}"
+            f"{stats['retained'] / stats['nodes']:>16.0f}"
+            f"{stats['peak'] / 1024:>14.1f}"
+            f"{stats['seconds']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEPTH)
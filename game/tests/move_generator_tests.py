@@ -0,0 +1,197 @@
+import random
+import unittest
+
+from game.models.board import Board
+from game.move_generation.bitboard_utilities import BitBoardUtility
+from game.move_generation.move_generator import MoveGenerator
+
+
+def uci_set(moves):
+    return sorted(m.to_uci() for m in moves)
+
+
+def mirror_fen(fen):
+    """The same position with colours swapped and the board flipped vertically."""
+    placement, side, castling, ep, *counters = fen.split()
+    placement = "/".join(reversed(placement.swapcase().split("/")))
+    side = "b" if side == "w" else "w"
+    castling = "".join(sorted(castling.swapcase())) if castling != "-" else "-"
+    ep = ep[0] + ("6" if ep[1] == "3" else "3") if ep != "-" else "-"
+    return " ".join([placement, side, castling, ep, *counters])
+
+
+def mirror_uci(uci):
+    flip = {str(rank): str(9 - rank) for rank in range(1, 9)}
+    return "".join(flip.get(c, c) for c in uci)
+
+
+class PersistentMoveGeneratorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+    def test_board_generator_matches_fresh_generator_along_a_line(self):
+        board = Board(self.fen)
+        rng = random.Random(3)
+        history = []
+
+        for _ in range(8):
+            moves = board.generate_all_legal_moves()
+            self.assertEqual(uci_set(moves), uci_set(MoveGenerator(board).generate_all_moves()), board.board_data.fen)
+            if not moves:
+                break
+            _, moves_done, _ = board.make_move(rng.choice(moves))
+            history.append((board.board_data.fen, moves_done))
+
+        # Walking back, every position restores its saved data instead of recomputing
+        for _, moves_done in reversed(history):
+            board.undo_move(moves_done)
+            self.assertTrue(board.move_generator.up_to_date)
+            self.assertEqual(uci_set(board.generate_all_legal_moves()), uci_set(MoveGenerator(board).generate_all_moves()))
+
+        self.assertEqual(board.move_generator.ply_stack, [])
+        self.assertEqual(board.board_data.fen, Board(self.fen).board_data.fen)
+
+    def test_make_move_invalidates_cached_moves(self):
+        board = Board(self.fen)
+        first = board.generate_all_legal_moves()
+        board.make_move(first[0])
+
+        self.assertFalse(board.move_generator.up_to_date)
+        self.assertEqual(uci_set(board.generate_all_legal_moves()), uci_set(MoveGenerator(board).generate_all_moves()))
+
+    def test_move_buffers_are_reused_per_ply(self):
+        board = Board(self.fen)
+        root = board.generate_move_buffer()
+        root_moves = uci_set(root.to_list())
+
+        child_buffers = set()
+        for i in range(root.count):
+            _, moves_done, _ = board.make_move(root.move(i))
+            child_buffers.add(id(board.generate_move_buffer()))
+            board.undo_move(moves_done)
+
+        # Every child wrote into the same ply-1 buffer and left the root's intact
+        self.assertEqual(len(child_buffers), 1)
+        self.assertNotIn(id(root), child_buffers)
+        self.assertIs(board.generate_move_buffer(), root)
+        self.assertEqual(uci_set(root.to_list()), root_moves)
+
+    def test_pseudo_legal_mode_with_is_legal_matches_legal_mode(self):
+        fens = [
+            self.fen,
+            "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+            "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+            "8/8/8/KPp4r/8/8/8/7k w - c6 0 1",
+            "k7/3q4/8/8/8/8/7R/3K4 w - - 0 1",
+        ]
+        for fen in fens:
+            board = Board(fen)
+            rng = random.Random(5)
+            for _ in range(6):
+                legal = board.generate_all_legal_moves()
+                pseudo_generator = MoveGenerator(board, pseudo_legal=True)
+                pseudo = pseudo_generator.generate_all_moves()
+                self.assertTrue(set(uci_set(legal)) <= set(uci_set(pseudo)), board.board_data.fen)
+                self.assertEqual(
+                    uci_set(legal), uci_set(m for m in pseudo if pseudo_generator.is_legal(m)), board.board_data.fen
+                )
+                if not legal:
+                    break
+                board.make_move(rng.choice(legal))
+
+    def test_board_filters_pseudo_legal_generation(self):
+        # Checkmated, stalemated, and a position with pins and en passant
+        fens = [
+            "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3",
+            "k7/8/1Q6/8/8/8/8/7K b - - 0 1",
+            "8/8/8/KPp4r/8/8/8/7k w - c6 0 1",
+        ]
+        for fen in fens:
+            legal = Board(fen)
+            pseudo = Board(fen)
+            pseudo.move_generator.set_pseudo_legal(True)
+            self.assertEqual(uci_set(pseudo.generate_all_legal_moves()), uci_set(legal.generate_all_legal_moves()), fen)
+            self.assertEqual(pseudo.has_legal_move(), legal.has_legal_move(), fen)
+
+    def test_xray_pins_match_slider_by_slider_scan(self):
+        # Two pins, a slider behind an enemy blocker and one behind two friendly pieces
+        fens = [
+            "4k3/8/8/q7/8/2B5/8/r2NK2r w - - 0 1",
+            "4k3/4r3/8/4n3/8/4B3/4N3/b3K3 w - - 0 1",
+            "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        ]
+        for fen in fens:
+            board = Board(fen)
+            generator = MoveGenerator(board)
+            state = board.board_data
+            king_sq = state.pieces_bitboard[5].bit_length() - 1
+            expected = {}
+            for slider_sq in range(64):
+                piece_index = state.square_piece[slider_sq]
+                if piece_index not in (8, 9, 10):
+                    continue
+                line = BitBoardUtility.LINE_MASKS[king_sq * 64 + slider_sq]
+                rook_line = king_sq % 8 == slider_sq % 8 or king_sq // 8 == slider_sq // 8
+                if not line or (piece_index == 8 and rook_line) or (piece_index == 9 and not rook_line):
+                    continue
+                blockers = BitBoardUtility.BETWEEN_MASKS[king_sq * 64 + slider_sq] & state.all_pieces
+                if BitBoardUtility.count_bits(blockers) == 1 and blockers & state.color_pieces[0]:
+                    expected[blockers.bit_length() - 1] = line
+            self.assertEqual(expected, generator.pin_mask, fen)
+
+    def test_single_pass_attack_map_matches_board_state_attacks(self):
+        board = Board("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1")
+        rng = random.Random(11)
+        for _ in range(30):
+            state = board.board_data
+            generator = MoveGenerator(board)
+            for color, color_id in (("white", 0), ("black", 1)):
+                attack_map, sliding_map = generator.generate_enemy_attack_map(color)
+                sliders = [state.attacks_by_piece(6 * color_id + offset) for offset in (2, 3, 4)]
+                self.assertEqual(state.attacks_by_side(color_id), attack_map, state.fen)
+                self.assertEqual(sliders[0] | sliders[1] | sliders[2], sliding_map, state.fen)
+            moves = board.generate_all_legal_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+
+    def test_black_moves_mirror_white_moves(self):
+        board = Board(self.fen)
+        rng = random.Random(17)
+        for _ in range(40):
+            fen = board.board_data.fen
+            mirrored = Board(mirror_fen(fen))
+            moves = board.generate_all_legal_moves()
+            self.assertEqual(uci_set(moves), sorted(mirror_uci(m) for m in uci_set(mirrored.generate_all_legal_moves())), fen)
+            self.assertEqual(
+                BitBoardUtility.mirror_pieces(board.board_data.pieces_bitboard), mirrored.board_data.pieces_bitboard, fen
+            )
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+
+    def test_count_moves_matches_generated_moves(self):
+        # Pins, en passant discoveries, promotions, castling and double check
+        fens = [
+            self.fen,
+            "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1",
+            "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1",
+            "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+            "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1",
+            "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1",
+        ]
+        for fen in fens:
+            board = Board(fen)
+            rng = random.Random(5)
+            for _ in range(30):
+                count = board.count_legal_moves()
+                moves = board.generate_all_legal_moves()
+                self.assertEqual(count, len(moves), board.board_data.fen)
+                if not moves:
+                    break
+                board.make_move(rng.choice(moves))
+
+
+if __name__ == "__main__":
+    unittest.main()
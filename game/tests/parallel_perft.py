@@ -0,0 +1,114 @@
+"""
+Perft split across worker processes.
+
+The tree is expanded `split_depth` plies in the parent (1 = one task per root
+move, 2 = one per root reply, which balances far better since root moves
+differ a lot in subtree size). Each task is handed to a worker as a FEN and
+the remaining depth, and the worker sends back one count. Workers map the
+parent's attack tables from shared memory instead of building their own.
+
+    python -m game.tests.parallel_perft [--fen FEN] [--depth 4] [--workers N] [--split-depth 2]
+
+prints the serial time, then the time and scaling efficiency for 1..N
+workers, and checks every total against the serial one.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.models.board import Board
+from game.move_generation.bitboard_utilities import BitBoardUtility
+from game.tests.GenerateMovesTests import perft
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def count_subtree(task: tuple[str, int]) -> int:
+    """Worker entry point: nodes below (fen, depth)."""
+    fen, depth = task
+    return perft(Board(fen), depth, "white")
+
+
+class ParallelPerft:
+
+    @staticmethod
+    def split(fen: str, depth: int, split_depth: int) -> tuple[list[tuple[str, int]], int]:
+        """
+        (tasks, nodes already counted) for expanding `split_depth` plies of
+        `fen`. Branches that end (mate, stalemate) before the split depth have
+        no nodes at `depth` and produce no task. Depth 1 is counted directly.
+        """
+        split_depth = max(1, min(split_depth, depth - 1))
+        board = Board(fen)
+        tasks = []
+
+        def expand(remaining_split: int):
+            if remaining_split == 0:
+                tasks.append((board.board_data.fen, depth - split_depth))
+                return
+            for move in board.generate_all_legal_moves():
+                _, moves_done, _ = board.make_move(move)
+                expand(remaining_split - 1)
+                board.undo_move(moves_done)
+
+        if depth <= 1:
+            return [], perft(board, depth, "white")
+        expand(split_depth)
+        return tasks, 0
+
+    @staticmethod
+    def run(fen: str, depth: int, workers: int, split_depth: int = 2) -> int:
+        tasks, counted = ParallelPerft.split(fen, depth, split_depth)
+        if not tasks:
+            return counted
+
+        name = BitBoardUtility.share_tables()
+        try:
+            with ProcessPoolExecutor(workers, initializer=BitBoardUtility.attach_shared_tables,
+                                     initargs=(name,)) as pool:
+                # Small chunks: subtree sizes vary by orders of magnitude
+                chunksize = max(1, len(tasks) // (workers * 8))
+                return counted + sum(pool.map(count_subtree, tasks, chunksize=chunksize))
+        finally:
+            BitBoardUtility.release_shared_tables()
+
+    @staticmethod
+    def scaling(fen: str, depth: int, max_workers: int, split_depth: int = 2) -> list[tuple[int, int, float]]:
+        """(workers, total, seconds) for 1..max_workers processes."""
+        rows = []
+        for workers in range(1, max_workers + 1):
+            start = time.perf_counter()
+            total = ParallelPerft.run(fen, depth, workers, split_depth)
+            rows.append((workers, total, time.perf_counter() - start))
+        return rows
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Multi-process perft with a scaling report")
+    parser.add_argument("--fen", default=START_FEN)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--split-depth", type=int, default=2)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    serial = perft(Board(args.fen), args.depth, "white")
+    serial_time = time.perf_counter() - start
+    print(f"serial      {serial:>12,} nodes {serial_time:>8.2f} s")
+
+    mismatches = 0
+    base_time = None
+    print(f"{'workers':<8}{'nodes':>16}{'seconds':>10}{'speedup':>9}{'efficiency':>12}")
+    for workers, total, seconds in ParallelPerft.scaling(args.fen, args.depth, args.workers, args.split_depth):
+        base_time = base_time or seconds
+        speedup = base_time / seconds
+        flag = "" if total == serial else "  MISMATCH"
+        mismatches += total != serial
+        print(f"{workers:<8}{total:>16,}{seconds:>10.2f}{speedup:>9.2f}{speedup / workers:>12.0%}{flag}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
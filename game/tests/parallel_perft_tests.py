@@ -0,0 +1,29 @@
+import unittest
+
+from game.models.board import Board
+from game.tests.GenerateMovesTests import perft
+from game.tests.parallel_perft import ParallelPerft
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+# White to move can mate at once (Rd8#), so a branch ends before the split depth
+BACK_RANK = "6k1/5ppp/8/8/8/8/8/3R2K1 w - - 0 1"
+
+
+class ParallelPerftTests(unittest.TestCase):
+
+    def test_totals_match_serial_perft(self):
+        for fen, depth in ((KIWIPETE, 3), (BACK_RANK, 3)):
+            serial = perft(Board(fen), depth, "white")
+            for split_depth in (1, 2):
+                self.assertEqual(ParallelPerft.run(fen, depth, workers=2, split_depth=split_depth), serial,
+                                 f"{fen} split at {split_depth}")
+
+    def test_split_hands_out_one_task_per_node_at_the_split_depth(self):
+        tasks, counted = ParallelPerft.split(KIWIPETE, 3, 2)
+        self.assertEqual((len(tasks), counted), (2039, 0))
+        self.assertTrue(all(depth == 1 for _, depth in tasks))
+        self.assertEqual(ParallelPerft.split(KIWIPETE, 1, 2), ([], 48))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+Perft divide: the node count below every root move, and an automatic search
+for the position where our counts first disagree with a reference.
+
+A reference is any `reference(fen, depth) -> {uci: nodes}`. Three are built in:
+a saved divide (Stockfish's `go perft` output, pasted into a file), a UCI
+engine run as a subprocess, and python-chess. A file only covers the root, so
+descending past it needs one of the other two.
+
+    python -m game.tests.perft_divide "<fen>" 5
+    python -m game.tests.perft_divide "<fen>" 6 --engine stockfish
+    python -m game.tests.perft_divide "<fen>" 5 --reference divide.txt --python-chess
+
+With a reference, the bisection repeatedly picks the cheapest root move whose
+subtree count differs, plays it and divides again one ply shallower, until the
+move lists themselves differ. That position, the moves leading to it and the
+missing / extra moves are printed.
+"""
+import re
+import subprocess
+import time
+from typing import Callable, NamedTuple, Optional
+
+from game.models.board import Board
+from game.startup import Startup
+from game.tests.GenerateMovesTests import perft
+
+chess = Startup.optional_import("chess")
+
+Reference = Callable[[str, int], dict[str, int]]
+
+# "e2e4: 20" / "e7e8q: 1", as printed by Stockfish and by divide_lines
+DIVIDE_LINE = re.compile(r"^\s*([a-h][1-8][a-h][1-8][qrbn]?)\s*:\s*(\d+)\s*$")
+
+
+class Mismatch(NamedTuple):
+    fen: str                    # position where the bisection stopped
+    depth: int                  # remaining depth at that position
+    path: list[str]             # UCI moves from the starting position to `fen`
+    missing: list[str]          # reference moves we do not generate
+    extra: list[str]            # moves we generate that the reference does not
+    counts: dict[str, tuple[int, int]]  # move -> (our nodes, reference nodes), where they differ
+
+
+class PerftDivide:
+
+    @staticmethod
+    def divide(board: Board, depth: int) -> dict[str, int]:
+        """Nodes below each legal move of the current position, keyed by UCI."""
+        counts = {}
+        for move in board.generate_move_buffer().to_list():
+            _, moves_done, _ = board.make_move(move)
+            counts[move.to_uci()] = perft(board, depth - 1, "white")
+            board.undo_move(moves_done)
+        return counts
+
+    @staticmethod
+    def compare(ours: dict[str, int], theirs: dict[str, int]) -> tuple[list[str], list[str], dict[str, tuple[int, int]]]:
+        """(missing, extra, differing counts) of our divide against the reference one."""
+        missing = sorted(theirs.keys() - ours.keys())
+        extra = sorted(ours.keys() - theirs.keys())
+        counts = {move: (ours[move], theirs[move]) for move in sorted(ours.keys() & theirs.keys())
+                  if ours[move] != theirs[move]}
+        return missing, extra, counts
+
+    @staticmethod
+    def bisect(fen: str, depth: int, reference: Optional[Reference],
+               root_counts: Optional[dict[str, int]] = None) -> Optional[Mismatch]:
+        """
+        The first position below `fen` whose move list differs from the
+        reference, or None when the divides agree. `root_counts` replaces the
+        reference at the root (e.g. a divide loaded from a file); without a
+        `reference` the search stops there.
+        """
+        board = Board(fen)
+        theirs = root_counts if root_counts is not None else reference(fen, depth)
+        path = []
+
+        while True:
+            missing, extra, counts = PerftDivide.compare(PerftDivide.divide(board, depth), theirs)
+            if not (missing or extra or counts):
+                # Only reachable below the root when the reference contradicts itself
+                return Mismatch(board.board_data.fen, depth, path, [], [], {}) if path else None
+            if missing or extra or depth == 1 or reference is None:
+                return Mismatch(board.board_data.fen, depth, path, missing, extra, counts)
+
+            # The smallest differing subtree is the cheapest one to descend into
+            move_uci = min(counts, key=lambda uci: counts[uci][1])
+            move = next(m for m in board.generate_all_legal_moves() if m.to_uci() == move_uci)
+            board.make_move(move)
+            path.append(move_uci)
+            depth -= 1
+            theirs = reference(board.board_data.fen, depth)
+
+    # ----------------- References -----------------
+    @staticmethod
+    def parse_divide(text: str) -> dict[str, int]:
+        """Per-move counts from divide output; other lines ("Nodes searched", info) are skipped."""
+        counts = {}
+        for line in text.splitlines():
+            match = DIVIDE_LINE.match(line)
+            if match:
+                counts[match.group(1)] = int(match.group(2))
+        return counts
+
+    @staticmethod
+    def load_divide(path: str) -> dict[str, int]:
+        with open(path) as f:
+            return PerftDivide.parse_divide(f.read())
+
+    @staticmethod
+    def engine_reference(engine_path: str) -> Reference:
+        """A reference that asks a UCI engine supporting `go perft` (Stockfish)."""
+        def reference(fen: str, depth: int) -> dict[str, int]:
+            commands = f"uci\nposition fen {fen}\ngo perft {depth}\nquit\n"
+            result = subprocess.run([engine_path], input=commands, capture_output=True, text=True, check=True)
+            return PerftDivide.parse_divide(result.stdout)
+        return reference
+
+    @staticmethod
+    def python_chess_reference(fen: str, depth: int) -> dict[str, int]:
+        """A reference computed with python-chess (slow, but needs no engine)."""
+        def count(board, remaining):
+            if remaining == 0:
+                return 1
+            total = 0
+            for move in board.legal_moves:
+                board.push(move)
+                total += count(board, remaining - 1)
+                board.pop()
+            return total
+
+        if chess is None:
+            raise ModuleNotFoundError("python-chess is not installed", name="chess")
+        board = chess.Board(fen)
+        counts = {}
+        for move in board.legal_moves:
+            board.push(move)
+            counts[move.uci()] = count(board, depth - 1)
+            board.pop()
+        return counts
+
+    @staticmethod
+    def divide_lines(counts: dict[str, int]) -> list[str]:
+        """Divide in Stockfish's layout, so the output can be diffed or saved as a reference."""
+        lines = [f"{move}: {nodes}" for move, nodes in sorted(counts.items())]
+        return lines + ["", f"Nodes searched: {sum(counts.values())}"]
+
+    @staticmethod
+    def report(mismatch: Optional[Mismatch]) -> list[str]:
+        if mismatch is None:
+            return ["divide matches the reference"]
+        lines = [
+            f"first mismatch at depth {mismatch.depth}",
+            f"  fen:   {mismatch.fen}",
+            f"  moves: {' '.join(mismatch.path) or '(root)'}",
+        ]
+        if mismatch.missing:
+            lines.append(f"  missing: {' '.join(mismatch.missing)}")
+        if mismatch.extra:
+            lines.append(f"  extra:   {' '.join(mismatch.extra)}")
+        for move, (ours, theirs) in mismatch.counts.items():
+            lines.append(f"  {move}: {ours} (reference {theirs})")
+        if not (mismatch.missing or mismatch.extra or mismatch.counts):
+            lines.append("  every subtree matches here: the reference disagrees with its own parent count")
+        return lines
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Perft divide, with bisection to the first mismatching position")
+    parser.add_argument("fen")
+    parser.add_argument("depth", type=int)
+    parser.add_argument("--reference", help="file with the root divide ('e2e4: 20' lines)")
+    parser.add_argument("--engine", help="UCI engine supporting 'go perft', used below the root")
+    parser.add_argument("--python-chess", action="store_true", help="use python-chess below the root")
+    args = parser.parse_args()
+
+    reference = None
+    if args.engine:
+        reference = PerftDivide.engine_reference(args.engine)
+    elif args.python_chess:
+        reference = PerftDivide.python_chess_reference
+
+    start = time.perf_counter()
+    print("\n".join(PerftDivide.divide_lines(PerftDivide.divide(Board(args.fen), args.depth))))
+    print(f"({time.perf_counter() - start:.2f} s)")
+
+    root_counts = PerftDivide.load_divide(args.reference) if args.reference else None
+    if reference is None and root_counts is None:
+        return 0
+
+    mismatch = PerftDivide.bisect(args.fen, args.depth, reference, root_counts)
+    print()
+    print("\n".join(PerftDivide.report(mismatch)))
+    return 0 if mismatch is None else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,57 @@
+import unittest
+
+from game.models.board import Board
+from game.tests.perft_divide import PerftDivide
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+def own_reference(fen, depth):
+    return PerftDivide.divide(Board(fen), depth)
+
+
+class PerftDivideTests(unittest.TestCase):
+
+    def test_divide_sums_to_perft(self):
+        counts = PerftDivide.divide(Board(KIWIPETE), 2)
+        self.assertEqual(len(counts), 48)
+        self.assertEqual(sum(counts.values()), 2039)
+
+    def test_bisection_finds_the_position_with_a_wrong_move_list(self):
+        # A reference that "knows" one extra move two plies down: the bisection
+        # has to follow the differing counts to exactly that position
+        path = ["e1g1", "h3g2"]
+        on_path = set()
+        board = Board(KIWIPETE)
+        for uci in path:
+            board.make_move(next(m for m in board.generate_all_legal_moves() if m.to_uci() == uci))
+            on_path.add(board.board_data.fen)
+        target_fen = board.board_data.fen
+
+        def reference(fen, depth):
+            counts = own_reference(fen, depth)
+            if fen == target_fen:
+                counts["h1h8"] = 1
+                return counts
+            board = Board(fen)
+            for move in board.generate_all_legal_moves():
+                _, moves_done, _ = board.make_move(move)
+                if board.board_data.fen in on_path:
+                    counts[move.to_uci()] += 1
+                board.undo_move(moves_done)
+            return counts
+
+        mismatch = PerftDivide.bisect(KIWIPETE, 3, reference)
+        self.assertEqual(mismatch.fen, target_fen)
+        self.assertEqual(mismatch.path, path)
+        self.assertEqual(mismatch.missing, ["h1h8"])
+        self.assertIsNone(PerftDivide.bisect(KIWIPETE, 2, own_reference))
+
+    def test_parse_divide_reads_stockfish_output(self):
+        text = "info string NNUE evaluation\na2a3: 380\ne7e8q: 1\n\nNodes searched: 381\n"
+        self.assertEqual(PerftDivide.parse_divide(text), {"a2a3": 380, "e7e8q": 1})
+        self.assertEqual(PerftDivide.parse_divide("\n".join(PerftDivide.divide_lines({"a2a3": 380}))), {"a2a3": 380})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""
+Run the perft suite in perft_suite.epd: check every node count and compare
+the speed with a stored baseline.
+
+Each EPD line is a position followed by its operations:
+    <board> <side> <castling> <ep> ;id <name> ;D1 <nodes> ;D2 <nodes> ...
+
+For every position the depths are run in increasing order, as long as the
+next one is predicted to fit in the time budget (the expected node count is
+known, so the prediction is the current nodes-per-second rate). The NPS at
+the deepest depth, timed best-of `--repeats` to keep scheduler noise out,
+is compared with perft_baseline.json, which stores the depth it was measured
+at.
+
+    python -m game.tests.perft_suite [--budget 5] [--repeats 3] [--tolerance 0.2] [--update-baseline]
+
+Exits with status 1 on any wrong count, or when a position is slower than its
+baseline by more than the tolerance.
+"""
+import json
+import os
+import time
+from typing import Callable, NamedTuple, Optional
+
+from game.models.board import Board
+from game.tests.GenerateMovesTests import perft
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SUITE_FILE = os.path.join(HERE, "perft_suite.epd")
+BASELINE_FILE = os.path.join(HERE, "perft_baseline.json")
+
+# Seconds per position, and the allowed NPS drop against the baseline
+DEFAULT_BUDGET = 5.0
+DEFAULT_TOLERANCE = 0.2
+# Timings of the deepest depth; the fastest one is kept
+DEFAULT_REPEATS = 3
+
+Counter = Callable[[Board, int], int]
+
+
+class SuitePosition(NamedTuple):
+    name: str
+    fen: str
+    expected: dict[int, int]  # depth -> nodes
+
+
+class DepthResult(NamedTuple):
+    depth: int
+    nodes: int
+    expected: int
+    seconds: float
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def correct(self) -> bool:
+        return self.nodes == self.expected
+
+
+def serial_perft(board: Board, depth: int) -> int:
+    return perft(board, depth, "white")
+
+
+class PerftSuite:
+
+    @staticmethod
+    def load_epd(path: str = SUITE_FILE) -> list[SuitePosition]:
+        positions = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                board, *operations = [part.strip() for part in line.split(";")]
+                name, expected = board, {}
+                for operation in operations:
+                    opcode, _, operand = operation.partition(" ")
+                    if opcode == "id":
+                        name = operand.strip().strip('"')
+                    elif opcode.startswith("D") and opcode[1:].isdigit():
+                        expected[int(opcode[1:])] = int(operand)
+                # EPD has no move counters; Board wants all six FEN fields
+                positions.append(SuitePosition(name, f"{board} 0 1", expected))
+        return positions
+
+    @staticmethod
+    def run_position(position: SuitePosition, budget: float, count: Counter = serial_perft,
+                     repeats: int = 1) -> list[DepthResult]:
+        """
+        Every depth of `position` that fits in `budget` seconds, shallowest
+        first. The deepest one is timed `repeats` times, keeping the fastest.
+        """
+        board = Board(position.fen)
+        results = []
+        spent = 0.0
+        for depth in sorted(position.expected):
+            if results:
+                last = results[-1]
+                predicted = last.seconds * position.expected[depth] / max(last.nodes, 1)
+                if spent + predicted > budget:
+                    break
+            start = time.perf_counter()
+            nodes = count(board, depth)
+            seconds = time.perf_counter() - start
+            spent += seconds
+            results.append(DepthResult(depth, nodes, position.expected[depth], seconds))
+            if nodes != position.expected[depth]:
+                return results  # deeper counts would be wrong too
+
+        if results:
+            deepest = results[-1]
+            for _ in range(repeats - 1):
+                start = time.perf_counter()
+                count(board, deepest.depth)
+                results[-1] = deepest._replace(seconds=min(results[-1].seconds, time.perf_counter() - start))
+        return results
+
+    @staticmethod
+    def load_baseline(path: str = BASELINE_FILE) -> dict[str, dict]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def save_baseline(results: dict[str, list[DepthResult]], path: str = BASELINE_FILE):
+        baseline = {name: {"depth": runs[-1].depth, "nps": round(runs[-1].nps)}
+                    for name, runs in results.items() if runs}
+        with open(path, "w") as f:
+            json.dump(baseline, f, indent=4)
+            f.write("\n")
+
+    @staticmethod
+    def regression(runs: list[DepthResult], baseline: Optional[dict], tolerance: float) -> Optional[float]:
+        """
+        Relative NPS drop against the baseline if it exceeds `tolerance`, else
+        None. Only the baseline's own depth is compared: shallow depths are
+        dominated by setup and would not be comparable.
+        """
+        if not baseline:
+            return None
+        run = next((r for r in runs if r.depth == baseline["depth"]), None)
+        if run is None or not baseline["nps"]:
+            return None
+        drop = 1 - run.nps / baseline["nps"]
+        return drop if drop > tolerance else None
+
+    @staticmethod
+    def run(positions: list[SuitePosition], budget: float, tolerance: float, baseline: dict[str, dict],
+            count: Counter = serial_perft, repeats: int = DEFAULT_REPEATS) -> tuple[dict[str, list[DepthResult]], list[str]]:
+        """(results per position, failure messages), printing a line per depth as it goes."""
+        results, failures = {}, []
+        for position in positions:
+            runs = PerftSuite.run_position(position, budget, count, repeats)
+            results[position.name] = runs
+            for run in runs:
+                status = "ok" if run.correct else f"WRONG (expected {run.expected:,})"
+                print(f"{position.name:<24}D{run.depth:<3}{run.nodes:>12,}{run.seconds:>9.2f} s"
+                      f"{run.nps:>12,.0f} nps  {status}")
+                if not run.correct:
+                    failures.append(f"{position.name} depth {run.depth}: {run.nodes:,} nodes, expected {run.expected:,}")
+
+            drop = PerftSuite.regression(runs, baseline.get(position.name), tolerance)
+            if drop is not None:
+                failures.append(f"{position.name}: NPS {drop:.0%} below the baseline at depth "
+                                f"{baseline[position.name]['depth']} (tolerance {tolerance:.0%})")
+        return results, failures
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Perft suite with NPS regression check")
+    parser.add_argument("--suite", default=SUITE_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="seconds per position")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="timings of the deepest depth")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed NPS drop, 0.2 = 20%%")
+    parser.add_argument("--only", nargs="*", help="position ids to run")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run's NPS as the new baseline")
+    args = parser.parse_args()
+
+    positions = PerftSuite.load_epd(args.suite)
+    if args.only:
+        positions = [p for p in positions if p.name in args.only]
+    baseline = {} if args.update_baseline else PerftSuite.load_baseline(args.baseline)
+
+    results, failures = PerftSuite.run(positions, args.budget, args.tolerance, baseline, repeats=args.repeats)
+    if args.update_baseline and not failures:
+        PerftSuite.save_baseline(results, args.baseline)
+        print(f"\nbaseline written to {args.baseline}")
+
+    print()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"{len(positions)} positions, {len(failures)} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
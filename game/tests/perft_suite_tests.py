@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from game.tests.perft_suite import DepthResult, PerftSuite, SuitePosition
+
+
+class PerftSuiteTests(unittest.TestCase):
+
+    def test_shipped_suite_parses(self):
+        positions = PerftSuite.load_epd()
+        names = [p.name for p in positions]
+        self.assertIn("kiwipete", names)
+        self.assertEqual(len(names), len(set(names)))
+        for position in positions:
+            self.assertEqual(len(position.fen.split()), 6, position.name)
+            self.assertIn(1, position.expected, position.name)
+
+    def test_shallow_depths_match_and_budget_stops_deeper_ones(self):
+        kiwipete = next(p for p in PerftSuite.load_epd() if p.name == "kiwipete")
+        runs = PerftSuite.run_position(kiwipete, budget=0.5)
+        self.assertTrue(all(run.correct for run in runs))
+        self.assertEqual([run.depth for run in runs][:2], [1, 2])
+        self.assertLess(runs[-1].depth, max(kiwipete.expected))
+
+    def test_wrong_count_and_nps_drop_fail(self):
+        wrong = SuitePosition("wrong", "4k3/8/8/8/8/8/8/4K3 w - - 0 1", {1: 6, 2: 25})
+        baseline = {"wrong": {"depth": 1, "nps": 10 ** 12}}
+        with tempfile.TemporaryDirectory() as directory:
+            results, failures = PerftSuite.run([wrong], 5.0, 0.2, baseline)
+            self.assertEqual(len(failures), 2)  # 5 king moves, not 6; and far below 10^12 nps
+
+            path = os.path.join(directory, "baseline.json")
+            PerftSuite.save_baseline(results, path)
+            self.assertEqual(PerftSuite.load_baseline(path)["wrong"]["depth"], 1)
+
+        fast = [DepthResult(3, 1000, 1000, 0.01)]
+        self.assertIsNone(PerftSuite.regression(fast, {"depth": 3, "nps": 110000}, 0.2))
+        self.assertAlmostEqual(PerftSuite.regression(fast, {"depth": 3, "nps": 200000}, 0.2), 0.5)
+        self.assertIsNone(PerftSuite.regression(fast, {"depth": 4, "nps": 200000}, 0.2))
+
+
+if __name__ == "__main__":
+    unittest.main()
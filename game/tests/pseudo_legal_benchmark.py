@@ -0,0 +1,120 @@
+import time
+
+from game.models.board import Board
+from game.move_generation.move_generator import MoveGenerator
+
+# (name, FEN, depth, expected nodes)
+PERFT_SUITE = [
+    ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 3, 8902),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 2, 2039),
+    ("position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 4, 43238),
+    ("position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 3, 9467),
+    ("position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 3, 62379),
+]
+
+
+def perft_legal(board: Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+    moves = board.generate_move_buffer()
+    total = 0
+    for i in range(moves.count):
+        _, moves_done, _ = board.make_move(moves.move(i))
+        total += perft_legal(board, depth - 1)
+        board.undo_move(moves_done)
+    return total
+
+
+def perft_pseudo_legal(board: Board, depth: int) -> int:
+    """Perft that only checks legality of the moves it is about to play."""
+    if depth == 0:
+        return 1
+    generator = board.move_generator
+    moves = board.generate_move_buffer()
+    total = 0
+    for i in range(moves.count):
+        move = moves.move(i)
+        if not generator.is_legal(move):
+            continue
+        _, moves_done, _ = board.make_move(move)
+        total += perft_pseudo_legal(board, depth - 1)
+        board.undo_move(moves_done)
+    return total
+
+
+def pseudo_legal_board(fen: str) -> Board:
+    board = Board(fen)
+    board.move_generator = MoveGenerator(board, pseudo_legal=True)
+    return board
+
+
+def interior_positions(fen: str, depth: int, limit: int = 400) -> list[str]:
+    """FENs of the first `limit` non-leaf nodes of the perft tree."""
+    board = Board(fen)
+    fens = []
+
+    def walk(remaining):
+        if remaining == 0 or len(fens) >= limit:
+            return
+        fens.append(board.board_data.fen)
+        moves = board.generate_move_buffer()
+        for i in range(moves.count):
+            _, moves_done, _ = board.make_move(moves.move(i))
+            walk(remaining - 1)
+            board.undo_move(moves_done)
+
+    walk(depth)
+    return fens
+
+
+def time_first_move_cutoff(boards: list[Board], check_first: bool) -> float:
+    """
+    Time to prepare each position and obtain one legal move to try, as a
+    search does at a node that cuts off on its first move.
+    """
+    start = time.perf_counter()
+    for board in boards:
+        generator = board.move_generator
+        generator.refresh()
+        moves = generator.generate_moves()
+        if check_first:
+            for i in range(moves.count):
+                if generator.is_legal(moves.move(i)):
+                    break
+    return time.perf_counter() - start
+
+
+def run_benchmark():
+    print(f"{'position':<12}{'depth':>6}{'nodes':>9}{'legal (s)':>11}{'pseudo (s)':>12}{'speedup':>9}")
+    legal_total = pseudo_total = 0.0
+    for name, fen, depth, expected in PERFT_SUITE:
+        start = time.perf_counter()
+        legal_nodes = perft_legal(Board(fen), depth)
+        legal_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pseudo_nodes = perft_pseudo_legal(pseudo_legal_board(fen), depth)
+        pseudo_time = time.perf_counter() - start
+
+        assert legal_nodes == pseudo_nodes == expected, (name, legal_nodes, pseudo_nodes, expected)
+        legal_total += legal_time
+        pseudo_total += pseudo_time
+        print(f"{name:<12}{depth:>6}{expected:>9}{legal_time:>11.2f}{pseudo_time:>12.2f}{legal_time / pseudo_time:>8.2f}x")
+
+    print(f"{'total':<27}{legal_total:>11.2f}{pseudo_total:>12.2f}{legal_total / pseudo_total:>8.2f}x")
+
+    print("\nGenerate + first legal move only (cutoff on the first move)")
+    print(f"{'position':<12}{'nodes':>15}{'legal (us)':>11}{'pseudo (us)':>12}{'speedup':>9}")
+    for name, fen, depth, _ in PERFT_SUITE:
+        fens = interior_positions(fen, depth)
+        legal_time = time_first_move_cutoff([Board(f) for f in fens], check_first=False)
+        pseudo_time = time_first_move_cutoff([pseudo_legal_board(f) for f in fens], check_first=True)
+        print(
+            f"{name:<12}{len(fens):>15}"
+            f"{legal_time / len(fens) * 1e6:>11.0f}{pseudo_time / len(fens) * 1e6:>12.0f}"
+            f"{legal_time / pseudo_time:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,49 @@
+import time
+
+from game.move_generation.bitboard_utilities import BitBoardUtility
+from game.move_generation.magic.magic_helper import MagicHelper
+from game.move_generation.slider_attacks import SliderAttacks, BACKEND_ENV_VAR, AUTO_BACKEND
+
+SEED = 2024
+SAMPLES = 20000
+REPEATS = 5
+
+
+def time_lookup(lookup, samples) -> float:
+    """Best-of-REPEATS time for one pass over `samples`, in seconds."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for sq, occ in samples:
+            lookup(sq, occ)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_agreement(samples, lookups):
+    for name, (rook, bishop, _) in lookups.items():
+        for sq, occ in samples:
+            assert rook(sq, occ) == BitBoardUtility.get_rook_attacks(sq, occ), (name, sq, occ)
+            assert bishop(sq, occ) == BitBoardUtility.get_bishop_attacks(sq, occ), (name, sq, occ)
+
+
+def run_benchmark(samples_count: int = SAMPLES):
+    samples = MagicHelper.random_occupancies(samples_count, SEED)
+    lookups = {name: SliderAttacks.load_backend(name) for name in SliderAttacks.backends}
+    check_agreement(samples, lookups)
+
+    print(f"{len(samples):,} lookups, best of {REPEATS}")
+    print(f"{'backend':<14}{'rook (ns)':>12}{'bishop (ns)':>13}{'queen (ns)':>12}")
+    totals = {}
+    for name, (rook, bishop, queen) in lookups.items():
+        times = [time_lookup(lookup, samples) / len(samples) * 1e9 for lookup in (rook, bishop, queen)]
+        totals[name] = times[0] + times[1]
+        print(f"{name:<14}{times[0]:>12.0f}{times[1]:>13.0f}{times[2]:>12.0f}")
+
+    fastest = min(totals, key=totals.get)
+    print(f"\nFastest on this interpreter: {fastest}")
+    print(f"Select it with {BACKEND_ENV_VAR}={fastest} (or {BACKEND_ENV_VAR}={AUTO_BACKEND} to pick at startup)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
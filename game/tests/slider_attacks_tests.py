@@ -0,0 +1,64 @@
+import random
+import unittest
+
+from game.move_generation.bitboard_utilities import BitBoardUtility
+from game.move_generation.magic.magic import Magic
+from game.move_generation.magic.magic_helper import MagicHelper
+from game.move_generation.slider_attacks import MAGIC_TABLES, SliderAttacks
+from game.startup import Startup
+
+
+class SliderAttacksTests(unittest.TestCase):
+
+    def test_magic_lookups_match_ray_walkers(self):
+        rng = random.Random(7)
+        for _ in range(3000):
+            sq = rng.randrange(64)
+            occ = rng.getrandbits(64) & rng.getrandbits(64)
+
+            rook = SliderAttacks.get_rook_attacks(sq, occ)
+            bishop = SliderAttacks.get_bishop_attacks(sq, occ)
+
+            self.assertEqual(rook, BitBoardUtility.get_rook_attacks(sq, occ), f"rook on {sq}, occ {occ:#x}")
+            self.assertEqual(bishop, BitBoardUtility.get_bishop_attacks(sq, occ), f"bishop on {sq}, occ {occ:#x}")
+            self.assertEqual(SliderAttacks.get_queen_attacks(sq, occ), rook | bishop)
+
+    def test_empty_board_attacks(self):
+        # Rook on a1 sees the whole a-file and first rank
+        self.assertEqual(SliderAttacks.get_rook_attacks(0, 0), (BitBoardUtility.FILE_A | BitBoardUtility.RANK1) & ~1)
+        # Bishop on a1 sees the long diagonal
+        self.assertEqual(SliderAttacks.get_bishop_attacks(0, 0), 0x8040201008040200)
+
+    def test_all_backends_agree_on_every_blocker_pattern(self):
+        rng = random.Random(13)
+        backends = {name: SliderAttacks.load_backend(name) for name in SliderAttacks.backends}
+        for sq in range(64):
+            for rook in (True, False):
+                reference = BitBoardUtility.get_rook_attacks if rook else BitBoardUtility.get_bishop_attacks
+                mask = MagicHelper.create_movement_mask(sq, rook)
+                for pattern in MagicHelper.create_all_blocker_bitboards(mask):
+                    # Pieces off the relevant mask (edges, other lines) must not matter
+                    occ = pattern | (rng.getrandbits(64) & ~mask & ~(1 << sq))
+                    expected = reference(sq, occ)
+                    for name, (rook_attacks, bishop_attacks, queen_attacks) in backends.items():
+                        lookup = rook_attacks if rook else bishop_attacks
+                        self.assertEqual(lookup(sq, occ), expected, f"{name}: square {sq}, occ {occ:#x}")
+
+    def test_backends_provide_queen_attacks(self):
+        for name in SliderAttacks.backends:
+            rook, bishop, queen = SliderAttacks.load_backend(name)
+            for sq, occ in ((0, 0), (27, 0x0000_1008_2400_0000), (63, 0xFFFF_0000_0000_FFFF)):
+                self.assertEqual(queen(sq, occ), rook(sq, occ) | bishop(sq, occ), name)
+
+    def test_magic_tables_share_one_flat_table(self):
+        Startup.ensure(MAGIC_TABLES)
+        offset = 0
+        for _, _, shift, entry_offset in Magic.RookEntries + Magic.BishopEntries:
+            self.assertEqual(entry_offset, offset)
+            offset += 1 << (64 - shift)
+        self.assertEqual(len(Magic.Attacks), offset)
+        self.assertIsInstance(Magic.Attacks, memoryview)
+
+
+if __name__ == "__main__":
+    unittest.main()
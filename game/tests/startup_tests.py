@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from game.startup import REPO_ROOT, import_time_ms
+
+# Cumulative `-X importtime` budget for a cold `import game.models.board`
+BOARD_IMPORT_BUDGET_MS = 150
+
+HEAVY_MODULES = ["torch", "sympy", "numpy", "chess", "pygame"]
+
+
+class StartupTests(unittest.TestCase):
+
+    def test_board_import_within_budget(self):
+        elapsed = import_time_ms("game.models.board")
+        self.assertLess(
+            elapsed, BOARD_IMPORT_BUDGET_MS,
+            f"Cold import of game.models.board took {elapsed:.1f} ms (budget {BOARD_IMPORT_BUDGET_MS} ms). "
+            f"Run `python -m game.startup report` to see where the time goes."
+        )
+
+    def test_board_import_defers_heavy_work(self):
+        script = (
+            "import json, sys\n"
+            "import game.models.board\n"
+            "from game.startup import Startup\n"
+            f"print(json.dumps({{'magic_ready': Startup.is_ready('magic_tables'),"
+            f" 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+        )
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+        state = json.loads(result.stdout)
+
+        self.assertFalse(state["magic_ready"], "Magic tables were built at import time")
+        self.assertEqual(state["loaded"], [], "Optional dependencies were imported with the board")
+
+
+if __name__ == "__main__":
+    unittest.main()
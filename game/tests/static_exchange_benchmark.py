@@ -0,0 +1,58 @@
+import time
+
+from game.models.board import Board
+from game.tests.static_exchange_tests import SEE_POSITIONS
+
+REPEATS = 5
+PASSES = 200
+
+EXTRA_FENS = [
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+]
+
+
+def collect_captures() -> list[tuple[Board, object]]:
+    """Every capture (and promotion) from the SEE test set and a few busy middlegames."""
+    samples = []
+    for fen in [fen for fen, _, _ in SEE_POSITIONS] + EXTRA_FENS:
+        board = Board(fen)
+        state = board.board_data
+        for move in board.generate_all_legal_moves():
+            x, y = move.target_pos
+            if state.square_piece[y * 8 + x] >= 0 or move.promotion:
+                samples.append((board, move))
+    return samples
+
+
+def time_calls(call, samples) -> float:
+    """Best-of-REPEATS time for PASSES passes over `samples`, in seconds."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(PASSES):
+            for board, move in samples:
+                call(board, move)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark():
+    samples = collect_captures()
+    calls = PASSES * len(samples)
+
+    rows = [
+        ("see", lambda board, move: board.see(move)),
+        ("see_ge(0)", lambda board, move: board.see_ge(move, 0)),
+        ("see_ge(+200)", lambda board, move: board.see_ge(move, 200)),
+    ]
+
+    print(f"{len(samples)} captures x {PASSES} passes, best of {REPEATS}")
+    print(f"{'call':<14}{'ns / call':>12}")
+    for name, call in rows:
+        elapsed = time_calls(call, samples)
+        print(f"{name:<14}{elapsed / calls * 1e9:>12.0f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
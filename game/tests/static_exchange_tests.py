@@ -0,0 +1,59 @@
+import unittest
+
+from game.models.board import Board
+
+# (FEN, move, SEE in centipawns with P=100 N=B=300 R=500 Q=900)
+SEE_POSITIONS = [
+    ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", 100),
+    ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", -200),
+    ("4R3/2r3p1/5bk1/1p1r3p/p2PR1P1/P1BK1P2/1P6/8 b - - 0 1", "h5g4", 0),
+    ("4R3/2r3p1/5bk1/1p1r1p1p/p2PR1P1/P1BK1P2/1P6/8 b - - 0 1", "h5g4", 0),
+    ("4r1k1/5pp1/nbp4p/1p2p2q/1P2P1b1/1BP2N1P/1B2QPPK/3R4 b - - 0 1", "g4f3", 0),
+    ("2r1r1k1/pp1bppbp/3p1np1/q3P3/2P2P2/1P2B3/P1N1B1PP/2RQ1RK1 b - - 0 1", "d6e5", 100),
+    ("7r/5qpk/p1Qp1b1p/3r3n/BB3p2/5p2/P1P2P2/4RK1R w - - 0 1", "e1e8", 0),
+    ("6rr/6pk/p1Qp1b1p/2n5/1B3p2/5p2/P1P2P2/4RK1R w - - 0 1", "e1e8", -500),
+    ("7r/5qpk/2Qp1b1p/1N1r3n/BB3p2/5p2/P1P2P2/4RK1R w - - 0 1", "e1e8", -500),
+    ("6RR/4bP2/8/8/5r2/3K4/5p2/4k3 w - - 0 1", "f7f8q", 200),
+    ("8/4kp2/2npp3/1Nn5/1p2PQP1/7q/1PP1B3/4KR1r b - - 0 1", "h1f1", 0),
+    ("8/4kp2/2npp3/1Nn5/1p2P1P1/7q/1PP1B3/4KR1r b - - 0 1", "h1f1", 0),
+    ("2r2r1k/6bp/p7/2q2p1Q/3PpP2/1B6/P5PP/2RR3K b - - 0 1", "c5c1", 100),
+    ("r2qk1nr/pp2ppbp/2b3p1/2p1p3/8/2N2N2/PPPP1PPP/R1BQR1K1 w kq - 0 1", "f3e5", 100),
+    ("6r1/4kq2/b2p1p2/p1pPb3/p1P2B1Q/2P4P/2B1R1P1/6K1 w - - 0 1", "f4e5", 0),
+    ("3q2nk/pb1r1p2/np6/3P2Pp/2p1P3/2R4B/PQ3P1P/3R2K1 w - h6 0 1", "g5h6", 0),
+    ("3q2nk/pb1r1p2/np6/3P2Pp/2p1P3/2R1B2B/PQ3P1P/3R2K1 w - h6 0 1", "g5h6", 100),
+    ("2r4r/1P4pk/p2p1b1p/7n/BB3p2/2R2p2/P1P2P2/4RK2 w - - 0 1", "c3c8", 500),
+    ("4q3/1p1pr1k1/1B2rp2/6p1/pP3PP1/P7/1R4bP/2K1Q3 w - - 0 1", "e1e6", -400),
+]
+
+
+def find_move(board: Board, uci: str):
+    for move in board.generate_all_legal_moves():
+        if move.to_uci() == uci:
+            return move
+    raise AssertionError(f"{uci} is not legal in {board.board_data.fen}")
+
+
+class StaticExchangeTests(unittest.TestCase):
+
+    def test_known_positions(self):
+        for fen, uci, expected in SEE_POSITIONS:
+            board = Board(fen)
+            self.assertEqual(board.see(find_move(board, uci)), expected, f"{uci} in {fen}")
+
+    def test_see_ge_agrees_with_see(self):
+        fens = [fen for fen, _, _ in SEE_POSITIONS] + [
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        ]
+        for fen in fens:
+            board = Board(fen)
+            for move in board.generate_all_legal_moves():
+                value = board.see(move)
+                for threshold in (value - 100, value - 1, value, value + 1, value + 100):
+                    self.assertEqual(
+                        board.see_ge(move, threshold), value >= threshold,
+                        f"{move.to_uci()} in {fen}, threshold {threshold}"
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import time
+
+from game.move_generation.table_cache import TableCache
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+IMPORT_STATEMENT = (
+    "import game.move_generation.bitboard_utilities; "
+    "from game.move_generation.slider_attacks import SliderAttacks; "
+    "SliderAttacks.get_rook_attacks(0, 0)"
+)
+REPEATS = 5
+
+
+def time_import(statement: str = IMPORT_STATEMENT) -> float:
+    """Wall time of a fresh interpreter running `statement`."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], env=env, check=True)
+    return time.perf_counter() - start
+
+
+def report_startup(repeats: int = REPEATS):
+    interpreter = time_import("pass")
+
+    cold = []
+    for _ in range(repeats):
+        TableCache.clear()
+        cold.append(time_import())
+
+    # The last cold run left a fresh cache behind
+    warm = [time_import() for _ in range(repeats)]
+
+    print(f"Interpreter only : {interpreter * 1000:8.1f} ms")
+    print(f"Cold (no cache)  : {min(cold) * 1000:8.1f} ms  (best of {repeats})")
+    print(f"Warm (mmap cache): {min(warm) * 1000:8.1f} ms  (best of {repeats})")
+    print(f"Speedup          : {min(cold) / min(warm):8.1f}x")
+
+
+if __name__ == "__main__":
+    report_startup()
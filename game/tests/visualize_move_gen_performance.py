@@ -1,15 +1,15 @@
-import json
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
 from matplotlib.ticker import MaxNLocator
 from scipy.interpolate import PchipInterpolator
 
+from game.tests.benchmark_store import STORE_FILE, BenchmarkStore
+
 # --- CONFIG ---
-JSON_FILE = "perft_results.json"
 DARK_BG = True
 ANIMATION_INTERVAL = 50
-TESTS_TO_PLOT = None
+TESTS_TO_PLOT = None  # run ids, or None for every perft run
 
 AXIS_ALPHA = 0.4
 
@@ -27,14 +27,21 @@ PAUSE_SECONDS = 1.5
 PAUSE_FRAMES = int(PAUSE_SECONDS * 1000 / ANIMATION_INTERVAL)
 
 
-def load_tests(json_file, test_ids=None):
-    with open(json_file, "r") as f:
-        data = json.load(f)
-    if not data:
-        raise ValueError("No tests found in JSON file.")
-    if test_ids is None:
-        return data
-    return [t for t in data if t["test_id"] in test_ids]
+def load_tests(store_file=STORE_FILE, run_ids=None):
+    """Perft runs streamed from the benchmark store, as {test_id, test_name, depths} dicts."""
+    tests = []
+    for record in BenchmarkStore.read(store_file, benchmark="perft"):
+        if run_ids is not None and record["run_id"] not in run_ids:
+            continue
+        depths = sorted(int(metric[1:].split(".")[0]) for metric in record["metrics"] if metric.endswith(".seconds"))
+        tests.append({
+            "test_id": record["run_id"],
+            "test_name": record["params"].get("test_name", record["run_id"]),
+            "depths": [{"depth": d, "time_seconds": record["metrics"][f"d{d}.seconds"]} for d in depths],
+        })
+    if not tests:
+        raise ValueError(f"No perft runs found in {store_file}.")
+    return tests
 
 
 def animate_tests_head_with_labels(tests):
@@ -214,5 +221,5 @@ def animate_tests_head_with_labels(tests):
 
 
 if __name__ == "__main__":
-    tests = load_tests(JSON_FILE, TESTS_TO_PLOT)
+    tests = load_tests(STORE_FILE, TESTS_TO_PLOT)
     animate_tests_head_with_labels(tests)